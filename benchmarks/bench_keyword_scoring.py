@@ -0,0 +1,85 @@
+"""Microbenchmark: legacy per-keyword substring scoring vs the compiled scorer.
+
+Usage: python benchmarks/bench_keyword_scoring.py [--repeat N]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from summarize_transcript import split_sentences
+from taxonomy import get_taxonomy
+
+# Keywords and compiled scorer of the default taxonomy profile
+PROFILE = get_taxonomy().default
+
+def legacy_score(sentence: str) -> Dict[str, int]:
+    """Original nested-loop scoring from extract_key_points, kept for comparison."""
+    sentence_lower = sentence.lower()
+    scores = {}
+    for category, word_weights in PROFILE.keywords.items():
+        score = 0
+        for word, weight in word_weights.items():
+            if word in sentence_lower:
+                score += weight
+
+        if score > 0:
+            if re.search(r'\b(is|are|was|were|have|has|do|does|should|must|can|will)\b', sentence_lower):
+                score += 1
+            if len(sentence.split()) >= 15:
+                score += 1
+            if not any(x in sentence_lower for x in ['example', 'instance', 'case']):
+                score += 1
+            scores[category] = score
+    return scores
+
+def compiled_score(sentence: str) -> Dict[str, int]:
+    return PROFILE.scorer.score(sentence, len(sentence.split()))
+
+def load_sentences(output_dir: str) -> List[str]:
+    """Collect candidate sentences from every transcript under output/."""
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(output_dir, '*', 'transcript.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            sentences.extend(split_sentences(f.read()))
+    return sentences
+
+def run(score_fn, sentences: List[str], repeat: int) -> float:
+    """Return throughput in sentences/sec."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sentence in sentences:
+            score_fn(sentence)
+    elapsed = time.perf_counter() - start
+    return len(sentences) * repeat / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    sentences = load_sentences(args.output_dir)
+    if not sentences:
+        print(f"No transcripts found under {args.output_dir}")
+        sys.exit(1)
+
+    mismatches = sum(1 for s in sentences if legacy_score(s) != compiled_score(s))
+    print(f"Sentences: {len(sentences)} (score mismatches: {mismatches})")
+
+    legacy = run(legacy_score, sentences, args.repeat)
+    compiled = run(compiled_score, sentences, args.repeat)
+    print(f"legacy:   {legacy:12,.0f} sentences/sec")
+    print(f"compiled: {compiled:12,.0f} sentences/sec")
+    print(f"speedup:  {compiled / legacy:.2f}x")
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
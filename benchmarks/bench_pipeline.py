@@ -0,0 +1,148 @@
+"""Benchmark: pipeline hot paths on synthetic transcripts, with a JSON baseline for regressions.
+
+Usage: python benchmarks/bench_pipeline.py [--minutes 1 10 60 600] [--repeat N]
+                                          [--save baseline.json] [--compare baseline.json] [--threshold 0.2]
+
+Times merge_caption_segments, clean_sentence, extract_key_points, format_transcript,
+save_transcript and update_markdown_with_summary on deterministic transcripts of each length (best of
+--repeat runs). --save writes the results as a baseline; --compare reports the
+change against one and exits 1 if any benchmark got slower by more than --threshold.
+Baselines are only comparable on the same machine and Python version.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from caption_filter import merge_caption_segments
+from summarize_transcript import (
+    clean_sentence, create_initial_video_info, extract_key_points, update_markdown_with_summary
+)
+from synthetic_transcript import generate_transcript
+from text_normalizer import DEFAULT_NORMALIZER
+from transcript_extractor import format_transcript, save_transcript
+
+DEFAULT_MINUTES = [1, 10, 60, 600]
+DEFAULT_THRESHOLD = 0.2
+# Differences below this are timer noise, whatever the ratio
+NOISE_FLOOR = 0.0005
+
+def best_time(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> float:
+    """Return the fastest of repeat calls in seconds (setup runs untimed before each)."""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_transcript(minutes: float, repeat: int, tmp: str) -> Dict[str, float]:
+    """Time each pipeline step on one synthetic transcript."""
+    transcript = generate_transcript(minutes)
+    text = format_transcript(transcript)
+    fragments = DEFAULT_NORMALIZER.normalize_document(text).split('.')
+    key_points = extract_key_points(text)
+
+    video_dir = os.path.join(tmp, f"{minutes:g}m")
+    os.makedirs(video_dir, exist_ok=True)
+    video_info_path = os.path.join(video_dir, "video_info.md")
+    # A note with user content that grows with the video, as in a real vault
+    initial_note = create_initial_video_info("synthetic00", "https://youtu.be/synthetic00", "Synthetic Video")
+    initial_note += "\n## Notes\n" + "".join(f"- note about minute {i}\n" for i in range(int(minutes)))
+
+    def reset_note():
+        with open(video_info_path, 'w', encoding='utf-8') as f:
+            f.write(initial_note)
+
+    def save():
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_transcript(transcript, video_dir, preview=False)
+
+    return {
+        "merge_caption_segments": best_time(lambda: list(merge_caption_segments(transcript)), repeat),
+        "clean_sentence": best_time(lambda: [clean_sentence(f) for f in fragments], repeat),
+        "extract_key_points": best_time(lambda: extract_key_points(text), repeat),
+        "format_transcript": best_time(lambda: format_transcript(transcript), repeat),
+        "save_transcript": best_time(save, repeat),
+        "update_markdown_with_summary": best_time(
+            lambda: update_markdown_with_summary(video_info_path, key_points), repeat, reset_note),
+    }
+
+def run_benchmarks(minutes_list, repeat: int) -> Dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in minutes_list:
+            for name, seconds in bench_transcript(minutes, repeat, tmp).items():
+                key = f"{name}/{minutes:g}m"
+                results[key] = round(seconds, 6)
+                print(f"{key:38} {seconds * 1000:10.2f} ms")
+    return {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> int:
+    """Print the change per benchmark and return how many regressed beyond threshold."""
+    regressions = 0
+    print(f"\nCompared with baseline from {baseline.get('created', '?')} "
+          f"(Python {baseline.get('python', '?')}), threshold {threshold:.0%}:")
+    for key, seconds in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            print(f"  {key:38} {'new':>10}")
+            continue
+        ratio = seconds / before if before else float('inf')
+        regressed = ratio > 1 + threshold and seconds - before > NOISE_FLOOR
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {key:38} {before * 1000:10.2f} -> {seconds * 1000:10.2f} ms ({ratio - 1:+7.1%}){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--minutes', type=float, nargs='+', default=DEFAULT_MINUTES,
+                        help="Synthetic transcript lengths to run")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='PATH', help="Write results as a baseline JSON file")
+    parser.add_argument('--compare', metavar='PATH', help="Compare results with a baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown ratio counted as a regression (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    current = run_benchmarks(args.minutes, args.repeat)
+
+    if args.save:
+        tmp_path = args.save + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        os.replace(tmp_path, args.save)
+        print(f"Baseline saved to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"{regressions} benchmark(s) regressed")
+            sys.exit(1)
+        print("No regressions")
+
+if __name__ == "__main__":
+    main()
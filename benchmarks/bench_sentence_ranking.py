@@ -0,0 +1,60 @@
+"""Benchmark: keyword-only key point extraction vs the TF-IDF and TextRank rankers.
+
+Usage: python benchmarks/bench_sentence_ranking.py [--output-dir output] [--repeat N] [--scale N]
+
+--scale repeats each transcript N times to show how the rankers grow with length.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from sentence_ranker import RANKERS, get_corpus_idf, np
+from summarize_transcript import extract_key_points_from_texts, list_video_dirs
+
+def time_it(fn, repeat: int) -> float:
+    """Return mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    if np is None:
+        print("NumPy is not installed; only the keyword ranker is available")
+        sys.exit(1)
+
+    transcripts = []
+    for video_dir in list_video_dirs(args.output_dir):
+        with open(os.path.join(video_dir, 'transcript.txt'), 'r', encoding='utf-8') as f:
+            transcripts.append([f.read()] * args.scale)
+    if not transcripts:
+        print(f"No transcripts found under {args.output_dir}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    idf = get_corpus_idf(args.output_dir)
+    print(f"corpus IDF: {idf.doc_count} documents, {len(idf.df)} terms, loaded in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    words = sum(len(' '.join(texts).split()) for texts in transcripts)
+    print(f"{len(transcripts)} transcripts x{args.scale}, {words:,} words")
+    baseline = None
+    for ranker in RANKERS:
+        def run():
+            for texts in transcripts:
+                extract_key_points_from_texts(texts, ranker, idf)
+        elapsed = time_it(run, args.repeat) / len(transcripts)
+        baseline = baseline or elapsed
+        print(f"{ranker:10} {elapsed * 1000:8.2f} ms per transcript  ({elapsed / baseline:.2f}x keywords)")
+
+if __name__ == "__main__":
+    main()
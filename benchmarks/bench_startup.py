@@ -0,0 +1,75 @@
+"""Benchmark: cold-start cost of each cli.py command, measured with python -X importtime.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--budget-ms MS] [--top N]
+
+For each command, a fresh interpreter imports cli.py plus the module that
+command dispatches to. The script reports the total import time (best of
+--repeat), the slowest modules, and whether an offline command pulled in a
+network library. It exits 1 if an offline command exceeds --budget-ms or
+imports a network library.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from cli import COMMANDS
+
+OFFLINE_COMMANDS = ("summarize", "batch", "sync", "topics")
+NETWORK_MODULES = ("requests", "youtube_transcript_api")
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """{module: (self us, cumulative us)} from -X importtime for a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import cli, {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def total_ms(times: Dict[str, Tuple[int, int]], module: str) -> float:
+    """Import time of cli plus the command's module and everything they import, in ms."""
+    # Top-level entries' cumulative times add up to everything imported after startup
+    return sum(times[name][1] for name in ("cli", module) if name in times) / 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="fail if an offline command's imports take longer than this")
+    parser.add_argument('--top', type=int, default=5, help="slowest modules listed per command")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    for command, (module, _, _) in COMMANDS.items():
+        runs = [import_times(module) for _ in range(args.repeat)]
+        times = min(runs, key=lambda run: total_ms(run, module))
+        elapsed = total_ms(times, module)
+        network = [name for name in NETWORK_MODULES if name in times]
+        offline = command in OFFLINE_COMMANDS
+
+        print(f"{command:10} {elapsed:8.1f} ms import time ({len(times)} modules)"
+              + (f"  network: {', '.join(network)}" if network else ""))
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, _) in slowest:
+            print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+        if offline and network:
+            failures.append(f"{command} imports {', '.join(network)}")
+        if offline and args.budget_ms is not None and elapsed > args.budget_ms:
+            failures.append(f"{command} takes {elapsed:.1f} ms (budget {args.budget_ms:g} ms)")
+
+    if failures:
+        print("Startup regressions:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
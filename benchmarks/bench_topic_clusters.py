@@ -0,0 +1,65 @@
+"""Benchmark: topic clustering over a large key point corpus.
+
+Usage: python benchmarks/bench_topic_clusters.py [--points 100000] [--per-video 100] [--topics 20]
+
+Fills a temporary topic vector cache with synthetic key points, then times
+the initial vectorization, reopening the memory-mapped cache, an incremental
+update of one video, a full re-cluster (mini-batch k-means plus assigning
+every point to its topic) and writing the topic notes.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from synthetic_transcript import generate_transcript
+from topic_clusters import DEFAULT_TOPICS, TopicVectors, cluster_topics, write_topic_notes
+
+# Synthetic captions average about 2.7 seconds per segment
+SECONDS_PER_POINT = 2.7
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=100000)
+    parser.add_argument('--per-video', type=int, default=100, help="key points per synthetic video")
+    parser.add_argument('--topics', type=int, default=DEFAULT_TOPICS)
+    args = parser.parse_args()
+
+    segments = generate_transcript(args.points * SECONDS_PER_POINT / 60)[:args.points]
+    points = [(segment['start'], segment['text']) for segment in segments]
+    print(f"{len(points)} synthetic key points in {len(points) // args.per_video} videos")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        vectors = TopicVectors(output_dir)
+        start = time.perf_counter()
+        for i in range(0, len(points), args.per_video):
+            name = f"video_{i // args.per_video:05d}"
+            vectors.set_video(name, points[i:i + args.per_video], video_id=None, title=name, source=None)
+        vectors.save()
+        print(f"vectorize + cache     {time.perf_counter() - start:8.2f}s")
+
+        start = time.perf_counter()
+        vectors = TopicVectors(output_dir)
+        vectors.live_rows()
+        print(f"reopen cache          {time.perf_counter() - start:8.2f}s")
+
+        start = time.perf_counter()
+        vectors.set_video("video_00000", points[:args.per_video], video_id=None, title="video_00000", source=None)
+        vectors.save()
+        print(f"update one video      {time.perf_counter() - start:8.2f}s")
+
+        start = time.perf_counter()
+        topics = cluster_topics(vectors, args.topics)
+        elapsed = time.perf_counter() - start
+        print(f"re-cluster            {elapsed:8.2f}s  ({len(topics)} topics, "
+              f"largest {len(topics[0]['rows'])} key points)")
+
+        start = time.perf_counter()
+        write_topic_notes(vectors, topics)
+        print(f"write topic notes     {time.perf_counter() - start:8.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: transcript.json (json.load) vs transcript.bin (memory-mapped columns).
+
+Opening a transcript.bin and reading its start/duration columns or all its
+texts is over 4x faster than json.load. Reading every segment is bound by
+creating Python objects per segment: (text, start, duration) rows, which
+summarize_transcript and search_index read, are about 3x faster and
+segment dicts under 2x.
+
+Usage: python benchmarks/bench_transcript_store.py [--output-dir output] [--repeat N]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from transcript_store import TranscriptFile, write_transcript_bin
+
+def time_it(fn, repeat: int) -> float:
+    """Return mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    json_paths = sorted(glob.glob(os.path.join(args.output_dir, '*', 'transcript.json')))
+    if not json_paths:
+        print(f"No transcript.json files found under {args.output_dir}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pairs = []
+        for i, json_path in enumerate(json_paths):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                segments = json.load(f)
+            bin_path = os.path.join(tmp, f"{i}.bin")
+            write_transcript_bin(bin_path, segments)
+            with TranscriptFile(bin_path) as transcript:
+                if list(transcript) != segments:
+                    print(f"Round trip mismatch for {json_path}")
+                    sys.exit(1)
+            pairs.append((json_path, bin_path, len(segments)))
+
+        json_bytes = sum(os.path.getsize(j) for j, _, _ in pairs)
+        bin_bytes = sum(os.path.getsize(b) for _, b, _ in pairs)
+        segments = sum(n for _, _, n in pairs)
+
+        def load_json():
+            for json_path, _, _ in pairs:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+
+        def open_bin():
+            for _, bin_path, _ in pairs:
+                with TranscriptFile(bin_path) as transcript:
+                    transcript.starts[len(transcript) - 1]
+
+        def load_json_texts():
+            for json_path, _, _ in pairs:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    [segment['text'] for segment in json.load(f)]
+
+        def read_bin_texts():
+            for _, bin_path, _ in pairs:
+                with TranscriptFile(bin_path) as transcript:
+                    list(transcript.texts())
+
+        def read_bin_rows():
+            for _, bin_path, _ in pairs:
+                with TranscriptFile(bin_path) as transcript:
+                    list(transcript.rows())
+
+        def read_bin_segments():
+            for _, bin_path, _ in pairs:
+                with TranscriptFile(bin_path) as transcript:
+                    list(transcript)
+
+        print(f"{len(pairs)} transcripts, {segments} segments")
+        print(f"disk: json {json_bytes:,} bytes, bin {bin_bytes:,} bytes ({json_bytes / bin_bytes:.1f}x smaller)")
+        baseline = time_it(load_json, args.repeat)
+        print(f"{'json.load (all segments)':32} {baseline * 1000:8.3f} ms")
+        for label, fn in [
+            ("bin open + lazy column access", open_bin),
+            ("bin all texts", read_bin_texts),
+            ("bin all (text, start, duration)", read_bin_rows),
+            ("bin all segment dicts", read_bin_segments),
+        ]:
+            elapsed = time_it(fn, args.repeat)
+            print(f"{label:32} {elapsed * 1000:8.3f} ms  ({baseline / elapsed:.1f}x vs json)")
+        elapsed = time_it(load_json_texts, args.repeat)
+        print(f"{'json.load + all texts':32} {elapsed * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Deterministic synthetic transcripts shaped like transcript.json.
+
+Usage: python benchmarks/synthetic_transcript.py MINUTES [--seed N] [--out transcript.json]
+
+The same (minutes, seed) always gives the same segments, so benchmark runs on
+different machines and commits see identical input.
+"""
+import argparse
+import json
+import random
+import sys
+from typing import Dict, List
+
+# Segment text length in words and caption timing, roughly as YouTube auto-captions
+SEGMENT_WORDS = (4, 9)
+SEGMENT_STEP = (1.8, 3.6)
+SEGMENT_OVERLAP = (0.5, 2.5)
+
+FILLERS = ['um', 'uh', 'like', 'you know', 'sort of', 'kind of', 'I mean', 'I think', 'right', 'so']
+OPENERS = ['and', 'but', 'so', 'because', 'I', 'you', 'we', 'the thing is', 'if you', 'what']
+# Filler probability per word and stutter ("the the") probability per word
+FILLER_RATE = 0.06
+STUTTER_RATE = 0.03
+
+SUBJECTS = ['your manager', 'the team', 'most people', 'a good engineer', 'your career',
+            'the company', 'every decision', 'your reputation', 'the market', 'a new hire']
+VERBS = ['is', 'should be', 'has to be', 'can be', 'will be', 'was', 'must be', 'needs to be']
+# Words the keyword scorer looks for, so generated sentences land in categories
+TOPICS = ['important', 'key', 'essential', 'the reality', 'success', 'wealth', 'the best way to grow',
+          'a problem', 'the challenge', 'the solution', 'something to remember', 'the takeaway',
+          'how to handle it', 'the advice', 'the truth', 'what you need to learn']
+TAILS = ['when you look at it over ten years', 'for anyone working in a large corporation',
+         'even if nobody tells you that', 'because the incentives are not aligned',
+         'and that is what people miss', 'if you want to actually get promoted',
+         'in my experience at three different companies', 'which sounds obvious but it is not']
+
+def _sentence_words(rng: random.Random) -> List[str]:
+    words = [rng.choice(OPENERS), rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(TOPICS)]
+    if rng.random() < 0.7:
+        words.append(rng.choice(TAILS))
+    text = ' '.join(words).split()
+
+    spoken = []
+    for word in text:
+        if rng.random() < FILLER_RATE:
+            spoken.extend(rng.choice(FILLERS).split())
+        spoken.append(word)
+        if rng.random() < STUTTER_RATE:
+            spoken.append(word)
+    return spoken
+
+def generate_transcript(minutes: float, seed: int = 0) -> List[Dict]:
+    """Segments covering minutes of speech: lowercase unpunctuated caption text
+    with filler words, stutters and overlapping start/duration times."""
+    rng = random.Random(seed)
+    words: List[str] = []
+    segments = []
+    start = rng.uniform(0.0, 1.0)
+    end_time = minutes * 60
+    while start < end_time:
+        count = rng.randint(*SEGMENT_WORDS)
+        while len(words) < count:
+            words.extend(_sentence_words(rng))
+        text, words = ' '.join(words[:count]), words[count:]
+        step = rng.uniform(*SEGMENT_STEP)
+        segments.append({
+            "text": text,
+            "start": round(start, 3),
+            "duration": round(step + rng.uniform(*SEGMENT_OVERLAP), 3),
+        })
+        start += step
+    return segments
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('minutes', type=float)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Write here instead of stdout")
+    args = parser.parse_args()
+
+    transcript = generate_transcript(args.minutes, args.seed)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(transcript, f, indent=2, ensure_ascii=False)
+        print(f"Wrote {len(transcript):,} segments to {args.out}")
+    else:
+        json.dump(transcript, sys.stdout, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
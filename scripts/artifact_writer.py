@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from pipeline_metrics import current_metrics
+
+LOCK_FILENAME = ".artifacts.lock"
+# Names of the artifacts a commit is replacing; removed once they are all in place
+PENDING_FILENAME = ".artifacts.pending"
+# A lock older than this was left by a crashed writer
+STALE_LOCK_SECONDS = 30.0
+LOCK_POLL_SECONDS = 0.01
+
+class DirectoryLock:
+    """Cross-process lock on a directory, held as an exclusively created lock file.
+
+    Works the same on every platform and filesystem that supports O_EXCL;
+    a lock file older than STALE_LOCK_SECONDS is assumed abandoned and taken over.
+    The file holds a token unique to each acquisition, and is only removed
+    by the holder whose token it still contains, so a holder whose lock was
+    taken over never releases the new holder's lock.
+    """
+
+    def __init__(self, dir_path: str):
+        self.path = os.path.join(dir_path, LOCK_FILENAME)
+        self.token: Optional[str] = None
+
+    def __enter__(self):
+        token = f"{os.getpid()}.{threading.get_ident()}.{time.time_ns()}"
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                held_by = self._read_token()
+                try:
+                    stale = time.time() - os.path.getmtime(self.path) > STALE_LOCK_SECONDS
+                except OSError:
+                    continue  # Released in the meantime
+                if stale and held_by is not None:
+                    self._remove_if_held_by(held_by)
+                    continue
+                time.sleep(LOCK_POLL_SECONDS)
+                continue
+            try:
+                os.write(fd, token.encode('ascii'))
+            finally:
+                os.close(fd)
+            self.token = token
+            return self
+
+    def __exit__(self, *exc):
+        self._remove_if_held_by(self.token)
+        self.token = None
+
+    def _read_token(self) -> Optional[str]:
+        try:
+            with open(self.path, 'r', encoding='ascii') as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _remove_if_held_by(self, token: Optional[str]):
+        if token is not None and self._read_token() == token:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+def fsync_dir(dir_path: str):
+    """Flush a directory's entries, so renames in it survive a crash (a no-op where unsupported)."""
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _write_durably(path: str, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def pending_artifacts(dir_path: str) -> List[str]:
+    """Artifacts an interrupted commit may have left mismatched, or [] if the directory is consistent."""
+    try:
+        with open(os.path.join(dir_path, PENDING_FILENAME), 'r', encoding='utf-8') as f:
+            return f.read().split()
+    except FileNotFoundError:
+        return []
+
+def _set_pending(dir_path: str, names: Iterable[str]):
+    path = os.path.join(dir_path, PENDING_FILENAME)
+    names = sorted(set(names))
+    if names:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        _write_durably(tmp_path, ''.join(name + '\n' for name in names).encode('utf-8'))
+        os.replace(tmp_path, path)
+    elif os.path.exists(path):
+        os.remove(path)
+    fsync_dir(dir_path)
+
+class ArtifactWriter:
+    """Renders a video directory's output files in memory and commits them in one locked step.
+
+    Every artifact is first written in full to a temp file with a single
+    write call and fsynced; only once all of them are on disk are they
+    renamed into place with os.replace, under the directory's DirectoryLock,
+    so parallel writers can't interleave their artifacts. The renames are
+    bracketed by a marker file, PENDING_FILENAME, listing the artifacts
+    being replaced: it is written and synced before the first rename and
+    removed only after the directory was synced following the last one.
+    A crash at any point therefore either leaves the old set, the new set,
+    or a marker naming the files that may not match; pending_artifacts
+    reports those. The summary manifest treats such a directory as stale;
+    if transcript files are among them, summarizing refuses the directory
+    and bulk ingest fetches the video again. Later commits keep the names
+    they don't rewrite in the marker. Readers that need
+    several files from the same commit take the lock while opening them
+    (see summarize_video_dir). Bytes and files written are added to the
+    current pipeline metrics.
+    """
+
+    def __init__(self, dir_path: str):
+        self.dir_path = dir_path
+        self.artifacts: Dict[str, bytes] = {}
+        self.bytes_written = 0
+        self.files_written = 0
+
+    def add_bytes(self, name: str, data: bytes):
+        self.artifacts[name] = data
+
+    def add_text(self, name: str, text: str):
+        self.artifacts[name] = text.encode('utf-8')
+
+    def add_json(self, name: str, data: Any, **kwargs):
+        self.add_text(name, json.dumps(data, **kwargs))
+
+    def commit(self) -> int:
+        """Write all pending artifacts and return the number of bytes written."""
+        if not self.artifacts:
+            return 0
+        os.makedirs(self.dir_path, exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_paths = {}
+        try:
+            for name, data in self.artifacts.items():
+                tmp_path = os.path.join(self.dir_path, name + suffix)
+                tmp_paths[name] = tmp_path
+                _write_durably(tmp_path, data)
+            with DirectoryLock(self.dir_path):
+                interrupted = pending_artifacts(self.dir_path)
+                _set_pending(self.dir_path, interrupted + list(tmp_paths))
+                for name, tmp_path in tmp_paths.items():
+                    os.replace(tmp_path, os.path.join(self.dir_path, name))
+                fsync_dir(self.dir_path)
+                _set_pending(self.dir_path, [name for name in interrupted if name not in tmp_paths])
+        except BaseException:
+            for tmp_path in tmp_paths.values():
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+
+        written = sum(len(data) for data in self.artifacts.values())
+        self.bytes_written += written
+        self.files_written += len(self.artifacts)
+        metrics = current_metrics()
+        metrics.count('bytes_written', written)
+        metrics.count('files_written', len(self.artifacts))
+        self.artifacts = {}
+        return written
@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+from urllib.parse import urlparse
+
+from http_client import get_client
+from metadata_cache import get_cache
+from search_index import get_search_index
+from video_index import get_index
+from transcript_store import interrupted_transcript_files
+from transcript_extractor import (
+    OEMBED_ENDPOINT, ensure_output_dir, fetch_transcript, get_video_id,
+    get_video_info, save_video
+)
+
+# Host that youtube_transcript_api talks to when fetching captions
+TRANSCRIPT_HOST = "www.youtube.com"
+
+class HostRateLimiter:
+    """Spaces out requests to each host by a minimum interval, across threads."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, host: str):
+        """Block until the next request slot for a host."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def read_urls(source: TextIO) -> List[str]:
+    """Read one URL or video ID per line, skipping blanks, comments and duplicate IDs."""
+    urls = []
+    seen = set()
+    for line in source:
+        url = line.strip()
+        if not url or url.startswith('#'):
+            continue
+        video_id = get_video_id(url) or url
+        if video_id in seen:
+            continue
+        seen.add(video_id)
+        urls.append(url)
+    return urls
+
+def ingested_dir(video_id: Optional[str]) -> Optional[str]:
+    """Output directory of a video an earlier run saved completely, if any."""
+    video_dir = get_index().lookup(video_id) if video_id else None
+    # An interrupted save leaves no note or a pending commit marker, so it is fetched again
+    if video_dir and os.path.exists(os.path.join(video_dir, "video_info.md")) \
+            and not interrupted_transcript_files(video_dir):
+        return video_dir
+    return None
+
+def ingest_video(url: str, limiter: HostRateLimiter,
+                 transcript_provider: Callable[[str], List[Dict]] = fetch_transcript,
+                 oembed_endpoint: str = OEMBED_ENDPOINT) -> str:
+    """Fetch title and transcript for one video and save them. Returns the output directory."""
+    video_id = get_video_id(url)
+    if not video_id:
+        raise ValueError(f"Could not extract video ID from URL: {url}")
+
+    limiter.wait(urlparse(oembed_endpoint).netloc)
+    title, language = get_video_info(video_id, oembed_endpoint)
+
+    limiter.wait(TRANSCRIPT_HOST)
+    transcript_list = transcript_provider(video_id)
+
+    output_dir = ensure_output_dir(video_id, title)
+    save_video(output_dir, video_id, url, title, transcript_list, preview=False)
+    get_index().update(video_id, output_dir, title)
+    get_search_index().add_video(video_id, transcript_list, title)
+    return output_dir
+
+def ingest_all(urls: Iterable[str], concurrency: int = 8, requests_per_second: float = 5.0,
+               transcript_provider: Callable[[str], List[Dict]] = fetch_transcript,
+               oembed_endpoint: str = OEMBED_ENDPOINT,
+               force: bool = False) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """Ingest videos concurrently, skipping videos an earlier run already saved.
+
+    Args:
+        urls: YouTube URLs or video IDs
+        concurrency: Maximum number of videos fetched at once
+        requests_per_second: Per-host request rate limit (0 disables limiting)
+        transcript_provider: Callable returning transcript segments for a video ID
+        oembed_endpoint: oEmbed endpoint used for video titles
+        force: Fetch videos again even if they were already saved
+
+    Returns:
+        A list of (url, output_dir, error) tuples, skipped videos first, then in completion order
+    """
+    results = []
+    pending = []
+    for url in urls:
+        video_dir = None if force else ingested_dir(get_video_id(url))
+        if video_dir:
+            results.append((url, video_dir, None))
+        else:
+            pending.append(url)
+    if results:
+        print(f"Skipping {len(results)} already ingested videos (use --force to fetch them again)")
+    limiter = HostRateLimiter(requests_per_second)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(ingest_video, url, limiter, transcript_provider, oembed_endpoint): url
+            for url in pending
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            try:
+                output_dir = future.result()
+                results.append((url, output_dir, None))
+                print(f"[{done}/{len(pending)}] Saved {url} -> {output_dir}")
+            except Exception as e:
+                results.append((url, None, str(e)))
+                print(f"[{done}/{len(pending)}] Failed {url}: {str(e)}", file=sys.stderr)
+    return results
+
+def main(argv: Optional[List[str]] = None):
+    """Bulk ingest transcripts for a list of YouTube URLs."""
+    parser = argparse.ArgumentParser(description="Download transcripts for many YouTube videos concurrently.")
+    parser.add_argument('source', nargs='?', default='-',
+                        help="file with one URL or video ID per line ('-' for stdin)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="maximum videos fetched at once (default: 8)")
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help="maximum requests per second to each host, 0 for unlimited (default: 5)")
+    parser.add_argument('--force', action='store_true',
+                        help="fetch videos again even if an earlier run already saved them")
+    args = parser.parse_args(argv)
+
+    if args.source == '-':
+        urls = read_urls(sys.stdin)
+    else:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            urls = read_urls(f)
+
+    print(f"Ingesting {len(urls)} videos (concurrency {args.concurrency}, {args.rate:g} req/s per host)...")
+    start = time.perf_counter()
+    results = ingest_all(urls, args.concurrency, args.rate, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    failures = [r for r in results if r[2]]
+    print(f"Done: {len(results) - len(failures)} saved, {len(failures)} failed in {elapsed:.1f}s")
+    print(get_client().format_stats())
+    print(get_cache().format_stats())
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Bracketed non-speech cues ("[Music]", "[Applause]", "[ __ ]") and music notes
+NON_SPEECH_PATTERN = re.compile(r'\[[^\]\n]*\]|♪+')
+SENTENCE_END = ('.', '?', '!')
+
+# Merged utterances stop growing at this length, or at a pause longer than MAX_GAP_SECONDS
+MAX_UTTERANCE_SECONDS = 12.0
+MAX_GAP_SECONDS = 1.5
+# Rolling captions repeat the tail of the previous line; shorter overlaps are treated as speech
+MIN_REPEAT_WORDS = 2
+MAX_REPEAT_WORDS = 12
+
+# (text, start, duration) of one caption segment; start is None for untimed lines
+SegmentRow = Tuple[str, Optional[float], float]
+
+def segment_rows(segments: Iterable[Dict]) -> Iterator[SegmentRow]:
+    """(text, start, duration) rows of segment dicts."""
+    for segment in segments:
+        yield segment['text'], segment.get('start'), segment.get('duration', 0.0)
+
+def _repeated_prefix(previous: List[str], lowered: List[str]) -> int:
+    """Number of leading words that repeat the end of the previous caption line."""
+    # Only positions holding the first word can start an overlap
+    first = lowered[0]
+    for i in range(len(previous) - MIN_REPEAT_WORDS + 1):
+        k = len(previous) - i
+        if previous[i] == first and k <= len(lowered) and previous[i:] == lowered[:k]:
+            return k
+    return 0
+
+def merge_caption_segments(segments: Iterable[Dict], max_seconds: float = MAX_UTTERANCE_SECONDS,
+                           max_gap: float = MAX_GAP_SECONDS) -> Iterator[Dict]:
+    """Turn auto-caption segment dicts into cleaner, longer utterances (see merge_caption_rows)."""
+    return merge_caption_rows(segment_rows(segments), max_seconds, max_gap)
+
+def merge_caption_rows(rows: Iterable[SegmentRow], max_seconds: float = MAX_UTTERANCE_SECONDS,
+                       max_gap: float = MAX_GAP_SECONDS) -> Iterator[Dict]:
+    """Turn auto-caption (text, start, duration) rows into cleaner, longer utterances in one pass.
+
+    Non-speech cues are dropped, words that repeat the end of the previous
+    line (rolling captions) are removed, and consecutive segments are joined
+    until an utterance spans max_seconds, ends a sentence, or is followed by
+    a pause of more than max_gap. Each utterance's duration is clipped to
+    where the next one starts, so utterances no longer overlap in time.
+    Segments without a start time are passed through unmerged.
+    """
+    previous_words: List[str] = []
+    current: Optional[Dict] = None
+    current_end = 0.0
+    for text, start, duration in rows:
+        if '[' in text or '♪' in text:
+            text = NON_SPEECH_PATTERN.sub(' ', text)
+        words = text.split()
+        if not words:
+            continue
+        lowered = text.lower().split()
+        repeated = _repeated_prefix(previous_words, lowered) if previous_words else 0
+        if repeated:
+            words = words[repeated:]
+            lowered = lowered[repeated:]
+            if not words:
+                continue
+        text = ' '.join(words)
+        previous_words = (previous_words + lowered)[-MAX_REPEAT_WORDS:] if len(lowered) < MAX_REPEAT_WORDS \
+            else lowered[-MAX_REPEAT_WORDS:]
+
+        if start is None:
+            if current is not None:
+                current["duration"] = round(current_end - current["start"], 3)
+                yield current
+                current = None
+            yield {"text": text, "start": None}
+            continue
+        end = start + duration
+
+        if current is not None and (start - current_end > max_gap or start - current["start"] >= max_seconds
+                                    or current["text"].endswith(SENTENCE_END)):
+            current["duration"] = round(min(current_end, start) - current["start"], 3)
+            yield current
+            current = None
+        if current is None:
+            current = {"text": text, "start": start}
+            current_end = end
+        else:
+            current["text"] += ' ' + text
+            current_end = max(current_end, end)
+    if current is not None:
+        current["duration"] = round(current_end - current["start"], 3)
+        yield current
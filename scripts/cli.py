@@ -0,0 +1,44 @@
+"""Single entry point for the pipeline: fetch, summarize, batch, sync and topics.
+
+Usage: python scripts/cli.py <command> [options]   (python scripts/cli.py <command> --help)
+
+Only the module a command needs is imported, once the command is known, so
+offline commands (summarize of existing directories, batch, sync, topics) never load
+youtube_transcript_api or requests, and sync skips the summarizer's keyword
+tables and NumPy entirely.
+"""
+import importlib
+import sys
+from typing import List, Optional
+
+# command -> (module, arguments prepended for it, help)
+COMMANDS = {
+    "fetch": ("bulk_ingest", [], "download transcripts for URLs in a file or on stdin"),
+    "summarize": ("summarize_transcript", [], "download and summarize one video, or re-summarize changed ones"),
+    "batch": ("summarize_transcript", ["--batch"], "re-summarize changed output directories in parallel"),
+    "sync": ("sync_to_drive", [], "copy changed notes to Google Drive"),
+    "topics": ("topic_clusters", [], "cluster key points across videos into topic notes"),
+}
+
+def usage() -> str:
+    lines = [__doc__.splitlines()[2], "", "Commands:"]
+    lines += [f"  {name:10} {help_text}" for name, (_, _, help_text) in COMMANDS.items()]
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    """Dispatch to a command's module, importing it only now."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        sys.exit(0 if argv else 2)
+    if argv[0] not in COMMANDS:
+        print(f"Unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+
+    module_name, extra_args, _ = COMMANDS[argv[0]]
+    # Subcommand parsers report errors under their own name
+    sys.argv[0] = f"cli.py {argv[0]}"
+    importlib.import_module(module_name).main(extra_args + argv[1:])
+
+if __name__ == "__main__":
+    main()
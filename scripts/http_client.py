@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+# (connect, read) timeouts in seconds so a hung socket can't stall a batch
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+# Status codes worth retrying; everything else is returned to the caller
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HttpClient:
+    """Pooled keep-alive HTTP client with timeouts, retries and latency counters.
+
+    Safe to share between threads: connections are reused through the
+    session's connection pool and counters are updated under a lock.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, pool_size: int = 16):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        # requests is imported with the first client, not by offline importers of this module
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0
+        }
+
+    def get(self, url: str, **kwargs) -> 'requests.Response':
+        """GET a URL, retrying connection errors, timeouts and transient statuses.
+
+        The final response is returned even if its status is an error; the
+        last connection error is raised once retries are exhausted.
+        """
+        import requests
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            response = None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    self._record(time.perf_counter() - start, failed=True)
+                    raise
+                print(f"Retrying {url} after error: {str(e)}")
+            self._record(time.perf_counter() - start,
+                         failed=response is not None and response.status_code >= 400)
+
+            if response is not None and (response.status_code not in RETRY_STATUSES
+                                         or attempt == self.max_retries):
+                return response
+
+            with self._lock:
+                self.stats["retries"] += 1
+            time.sleep(self._backoff_delay(attempt, response))
+
+    def _backoff_delay(self, attempt: int, response: Optional['requests.Response']) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def _record(self, latency: float, failed: bool = False):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["total_latency"] += latency
+            self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+            if failed:
+                self.stats["failures"] += 1
+
+    def format_stats(self) -> str:
+        """Human-readable request/latency summary."""
+        with self._lock:
+            stats = dict(self.stats)
+        requests_made = stats["requests"]
+        mean = stats["total_latency"] / requests_made if requests_made else 0.0
+        return (f"HTTP: {requests_made} requests, {stats['retries']} retries, {stats['failures']} failed, "
+                f"mean latency {mean * 1000:.0f}ms, max {stats['max_latency'] * 1000:.0f}ms")
+
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+def get_client() -> HttpClient:
+    """Return the process-wide shared client, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
@@ -0,0 +1,142 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+QUEUE_FILENAME = ".job_queue.sqlite"
+
+# Job states, in lifecycle order
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATES = (QUEUED, RUNNING, DONE, FAILED)
+
+class JobQueue:
+    """Durable FIFO of video jobs stored in SQLite under output/.
+
+    Claiming a job is a single IMMEDIATE transaction, so any number of
+    threads (or worker processes) can take jobs from the same queue without
+    running one twice. Each job records when it was enqueued, started and
+    finished, so queue wait and processing latency can be reported.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.pid = os.getpid()
+        os.makedirs(output_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(output_dir, QUEUE_FILENAME), timeout=30,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                output_dir TEXT,
+                error TEXT,
+                metrics TEXT
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    def enqueue(self, url: str, video_id: str) -> Optional[int]:
+        """Add a job, returning its ID, or None if the video is already queued or running."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                pending = self._conn.execute(
+                    "SELECT 1 FROM jobs WHERE video_id = ? AND status IN (?, ?)",
+                    (video_id, QUEUED, RUNNING)).fetchone()
+                job_id = None
+                if not pending:
+                    job_id = self._conn.execute(
+                        "INSERT INTO jobs (url, video_id, status, enqueued) VALUES (?, ?, ?, ?)",
+                        (url, video_id, QUEUED, time.time())).lastrowid
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def claim(self) -> Optional[Tuple[int, str, str]]:
+        """Mark the oldest queued job as running and return (id, url, video_id), if any."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, url, video_id FROM jobs WHERE status = ? ORDER BY id LIMIT 1",
+                    (QUEUED,)).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started = ?, attempts = attempts + 1 WHERE id = ?",
+                        (RUNNING, time.time(), row[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def finish(self, job_id: int, output_dir: Optional[str] = None, error: Optional[str] = None,
+               metrics: Optional[Dict] = None):
+        """Record a job as done, or failed if an error is given."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished = ?, output_dir = ?, error = ?, metrics = ? WHERE id = ?",
+                (FAILED if error else DONE, time.time(), output_dir, error,
+                 json.dumps(metrics) if metrics else None, job_id))
+
+    def requeue(self, status: str) -> int:
+        """Put every job in a state back on the queue; returns how many were requeued.
+
+        Used for 'running' jobs left behind by a worker that was stopped, and
+        to retry 'failed' ones.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, started = NULL, finished = NULL, error = NULL WHERE status = ?",
+                (QUEUED, status)).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(rows)
+        return counts
+
+    def jobs(self, limit: int = 20, status: Optional[str] = None) -> List[Dict]:
+        """Most recent jobs first, optionally only those in one state."""
+        query = "SELECT id, url, video_id, status, attempts, enqueued, started, finished, output_dir, error FROM jobs"
+        params: Tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id DESC LIMIT ?", params + (limit,)).fetchall()
+        keys = ("id", "url", "video_id", "status", "attempts", "enqueued", "started", "finished", "output_dir", "error")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def latencies(self, limit: int = 1000) -> List[Tuple[float, float]]:
+        """(queue wait, processing time) in seconds for the most recently finished jobs."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT started - enqueued, finished - started FROM jobs WHERE status IN (?, ?) "
+                "AND finished IS NOT NULL ORDER BY finished DESC LIMIT ?", (DONE, FAILED, limit)).fetchall()
+
+_queues: Dict[str, JobQueue] = {}
+_queues_lock = threading.Lock()
+
+def get_job_queue(output_dir: str = "output") -> JobQueue:
+    """Return the process-wide job queue for an output directory, opening it on first use."""
+    with _queues_lock:
+        if output_dir not in _queues or _queues[output_dir].pid != os.getpid():
+            _queues[output_dir] = JobQueue(output_dir)
+        return _queues[output_dir]
@@ -0,0 +1,86 @@
+import re
+from typing import Dict, List, Set
+
+# Bonus patterns applied once a sentence matches a category
+COMPLETE_THOUGHT_PATTERN = re.compile(r'\b(is|are|was|were|have|has|do|does|should|must|can|will)\b')
+EXAMPLE_PATTERN = re.compile(r'example|instance|case')
+
+def _trie_regex(words: List[str]) -> str:
+    """Build a prefix-factored alternation that matches the longest word first."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node: Dict) -> str:
+        alternatives = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        if '' in node:
+            # Greedy optional group: prefer continuing to a longer keyword
+            return '(?:' + '|'.join(alternatives) + ')?'
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    return emit(trie)
+
+class KeywordScorer:
+    """Score sentences for every category with one compiled multi-keyword scan.
+
+    Matching keeps the semantics of the original ``word in sentence`` checks:
+    each keyword counts once when it occurs anywhere in the sentence, including
+    inside longer words and overlapping other keywords. Keywords and weights
+    come from a taxonomy profile (see taxonomy.py).
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[str, int]]):
+        self.categories = list(keywords)
+
+        # keyword -> list of (category, weight)
+        self._weights: Dict[str, List] = {}
+        for category, word_weights in keywords.items():
+            for word, weight in word_weights.items():
+                self._weights.setdefault(word, []).append((category, weight))
+
+        # The scan reports the longest keyword at each position; every shorter
+        # keyword starting at the same position is a prefix of it.
+        words = list(self._weights)
+        self._prefixes = {word: [p for p in words if word.startswith(p)] for word in words}
+
+        self._pattern = re.compile(_trie_regex(words))
+
+    def matched_keywords(self, sentence_lower: str) -> Set[str]:
+        """Return every keyword contained in an already lowercased sentence."""
+        matched = set()
+        search = self._pattern.search
+        match = search(sentence_lower)
+        while match:
+            matched.update(self._prefixes[match.group()])
+            # Resume one character later so overlapping keywords are found too
+            match = search(sentence_lower, match.start() + 1)
+        return matched
+
+    def score(self, sentence: str, word_count: int) -> Dict[str, int]:
+        """Score a sentence for all categories, returning only positive scores."""
+        sentence_lower = sentence.lower()
+        scores: Dict[str, int] = {}
+        for word in self.matched_keywords(sentence_lower):
+            for category, weight in self._weights[word]:
+                scores[category] = scores.get(category, 0) + weight
+
+        if scores:
+            # Bonus points for sentences that seem more complete/meaningful
+            bonus = 0
+            if COMPLETE_THOUGHT_PATTERN.search(sentence_lower):
+                bonus += 1
+            if word_count >= 15:  # Bonus for longer, more complete thoughts
+                bonus += 1
+            if not EXAMPLE_PATTERN.search(sentence_lower):  # Prefer general statements
+                bonus += 1
+            for category in scores:
+                scores[category] += bonus
+
+        return scores
@@ -0,0 +1,166 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+
+FRONTMATTER_DELIMITER = '---'
+FENCE_PREFIXES = ('```', '~~~')
+
+def line_ending(content: str) -> str:
+    """'\r\n' if the first line of content ends with CRLF, else '\n'."""
+    end = content.find('\n')
+    return '\r\n' if end > 0 and content[end - 1] == '\r' else '\n'
+
+def split_lines(text: str) -> List[str]:
+    """Lines with their endings, split on '\n' only (str.splitlines also splits on '\r', form feeds, ...)."""
+    lines = [line + '\n' for line in text.split('\n')]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+class MarkdownNote:
+    """A markdown note parsed once into frontmatter, preamble and '## ' sections.
+
+    A section's text runs from its heading line up to the next level-2
+    heading (headings inside fenced code blocks don't count), so rendering
+    reproduces every section that was not edited byte-for-byte, including
+    CRLF line endings and a missing final newline. body() returns text with
+    '\n' line endings and set_section()/set_frontmatter() convert back to
+    the note's own.
+    """
+
+    def __init__(self, frontmatter: str = '', preamble: str = '',
+                 sections: Optional[List[Tuple[str, str]]] = None, newline: str = '\n'):
+        self.frontmatter = frontmatter
+        self.preamble = preamble
+        # (name, text including the heading line)
+        self.sections: List[Tuple[str, str]] = sections or []
+        self.newline = newline
+
+    @classmethod
+    def parse(cls, content: str) -> 'MarkdownNote':
+        newline = line_ending(content)
+        delimiter = FRONTMATTER_DELIMITER + newline
+        frontmatter = ''
+        if content.startswith(delimiter):
+            end = content.find(newline + delimiter, len(FRONTMATTER_DELIMITER))
+            if end >= 0:
+                frontmatter = content[:end + len(newline) + len(delimiter)]
+
+        preamble: List[str] = []
+        sections: List[Tuple[str, List[str]]] = []
+        in_fence = False
+        for line in split_lines(content[len(frontmatter):]):
+            if line.startswith(FENCE_PREFIXES):
+                in_fence = not in_fence
+            elif not in_fence and line.startswith('## '):
+                sections.append((line[3:].strip(), []))
+            (sections[-1][1] if sections else preamble).append(line)
+        return cls(frontmatter, ''.join(preamble), [(name, ''.join(lines)) for name, lines in sections], newline)
+
+    @classmethod
+    def load(cls, path: str) -> 'MarkdownNote':
+        # newline='' keeps line endings as they are, so save() writes the same bytes back
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return cls.parse(f.read())
+
+    def _native(self, text: str) -> str:
+        """Text with '\n' line endings converted to the note's own."""
+        if self.newline == '\n':
+            return text
+        return text.replace('\r\n', '\n').replace('\n', self.newline)
+
+    def _index(self, name: str) -> int:
+        for i, (section_name, _) in enumerate(self.sections):
+            if section_name == name:
+                return i
+        return -1
+
+    def body(self, name: str) -> Optional[str]:
+        """Text of the first section called name, without its heading line, with '\n' line endings."""
+        i = self._index(name)
+        if i < 0:
+            return None
+        body = self.sections[i][1].partition('\n')[2]
+        return body.replace('\r\n', '\n') if self.newline != '\n' else body
+
+    def first_line(self, name: str) -> Optional[str]:
+        """First line of a section's body, stripped (e.g. the value under '## Title')."""
+        body = self.body(name)
+        if body is None:
+            return None
+        return body.partition('\n')[0].strip()
+
+    def frontmatter_list(self, key: str) -> List[str]:
+        """Values of a frontmatter key: a '- item' block list, an inline [a, b] list or a single value."""
+        values: List[str] = []
+        in_list = False
+        for line in self.frontmatter.splitlines()[1:-1]:
+            if in_list:
+                if line.lstrip().startswith('- '):
+                    values.append(line.lstrip()[2:].strip().strip('"\''))
+                    continue
+                break
+            if line.startswith(f"{key}:"):
+                value = line[len(key) + 1:].strip()
+                if not value:
+                    in_list = True
+                elif value.startswith('[') and value.endswith(']'):
+                    values = [item.strip().strip('"\'') for item in value[1:-1].split(',') if item.strip()]
+                else:
+                    values = [value.strip('"\'')]
+        return values
+
+    def set_frontmatter(self, frontmatter: str):
+        """Replace the frontmatter block (delimiters included)."""
+        self.frontmatter = self._native(frontmatter)
+
+    def remove_section(self, name: str):
+        """Remove every section called name."""
+        self.sections = [section for section in self.sections if section[0] != name]
+
+    def set_section(self, name: str, body: str, before: Optional[str] = None, after: Optional[str] = None):
+        """Replace the section called name, or add it before/after another section.
+
+        An existing section keeps its position (duplicates of it are dropped).
+        A new one goes before `before` if that exists, else after `after`,
+        else at the end of the note.
+        """
+        text = self._native(f"## {name}\n{body}")
+        i = self._index(name)
+        if i >= 0:
+            self.sections[i] = (name, text)
+            self.sections[i + 1:] = [section for section in self.sections[i + 1:] if section[0] != name]
+            return
+
+        i = self._index(before) if before else -1
+        if i < 0 and after:
+            i = self._index(after)
+            i = i + 1 if i >= 0 else -1
+        if i < 0:
+            i = len(self.sections)
+        if i > 0:
+            self._end_with_blank_line(i - 1)
+        elif not self.preamble.endswith('\n') and self.preamble:
+            self.preamble += self.newline
+        self.sections.insert(i, (name, text))
+
+    def _end_with_blank_line(self, i: int):
+        # Only touches whitespace at the very end of a section that is followed by a new heading
+        name, text = self.sections[i]
+        if not text.endswith(self.newline * 2):
+            self.sections[i] = (name, text + (self.newline if text.endswith('\n') else self.newline * 2))
+
+    def render(self) -> str:
+        return self.frontmatter + self.preamble + ''.join(text for _, text in self.sections)
+
+    def save(self, path: str) -> int:
+        """Write the note atomically (temp file + rename) and return the bytes written.
+
+        The temp file is unique to the process and thread, so concurrent saves
+        of one note each replace it with a whole note of their own.
+        """
+        data = self.render().encode('utf-8')
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
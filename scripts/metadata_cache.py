@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+DEFAULT_CACHE_PATH = os.path.join("output", ".metadata_cache.sqlite")
+DEFAULT_TTL = 30 * 24 * 3600  # 30 days
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# A hit only rewrites an entry's access time once it is older than this, so reads stay read-only
+ACCESS_RESOLUTION = 3600
+
+class MetadataCache:
+    """Persistent SQLite cache for video titles and transcripts.
+
+    Entries are keyed by (kind, video ID, language), expire after a TTL and
+    are evicted least-recently-used first once the cache exceeds max_bytes.
+    Access times are kept to ACCESS_RESOLUTION, and expired entries are
+    dropped when read or when the cache fills. Safe to share between threads;
+    each process opens its own connection (see get_cache).
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.pid = os.getpid()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (kind, video_id, language)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+        # Running total of entry sizes; other processes sharing the file make it
+        # approximate, so it is recounted before evicting
+        self._total = self._count_size()
+
+    def get(self, kind: str, video_id: str, language: str = '') -> Optional[Any]:
+        """Return a cached value, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, created, accessed FROM entries WHERE kind = ? AND video_id = ? AND language = ?",
+                (kind, video_id, language)).fetchone()
+            if row and now - row[2] <= self.ttl:
+                if now - row[3] > ACCESS_RESOLUTION:
+                    self._conn.execute(
+                        "UPDATE entries SET accessed = ? WHERE kind = ? AND video_id = ? AND language = ?",
+                        (now, kind, video_id, language))
+                    self._conn.commit()
+                self.stats["hits"] += 1
+                return json.loads(row[0])
+            if row:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE kind = ? AND video_id = ? AND language = ?",
+                    (kind, video_id, language))
+                self._conn.commit()
+                self._total -= row[1]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, kind: str, video_id: str, value: Any, language: str = ''):
+        """Store a value and evict old entries if the cache grew past max_bytes."""
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            replaced = self._conn.execute(
+                "SELECT size FROM entries WHERE kind = ? AND video_id = ? AND language = ?",
+                (kind, video_id, language)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, video_id, language, data, len(data), now, now))
+            self._total += len(data) - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def get_or_fetch(self, kind: str, video_id: str, fetch: Callable[[], Any], language: str = '') -> Any:
+        """Return a cached value, calling fetch and caching its result on a miss."""
+        value = self.get(kind, video_id, language)
+        if value is None:
+            value = fetch()
+            self.put(kind, video_id, value, language)
+        return value
+
+    def _count_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        self._conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+        total = self._total = self._count_size()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT kind, video_id, language, size FROM entries ORDER BY accessed").fetchall()
+        for kind, video_id, language, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM entries WHERE kind = ? AND video_id = ? AND language = ?",
+                (kind, video_id, language))
+            total -= size
+            self.stats["evictions"] += 1
+        self._total = total
+
+    def format_stats(self) -> str:
+        """Human-readable hit/miss summary."""
+        return (f"Cache: {self.stats['hits']} hits, {self.stats['misses']} misses, "
+                f"{self.stats['evictions']} evictions")
+
+_default_cache: Optional[MetadataCache] = None
+_default_cache_lock = threading.Lock()
+
+def get_cache() -> MetadataCache:
+    """Return the process-wide shared cache, opening it on first use.
+
+    Forked worker processes open their own connection instead of reusing the parent's.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.pid != os.getpid():
+            _default_cache = MetadataCache()
+        return _default_cache
@@ -0,0 +1,134 @@
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python signatures are fine for a few hundred sentences
+    np = None
+
+# Shingle-set Jaccard similarity at or above which two sentences count as duplicates
+DEFAULT_THRESHOLD = 0.6
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 2
+# Sets hashed per NumPy pass, bounding the permuted-hash matrix to a few MB
+CHUNK_SIZE = 1024
+# Groups compared against per LSH bucket, so a huge bucket costs linear time, not quadratic
+MAX_BUCKET_GROUPS = 16
+
+MERSENNE_PRIME = (1 << 31) - 1
+WORD_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+def shingles(sentence: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Word n-grams of a lowercased sentence (single words if it is shorter than size)."""
+    words = WORD_PATTERN.findall(sentence.lower())
+    if len(words) < size:
+        return frozenset(words)
+    return frozenset(' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def lsh_bands(threshold: float, num_perm: int = NUM_PERMUTATIONS) -> Tuple[int, int]:
+    """Pick (bands, rows) whose LSH collision threshold is just below the similarity threshold.
+
+    Pairs at the threshold then almost always share a bucket; false
+    positives are removed by the exact Jaccard check.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+class MinHasher:
+    """MinHash signatures over shingle sets from a fixed family of hash permutations."""
+
+    def __init__(self, num_perm: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+
+    def signatures(self, shingle_sets: Sequence[FrozenSet[str]]) -> List[Tuple[int, ...]]:
+        """Signature per set; empty sets get an all-max signature."""
+        hashed = [[zlib.crc32(s.encode('utf-8')) for s in shingle_set] for shingle_set in shingle_sets]
+        if np is not None:
+            signatures = []
+            for i in range(0, len(hashed), CHUNK_SIZE):
+                signatures.extend(self._signatures_numpy(hashed[i:i + CHUNK_SIZE]))
+            return signatures
+        empty = (MERSENNE_PRIME,) * self.num_perm
+        return [
+            tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in zip(self._a, self._b))
+            if hashes else empty
+            for hashes in hashed
+        ]
+
+    def _signatures_numpy(self, hashed: List[List[int]]) -> List[Tuple[int, ...]]:
+        # All shingle hashes of all sets in one array, permuted at once and
+        # reduced per set; a, h < 2^32 so a * h + b fits in int64
+        lengths = np.fromiter((len(hashes) for hashes in hashed), dtype=np.int64, count=len(hashed))
+        values = np.fromiter((h for hashes in hashed for h in hashes), dtype=np.int64, count=int(lengths.sum()))
+        a = np.asarray(self._a, dtype=np.int64)[:, None]
+        b = np.asarray(self._b, dtype=np.int64)[:, None]
+        permuted = (a * values[None, :] + b) % MERSENNE_PRIME
+
+        result = np.full((len(hashed), self.num_perm), MERSENNE_PRIME, dtype=np.int64)
+        nonempty = lengths > 0
+        if values.size:
+            offsets = np.concatenate(([0], np.cumsum(lengths[nonempty])[:-1]))
+            result[nonempty] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return [tuple(row) for row in result.tolist()]
+
+def near_duplicate_groups(sentences: Sequence[str], threshold: float = DEFAULT_THRESHOLD,
+                          hasher: Optional[MinHasher] = None) -> List[int]:
+    """Group near-duplicate sentences, returning a group ID per sentence.
+
+    Sentences are bucketed by bands of their MinHash signatures, so only
+    sentences sharing a bucket are compared, then joined when their shingle
+    Jaccard similarity is at least threshold. Within a bucket each sentence
+    is compared with one representative of each group seen there so far, up
+    to MAX_BUCKET_GROUPS of them. Groups are transitive, and a group's ID is
+    the index of its first sentence.
+    """
+    hasher = hasher or MinHasher()
+    shingle_sets = [shingles(sentence) for sentence in sentences]
+    signatures = hasher.signatures(shingle_sets)
+    bands, rows = lsh_bands(threshold, hasher.num_perm)
+
+    parent = list(range(len(sentences)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+        for i, signature in enumerate(signatures):
+            buckets[signature[band * rows:(band + 1) * rows]].append(i)
+        for members in buckets.values():
+            representatives: List[int] = []
+            for i in members:
+                for j in representatives:
+                    root_i, root_j = find(i), find(j)
+                    if root_i == root_j:
+                        break
+                    if jaccard(shingle_sets[i], shingle_sets[j]) >= threshold:
+                        # Keep the earliest sentence as the root
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+                        break
+                else:
+                    if len(representatives) < MAX_BUCKET_GROUPS:
+                        representatives.append(i)
+
+    return [find(i) for i in range(len(sentences))]
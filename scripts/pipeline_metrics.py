@@ -0,0 +1,169 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+METRICS_FILENAME = ".summary_metrics.jsonl"
+# Past this size the metrics log is cut down to its newest records
+MAX_METRICS_BYTES = 16 * 1024 * 1024
+
+class _Stage:
+    """Context manager adding its elapsed time to one stage of a StageMetrics."""
+
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics: 'StageMetrics', name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._metrics.add_time(self._name, time.perf_counter() - self._start)
+
+class StageMetrics:
+    """Per-stage wall-clock timers and counters for one unit of work (one video).
+
+    Stages can be entered many times (e.g. once per sentence); their time and
+    call counts accumulate. Not thread-safe: each thread has its own current
+    collector.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    def stage(self, name: str) -> _Stage:
+        """Time a block: ``with metrics.stage('clean'): ...``"""
+        return _Stage(self, name)
+
+    def add_time(self, name: str, seconds: float):
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def record(self, video: str, **extra) -> Dict:
+        """JSON-serializable metrics record for this unit of work."""
+        record = {
+            "video": video,
+            "finished": datetime.now().isoformat(timespec='seconds'),
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": {
+                name: {"seconds": round(seconds, 6), "calls": self.calls[name]}
+                for name, seconds in self.seconds.items()
+            },
+            "counters": dict(self.counters),
+        }
+        record.update(extra)
+        return record
+
+_local = threading.local()
+
+def current_metrics() -> StageMetrics:
+    """Metrics collector for the video currently being processed in this thread."""
+    metrics = getattr(_local, 'metrics', None)
+    if metrics is None:
+        metrics = start_video_metrics()
+    return metrics
+
+def start_video_metrics() -> StageMetrics:
+    """Start a fresh collector for the next video and make it current in this thread."""
+    _local.metrics = StageMetrics()
+    return _local.metrics
+
+def append_records(path: str, records: Iterable[Dict], max_bytes: int = MAX_METRICS_BYTES):
+    """Append metrics records to a JSON Lines file, keeping it under max_bytes.
+
+    Once the file grows past max_bytes it is rewritten with the newest
+    records that fit in half of max_bytes, so rewrites stay rare. A record
+    another process appends during the rewrite may be lost.
+    """
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        size = f.tell()
+    if size > max_bytes:
+        _keep_tail(path, max_bytes // 2)
+
+def _keep_tail(path: str, keep_bytes: int):
+    """Rewrite a JSON Lines file with its last whole lines that fit in keep_bytes."""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        # Read one byte early so a cut that falls on a line start keeps that line
+        start = max(0, size - keep_bytes - 1)
+        f.seek(start)
+        tail = f.read()
+    if start > 0:
+        tail = tail[tail.find(b"\n") + 1:]
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(tail)
+    os.replace(tmp_path, path)
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def format_report(records: List[Dict]) -> str:
+    """Aggregate per-video records into a stage timing and counter report."""
+    if not records:
+        return "No videos processed"
+    per_stage: Dict[str, List[float]] = defaultdict(list)
+    counters: Dict[str, int] = defaultdict(int)
+    for record in records:
+        for name, stage in record["stages"].items():
+            per_stage[name].append(stage["seconds"])
+        for name, value in record["counters"].items():
+            counters[name] += value
+    totals = [record["total_seconds"] for record in records]
+
+    lines = [f"Stage times over {len(records)} videos:",
+             f"  {'stage':18} {'total':>10} {'mean':>10} {'p95':>10}"]
+    rows = sorted(per_stage.items(), key=lambda item: sum(item[1]), reverse=True)
+    rows.append(("(video total)", totals))
+    for name, values in rows:
+        # Videos that never entered a stage spent no time in it
+        values = values + [0.0] * (len(records) - len(values))
+        lines.append(f"  {name:18} {sum(values):9.3f}s {sum(values) / len(values) * 1000:8.1f}ms "
+                     f"{_percentile(values, 0.95) * 1000:8.1f}ms")
+    if counters:
+        lines.append("Counters: " + ", ".join(f"{name} {value:,}" for name, value in sorted(counters.items())))
+    return "\n".join(lines)
+
+@contextmanager
+def profiling(profile_path: Optional[str]) -> Iterator[None]:
+    """Capture a cProfile dump of the block to profile_path, if one is given."""
+    if not profile_path:
+        yield
+        return
+    os.makedirs(os.path.dirname(profile_path) or '.', exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
+
+def format_profiles(paths: List[str], limit: int = 20) -> str:
+    """Merge cProfile dumps and list the functions with the most cumulative time."""
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        return "No profiles captured"
+    out = io.StringIO()
+    stats = pstats.Stats(*paths, stream=out)
+    stats.sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,177 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from caption_filter import SegmentRow, segment_rows
+from transcript_store import iter_segment_rows
+from video_index import get_index
+
+SEARCH_FILENAME = ".search_index.sqlite"
+
+# FTS5's NOT is binary ("money NOT power"), so "money AND NOT power" is rewritten to it;
+# quoted phrases are matched first and left alone
+AND_NOT_PATTERN = re.compile(r'("[^"]*")|\bAND\s+NOT\b')
+
+def fts_query(query: str) -> str:
+    """Rewrite "a AND NOT b" to FTS5's binary "a NOT b"."""
+    return AND_NOT_PATTERN.sub(lambda match: match.group(1) or 'NOT', query)
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as mm:ss, matching transcript.txt."""
+    timestamp = int(seconds)
+    return f"{timestamp // 60:02d}:{timestamp % 60:02d}"
+
+def deep_link(video_id: str, seconds: float) -> str:
+    """YouTube link that starts playback at a timestamp."""
+    return f"https://youtu.be/{video_id}?t={int(seconds)}"
+
+class SearchIndex:
+    """Full-text search over transcript segments across the whole corpus.
+
+    Backed by an SQLite FTS5 table (a positional inverted index) under
+    output/, one row per segment keyed by video ID and start time. Each
+    video's segments occupy a contiguous rowid range so re-indexing a video
+    only touches its own rows. Queries use FTS5 syntax: bare words are
+    ANDed, "quoted phrases" match positions within a segment, and AND / OR /
+    parentheses combine terms; "a NOT b" (or "a AND NOT b") excludes b. Hits
+    are ranked by BM25.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.pid = os.getpid()
+        os.makedirs(output_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(output_dir, SEARCH_FILENAME),
+                                     timeout=30, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+                text, video_id UNINDEXED, start UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                title TEXT,
+                first_rowid INTEGER NOT NULL,
+                last_rowid INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS videos_last_rowid ON videos (last_rowid);
+        """)
+        self._conn.commit()
+
+    def add_video(self, video_id: str, segments: Iterable[Dict], title: Optional[str] = None):
+        """Index (or re-index) all segments of one video."""
+        self.add_video_rows(video_id, segment_rows(segments), title)
+
+    def add_video_rows(self, video_id: str, segments: Iterable[SegmentRow], title: Optional[str] = None):
+        """Like add_video, for (text, start, duration) rows."""
+        rows = [(text, start) for text, start, _ in segments]
+        with self._lock, self._conn:
+            self._delete_rows(video_id)
+            first_rowid = self._conn.execute(
+                "SELECT COALESCE(MAX(last_rowid), 0) + 1 FROM videos").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO segments (rowid, text, video_id, start) VALUES (?, ?, ?, ?)",
+                [(first_rowid + i, text, video_id, start) for i, (text, start) in enumerate(rows)])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?)",
+                (video_id, title, first_rowid, first_rowid + len(rows) - 1))
+
+    def remove_video(self, video_id: str):
+        """Drop a video from the index."""
+        with self._lock, self._conn:
+            self._delete_rows(video_id)
+            self._conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,))
+
+    def _delete_rows(self, video_id: str):
+        row = self._conn.execute(
+            "SELECT first_rowid, last_rowid FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM segments WHERE rowid BETWEEN ? AND ?", row)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Return the best matching segments for an FTS5 query, best first.
+
+        Raises sqlite3.OperationalError for a malformed query.
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT s.video_id, s.start, snippet(segments, 0, '**', '**', '...', 16), s.rank, v.title
+                FROM segments AS s JOIN videos AS v ON v.video_id = s.video_id
+                WHERE segments MATCH ?
+                ORDER BY s.rank
+                LIMIT ?""", (fts_query(query), limit)).fetchall()
+        return [
+            {"video_id": video_id, "start": start, "snippet": snippet, "score": -rank, "title": title}
+            for video_id, start, snippet, rank, title in rows
+        ]
+
+    def video_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def build(self):
+        """Index every video in output/ from its stored transcript segments."""
+        indexed = 0
+        for video_id, video_dir, title in get_index(self.output_dir).entries():
+            rows = iter_segment_rows(video_dir)
+            if rows is None:
+                continue
+            self.add_video_rows(video_id, rows, title)
+            indexed += 1
+        return indexed
+
+_indexes: Dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_search_index(output_dir: str = "output") -> SearchIndex:
+    """Return the process-wide search index for an output directory, opening it on first use."""
+    with _indexes_lock:
+        if output_dir not in _indexes or _indexes[output_dir].pid != os.getpid():
+            _indexes[output_dir] = SearchIndex(output_dir)
+        return _indexes[output_dir]
+
+def main():
+    """Build the search index or query it."""
+    parser = argparse.ArgumentParser(
+        description="Search transcripts across all videos.",
+        epilog='Query examples: career change | "big change" | money NOT power | (boss OR manager) "shut up"')
+    parser.add_argument('query', nargs='?', help="search query (FTS5 syntax)")
+    parser.add_argument('--build', action='store_true', help="(re)index every video in the output directory")
+    parser.add_argument('--limit', type=int, default=20, help="maximum hits to show (default: 20)")
+    parser.add_argument('--output-dir', default="output")
+    args = parser.parse_args()
+
+    index = get_search_index(args.output_dir)
+    if args.build:
+        start = time.perf_counter()
+        indexed = index.build()
+        print(f"Indexed {indexed} videos in {time.perf_counter() - start:.1f}s")
+    if not args.query:
+        if not args.build:
+            parser.print_help()
+        return
+
+    start = time.perf_counter()
+    try:
+        hits = index.search(args.query, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"Error: Invalid query {args.query!r} ({str(e)}). Combine words and \"quoted phrases\" "
+              f"with AND, OR and parentheses, and exclude terms with 'a NOT b'.")
+        sys.exit(1)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for rank, hit in enumerate(hits, 1):
+        title = hit['title'] or hit['video_id']
+        print(f"{rank:2d}. [{format_timestamp(hit['start'])}] {title}")
+        print(f"    {deep_link(hit['video_id'], hit['start'])}")
+        print(f"    {hit['snippet']}")
+    print(f"{len(hits)} hits in {elapsed:.1f}ms across {index.video_count()} videos")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only the keyword ranker works without NumPy
+    np = None
+
+# scipy.sparse, imported on first use: only the vectorized rankers need it and
+# it takes longer to import than the rest of the summarizer
+_sparse = False
+
+def get_sparse():
+    """Return scipy.sparse, or None if SciPy is not installed."""
+    global _sparse
+    if _sparse is False:
+        try:
+            from scipy import sparse
+        except ImportError:  # Dense matrices are fine for a single transcript
+            sparse = None
+        _sparse = sparse
+    return _sparse
+
+from video_index import get_index
+
+RANKERS = ("keywords", "tfidf", "textrank")
+IDF_FILENAME = ".corpus_idf.json"
+TERMS_FILENAME = ".corpus_terms.txt"
+# Bumped when the layout of the IDF cache changes
+CACHE_VERSION = 2
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z']*")
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be because been before being but by can
+could did do does doing don't down for from had has have having he her here him his how i if in
+into is it it's its just know like me more most my no not now of off on once only or other our
+out over really right say said she so some such than that that's the their them then there these
+they this those through to too um uh up very was we well were what when where which who why will
+with would yeah you your
+""".split())
+
+# TextRank power iteration settings
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words of a sentence."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+def require_numpy(ranker: str):
+    """Fail early with an install hint when a vectorized ranker is picked without NumPy."""
+    if ranker not in RANKERS:
+        raise ValueError(f"Unknown ranker {ranker!r} (expected one of {', '.join(RANKERS)})")
+    if ranker != "keywords" and np is None:
+        raise RuntimeError(f"The {ranker} ranker needs NumPy: pip install numpy scipy")
+
+class CorpusIdf:
+    """Document frequencies of terms across every transcript in output/.
+
+    Each transcript.txt counts as one document. Its distinct terms are
+    appended as one line to output/.corpus_terms.txt, and
+    output/.corpus_idf.json keeps the counts together with each transcript's
+    size, mtime and line position. A refresh only tokenizes added or changed
+    transcripts and subtracts the stored terms of changed or removed ones, so
+    a new video costs one transcript rather than a pass over the corpus. The
+    terms file is compacted once most of it belongs to replaced documents.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, IDF_FILENAME)
+        self.terms_path = os.path.join(output_dir, TERMS_FILENAME)
+        self.doc_count = 0
+        self.df: Dict[str, int] = {}
+        # video directory name -> [size, mtime_ns, offset, length] of its terms line
+        self.docs: Dict[str, List[int]] = {}
+        self.terms_bytes = 0
+        self.refresh()
+
+    def _sources(self) -> Dict[str, List[int]]:
+        sources = {}
+        for video_dir in get_index(self.output_dir).video_dirs():
+            transcript_path = os.path.join(video_dir, "transcript.txt")
+            if os.path.exists(transcript_path):
+                stat = os.stat(transcript_path)
+                sources[os.path.basename(video_dir)] = [stat.st_size, stat.st_mtime_ns]
+        return sources
+
+    def _load(self):
+        """Load the cached counts, or start empty if the cache is missing or inconsistent."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("version") != CACHE_VERSION:
+                raise ValueError("old cache format")
+            terms_size = os.path.getsize(self.terms_path)
+            if terms_size < cached["terms_bytes"]:
+                raise ValueError("terms file is shorter than the cache expects")
+            if terms_size > cached["terms_bytes"]:
+                # Lines appended by a run that stopped before saving the cache
+                os.truncate(self.terms_path, cached["terms_bytes"])
+            self.df = cached["df"]
+            self.docs = cached["docs"]
+            self.terms_bytes = cached["terms_bytes"]
+        except (OSError, ValueError, KeyError):
+            self.df, self.docs, self.terms_bytes = {}, {}, 0
+            with open(self.terms_path, 'wb'):
+                pass
+
+    def refresh(self):
+        """Bring the counts up to date with added, removed and changed transcripts."""
+        sources = self._sources()
+        self._load()
+        stale = [name for name, doc in self.docs.items() if doc[:2] != sources.get(name)]
+        added = [name for name in sources if name not in self.docs or self.docs[name][:2] != sources[name]]
+        self.doc_count = len(self.docs) - len(stale) + len(added)
+        if not stale and not added:
+            return
+
+        df = Counter(self.df)
+        if stale:
+            with open(self.terms_path, 'rb') as f:
+                for name in stale:
+                    _, _, offset, length = self.docs.pop(name)
+                    f.seek(offset)
+                    df.subtract(f.read(length).decode('utf-8').split())
+        with open(self.terms_path, 'ab') as f:
+            for name in added:
+                with open(os.path.join(self.output_dir, name, "transcript.txt"), 'r', encoding='utf-8') as transcript:
+                    terms = sorted(set(tokenize(transcript.read())))
+                line = (' '.join(terms) + '\n').encode('utf-8')
+                f.write(line)
+                self.docs[name] = sources[name] + [self.terms_bytes, len(line)]
+                self.terms_bytes += len(line)
+                df.update(terms)
+        self.df = {term: count for term, count in df.items() if count > 0}
+
+        if 2 * sum(doc[3] for doc in self.docs.values()) < self.terms_bytes:
+            self._compact()
+        self._save()
+
+    def _compact(self):
+        """Rewrite the terms file with only the current documents' lines."""
+        tmp_path = self.terms_path + ".tmp"
+        offset = 0
+        with open(self.terms_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            for doc in sorted(self.docs.values(), key=lambda doc: doc[2]):
+                src.seek(doc[2])
+                dst.write(src.read(doc[3]))
+                doc[2] = offset
+                offset += doc[3]
+        os.replace(tmp_path, self.terms_path)
+        self.terms_bytes = offset
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "doc_count": self.doc_count, "df": self.df,
+                       "docs": self.docs, "terms_bytes": self.terms_bytes}, f)
+        os.replace(tmp_path, self.path)
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency; unseen terms get the maximum."""
+        return math.log((1 + self.doc_count) / (1 + self.df.get(term, 0))) + 1.0
+
+_idfs: Dict[str, CorpusIdf] = {}
+_idfs_lock = threading.Lock()
+
+def get_corpus_idf(output_dir: str = "output") -> CorpusIdf:
+    """Return the process-wide corpus IDF table for an output directory, loading it on first use."""
+    with _idfs_lock:
+        if output_dir not in _idfs:
+            _idfs[output_dir] = CorpusIdf(output_dir)
+        return _idfs[output_dir]
+
+def tfidf_matrix(sentences: List[str], idf: Optional[CorpusIdf] = None):
+    """Build the L2-normalized sentence x term TF-IDF matrix (sparse when SciPy is available)."""
+    vocabulary: Dict[str, int] = {}
+    rows, cols, counts = [], [], []
+    for row, sentence in enumerate(sentences):
+        for term, count in Counter(tokenize(sentence)).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+
+    terms = sorted(vocabulary, key=vocabulary.get)
+    if idf is None:
+        weights = np.ones(len(terms))
+    else:
+        weights = np.fromiter((idf.idf(t) for t in terms), dtype=np.float64, count=len(terms))
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    values = np.asarray(counts, dtype=np.float64) * weights[cols]
+
+    # Row norms from the (row, value) pairs, so both layouts normalize identically
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=len(sentences)))
+    norms[norms == 0] = 1.0
+    values /= norms[rows]
+
+    shape = (len(sentences), len(terms))
+    sparse = get_sparse()
+    if sparse is not None:
+        return sparse.csr_matrix((values, (rows, cols)), shape=shape)
+    matrix = np.zeros(shape)
+    matrix[rows, cols] = values
+    return matrix
+
+def tfidf_centrality(matrix) -> "np.ndarray":
+    """Cosine similarity of each sentence to the transcript's mean TF-IDF vector."""
+    centroid = np.asarray(matrix.mean(axis=0)).ravel()
+    norm = np.linalg.norm(centroid)
+    if norm == 0:
+        return np.zeros(matrix.shape[0])
+    return np.asarray(matrix @ (centroid / norm)).ravel()
+
+def textrank(matrix) -> "np.ndarray":
+    """PageRank over the sentence cosine-similarity graph.
+
+    The similarity matrix (matrix @ matrix.T without its diagonal) is never
+    built: each step multiplies by matrix.T and then matrix, so memory stays
+    proportional to the TF-IDF matrix instead of the square of the sentence count.
+    """
+    count = matrix.shape[0]
+    if isinstance(matrix, np.ndarray):
+        self_similarity = (matrix * matrix).sum(axis=1)
+    else:
+        self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+    def similarity_times(vector: "np.ndarray") -> "np.ndarray":
+        return np.asarray(matrix @ np.asarray(matrix.T @ vector).ravel()).ravel() - self_similarity * vector
+
+    # Sentences sharing no terms with any other link uniformly to all (TF-IDF weights are positive)
+    present = (matrix != 0).astype(np.float64)
+    shared_terms = np.asarray(present.sum(axis=0)).ravel() > 1
+    dangling = np.asarray(present @ shared_terms.astype(np.float64)).ravel() == 0
+    out_weight = similarity_times(np.ones(count))
+    out_weight[dangling] = 1.0
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(MAX_ITERATIONS):
+        spread = np.where(dangling, 0.0, scores / out_weight)
+        linked = similarity_times(spread) + scores[dangling].sum() / count
+        updated = (1 - DAMPING) / count + DAMPING * linked
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    # Scale so an average sentence scores 1.0
+    return scores * count
+
+def rank_sentences(sentences: List[str], ranker: str, idf: Optional[CorpusIdf] = None) -> List[float]:
+    """Score sentences for centrality within their transcript with the given backend."""
+    require_numpy(ranker)
+    if not sentences:
+        return []
+    matrix = tfidf_matrix(sentences, idf)
+    if ranker == "tfidf":
+        return tfidf_centrality(matrix).tolist()
+    return textrank(matrix).tolist()
@@ -1,11 +1,46 @@
+import argparse
+import bisect
+import collections
+import concurrent.futures
+import hashlib
+import heapq
 import os
 import re
 import sys
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 import json
 from datetime import datetime
-from youtube_transcript_api import YouTubeTranscriptApi
-import requests
+
+from artifact_writer import ArtifactWriter, DirectoryLock
+from caption_filter import SegmentRow, merge_caption_rows, merge_caption_segments, segment_rows
+from http_client import get_client
+from keyword_scorer import KeywordScorer
+from markdown_note import MarkdownNote
+from near_duplicates import DEFAULT_THRESHOLD, near_duplicate_groups
+from pipeline_metrics import (
+    METRICS_FILENAME, append_records, current_metrics, format_profiles, format_report,
+    profiling, start_video_metrics
+)
+from metadata_cache import get_cache
+from search_index import format_timestamp, get_search_index
+from sentence_ranker import RANKERS, CorpusIdf, get_corpus_idf, rank_sentences, require_numpy
+from summary_manifest import SummaryManifest, transcript_fingerprint
+from taxonomy import TaxonomyProfile, default_scorer, get_taxonomy
+from text_normalizer import CLAUSE_CONJUNCTIONS, DEFAULT_NORMALIZER, FILLER_PHRASES
+from transcript_extractor import fetch_transcript, get_video_channel
+from transcript_store import BIN_FILENAME, encode_transcript_bin, interrupted_transcript_files, iter_segment_rows
+from video_index import get_index
+
+# Bump when extraction logic changes so the manifest re-summarizes everything
+SUMMARY_VERSION = 4
+
+# "[mm:ss] " line prefix written by transcript_extractor.py
+TXT_TIMESTAMP_PATTERN = re.compile(r'^\[(\d+):(\d+)\] ?')
+# Chapter windows submitted to the process pool ahead of the one being collected, per worker
+WINDOWS_IN_FLIGHT_PER_WORKER = 2
+# Near-duplicate filtering keeps top_k candidates per category for every category, plus this many times top_k
+DISTINCT_POOL_SLACK = 2
 
 def get_video_id(url: str) -> str:
     """Extract video ID from YouTube URL."""
@@ -23,12 +58,22 @@ def get_video_id(url: str) -> str:
     return url  # Return as is if no pattern matches
 
 def get_video_title(video_id: str) -> str:
-    """Get video title from YouTube using oEmbed endpoint."""
+    """Get video title from YouTube using oEmbed endpoint (cached on disk, with the channel name)."""
+    cache = get_cache()
+    title = cache.get('title', video_id)
+    if title is not None:
+        return title
+    
     try:
         url = f"https://www.youtube.com/oembed?url=http://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(url)
+        response = get_client().get(url)
         if response.status_code == 200:
-            return response.json()['title']
+            data = response.json()
+            title = data['title']
+            cache.put('title', video_id, title)
+            if data.get('author_name'):
+                cache.put('channel', video_id, data['author_name'])
+            return title
     except Exception as e:
         print(f"Error getting video title: {str(e)}")
     return f"YouTube Video {video_id}"
@@ -43,125 +88,453 @@ def sanitize_filename(title: str) -> str:
 
 def clean_sentence(text: str) -> str:
     """Clean a sentence by removing filler words and repetitions."""
-    # Remove filler words and patterns
-    text = re.sub(r'\b(um|uh|like|you know|sort of|kind of)\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b(right|okay|well|so)\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b(I mean|I think|I guess|I don\'t know)\b', '', text, flags=re.IGNORECASE)
+    return DEFAULT_NORMALIZER.clean(text)
+
+def iter_sentences(fragments: Iterable[str]) -> Iterator[str]:
+    """Clean '.'-separated fragments and split them into candidate sentences.
     
-    # Clean up repetitive words and stuttering
-    text = re.sub(r'\b(\w+)(\s+\1)+\b', r'\1', text, flags=re.IGNORECASE)
+    A fragment gets one cleanup pass before it is split on common speech
+    patterns and each part gets the second, so fillers that only show up
+    after the first pass are removed without moving clause boundaries.
+    """
+    metrics = current_metrics()
+    for s in fragments:
+        with metrics.stage('clean'):
+            s = DEFAULT_NORMALIZER.clean_pass(s)
+            parts = DEFAULT_NORMALIZER.split_clauses(s) if len(s) > 30 else []  # Only consider substantial sentences
+            parts = [DEFAULT_NORMALIZER.clean_pass(part) for part in parts]
+        for part in parts:
+            if len(part) > 30:  # Recheck length after cleaning
+                metrics.count('sentences')
+                yield part + '.'
+
+def iter_timed_sentences(timed_fragments: Iterable[Tuple[str, List[Tuple]]]) -> Iterator[Tuple[str, Optional[float], Optional[float]]]:
+    """Like iter_sentences, but yield (sentence, start, end) using each fragment's segment marks.
     
-    # Clean up multiple spaces
-    text = re.sub(r'\s+', ' ', text)
+    Clause positions in the cleaned fragment are mapped proportionally back
+    onto the raw fragment, so times are accurate to the segment.
+    """
+    metrics = current_metrics()
+    for fragment, marks in timed_fragments:
+        with metrics.stage('clean'):
+            s = DEFAULT_NORMALIZER.clean_pass(fragment)
+        if len(s) <= 30:
+            continue
+        offsets = [mark[0] for mark in marks]
+        lead = len(fragment) - len(fragment.lstrip())
+        scale = (len(fragment.rstrip()) - lead) / len(s)
+        cursor = 0
+        for part in DEFAULT_NORMALIZER.split_clauses(s):
+            found = s.find(part, cursor)
+            begin = found if found >= 0 else cursor
+            cursor = begin + len(part)
+            with metrics.stage('clean'):
+                part = DEFAULT_NORMALIZER.clean_pass(part)
+            if len(part) > 30:
+                first = marks[bisect.bisect_right(offsets, lead + begin * scale) - 1]
+                last = marks[bisect.bisect_right(offsets, lead + (cursor - 1) * scale) - 1]
+                metrics.count('sentences')
+                yield part + '.', first[1], last[2]
+
+def split_sentences(transcript_text: str) -> List[str]:
+    """Split transcript text into cleaned candidate sentences."""
+    return list(iter_sentences(DEFAULT_NORMALIZER.iter_fragments([transcript_text])))
+
+def iter_candidates(sentences: Iterable, scorer: Optional[KeywordScorer] = None) -> Iterator[Tuple]:
+    """Score sentences, yielding (category, score, sentence) for every positive score.
     
-    # Remove leading/trailing punctuation except period
-    text = text.strip(',.!?:;')
+    Sentences may also be (sentence, start, end) from iter_timed_sentences,
+    giving (category, score, sentence, start, end) candidates. Uses the
+    default taxonomy profile's keywords unless a scorer is given.
+    """
+    metrics = current_metrics()
+    scorer = scorer or default_scorer()
+    for item in sentences:
+        sentence, *times = (item,) if isinstance(item, str) else item
+        word_count = len(sentence.split())
+        
+        # Skip sentences that are too short or seem like transitions
+        if word_count < 10:  # Increased minimum length
+            continue
+        
+        with metrics.stage('score'):
+            scores = scorer.score(sentence, word_count)
+        metrics.count('candidates', len(scores))
+        for category, score in scores.items():
+            yield (category, score, sentence, *times)
+
+def key_point(sentence: str, times: List) -> Union[str, Dict]:
+    """A selected sentence, as {'text', 'start', 'end'} if its candidate carried times."""
+    if not times:
+        return sentence
+    return {"text": sentence, "start": times[0], "end": times[1]}
+
+def rerank_candidates(candidates: List[Tuple], ranker: str, idf: Optional[CorpusIdf] = None) -> Iterator[Tuple]:
+    """Weight keyword candidates by how central each sentence is to the transcript.
     
-    return text.strip()
+    The keyword score still decides which categories a sentence belongs to;
+    the ranker's centrality decides which of them matter most.
+    """
+    with current_metrics().stage('rank'):
+        sentences = list(dict.fromkeys(candidate[2] for candidate in candidates))
+        centrality = dict(zip(sentences, rank_sentences(sentences, ranker, idf)))
+    for category, score, sentence, *times in candidates:
+        yield (category, score * centrality[sentence], sentence, *times)
 
-def extract_key_points(transcript_text: str) -> Dict[str, List[str]]:
-    """Extract key points from transcript text using rule-based analysis."""
-    # Initialize key points structure
-    key_points = {
-        "Main Insights": [],
-        "Success Principles": [],
-        "Practical Tips": [],
-        "Challenges & Solutions": [],
-        "Key Takeaways": []
-    }
+def select_key_points(candidates: Iterable[Tuple], top_k: int = 3,
+                      scorer: Optional[KeywordScorer] = None) -> Dict[str, List]:
+    """Keep the top_k candidates per category in bounded heaps.
     
-    # Clean and prepare text
-    # Remove timestamps if present
-    text = re.sub(r'\[\d+:\d+\]', '', transcript_text)
-    
-    # Add sentence boundaries
-    text = re.sub(r'(?<=[a-z])\s+(?=[A-Z])', '. ', text)
-    text = re.sub(r'(?<=[a-z])\s+(?=I\s)', '. ', text)
-    
-    # Clean up multiple periods and spaces
-    text = re.sub(r'\.+', '.', text)
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Split into sentences, handling multiple cases
-    sentences = []
-    for s in text.split('.'):
-        s = clean_sentence(s)
-        if len(s) > 30:  # Only consider substantial sentences
-            # Further split on common speech patterns
-            parts = re.split(r'(?<=[a-z])\s+(?:but|and|or|so|because|however|therefore)\s+', s)
-            for part in parts:
-                clean_part = clean_sentence(part)
-                if len(clean_part) > 30:  # Recheck length after cleaning
-                    sentences.append(clean_part + '.')
-    
-    # Keywords for each category with weights
-    keywords = {
-        "Main Insights": {
-            'important': 2, 'key': 2, 'main': 2, 'essential': 2, 'crucial': 2,
-            'fundamental': 2, 'critical': 2, 'true': 2, 'reality': 2, 'fact': 2,
-            'truth': 2, 'real': 2
-        },
-        "Success Principles": {
-            'success': 2, 'achieve': 1, 'accomplish': 1, 'win': 1, 'excel': 2,
-            'thrive': 2, 'grow': 1, 'wealth': 2, 'power': 2, 'rich': 2,
-            'money': 1, 'wealthy': 2, 'successful': 2, 'top': 2, 'best': 2
-        },
-        "Practical Tips": {
-            'should': 1, 'must': 2, 'need to': 2, 'have to': 2, 'tip': 2,
-            'advice': 2, 'recommend': 1, 'suggest': 1, 'way to': 2, 'how to': 2,
-            'can': 1, 'do this': 2
-        },
-        "Challenges & Solutions": {
-            'problem': 1, 'challenge': 2, 'obstacle': 2, 'difficult': 1,
-            'solution': 2, 'overcome': 2, 'handle': 1, 'deal with': 1,
-            'solve': 2, 'fix': 1
-        },
-        "Key Takeaways": {
-            'remember': 2, 'takeaway': 2, 'learn': 1, 'understand': 1,
-            'realize': 2, 'conclusion': 2, 'point is': 2, 'truth is': 2,
-            'bottom line': 2, 'end of day': 2
-        }
+    Ranking matches a stable sort by score (highest first) and then by length
+    (shorter first if same score), with earlier sentences winning remaining ties.
+    Timed candidates keep their times in the heap entry (see key_point).
+    """
+    heaps, _ = candidate_pools(candidates, (scorer or default_scorer()).categories, top_k)
+    return {
+        category: [key_point(entry[3], entry[4]) for entry in sorted(heap, reverse=True)]
+        for category, heap in heaps.items()
     }
+
+def candidate_pools(candidates: Iterable[Tuple], categories: Iterable[str], size: int) -> Tuple[Dict[str, List], set]:
+    """Keep the best size candidates per category in bounded heaps.
     
-    # Process each sentence
-    sentence_scores = {category: [] for category in key_points}
+    Returns ({category: heap of (score, -length, -order, sentence, times)},
+    categories that had more candidates than fit).
+    """
+    heaps = {category: [] for category in categories}
+    overflowed = set()
     
-    for sentence in sentences:
-        sentence_lower = sentence.lower()
-        
-        # Skip sentences that are too short or seem like transitions
-        if len(sentence.split()) < 10:  # Increased minimum length
+    for order, (category, score, sentence, *times) in enumerate(candidates):
+        # Min-heap on rank: the weakest kept candidate is at heap[0]; order is unique,
+        # so comparisons never reach the sentence or times
+        entry = (score, -len(sentence), -order, sentence, times)
+        heap = heaps[category]
+        if len(heap) < size:
+            heapq.heappush(heap, entry)
             continue
-            
-        # Score each sentence for each category
-        for category, word_weights in keywords.items():
-            score = 0
-            for word, weight in word_weights.items():
-                if word in sentence_lower:
-                    score += weight
-            
-            if score > 0:
-                # Bonus points for sentences that seem more complete/meaningful
-                if re.search(r'\b(is|are|was|were|have|has|do|does|should|must|can|will)\b', sentence_lower):
-                    score += 1
-                if len(sentence.split()) >= 15:  # Bonus for longer, more complete thoughts
-                    score += 1
-                if not any(x in sentence_lower for x in ['example', 'instance', 'case']):  # Prefer general statements
-                    score += 1
-                sentence_scores[category].append((score, sentence))
-    
-    # Select top sentences for each category based on scores
-    for category in key_points:
-        scored_sentences = sentence_scores[category]
-        if scored_sentences:
-            # Sort by score (highest first) and then by length (shorter first if same score)
-            sorted_sentences = sorted(scored_sentences, key=lambda x: (-x[0], len(x[1])))
-            key_points[category] = [s[1] for s in sorted_sentences[:3]]
-    
-    return key_points
-
-def create_obsidian_frontmatter(title: str, video_id: str) -> str:
-    """Create YAML frontmatter for Obsidian compatibility."""
+        overflowed.add(category)
+        if entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    return heaps, overflowed
+
+def select_distinct_key_points(candidates: Iterable[Tuple], top_k: int = 3,
+                               threshold: float = DEFAULT_THRESHOLD,
+                               scorer: Optional[KeywordScorer] = None,
+                               pool_size: Optional[int] = None) -> Dict[str, List]:
+    """Like select_key_points, but never pick two near-duplicate sentences.
+    
+    Categories take turns choosing their best remaining candidate, skipping
+    any sentence whose near-duplicate group (see near_duplicates) was already
+    chosen in this or another category. Only the best pool_size candidates
+    per category are kept and grouped: by default top_k for every category
+    (each pick can rule out one candidate per category) plus
+    DISTINCT_POOL_SLACK * top_k. If a category runs out of kept candidates
+    while it had more, a list of candidates is selected from again with a
+    larger pool; candidates from a one-shot iterator can't be, so that
+    category gets fewer key points.
+    """
+    categories = (scorer or default_scorer()).categories
+    if pool_size is None:
+        pool_size = top_k * (len(categories) + DISTINCT_POOL_SLACK)
+    while True:
+        pools, overflowed = candidate_pools(candidates, categories, pool_size)
+        selected, exhausted = _pick_distinct(pools, top_k, threshold)
+        if not exhausted & overflowed or not isinstance(candidates, (list, tuple)):
+            return selected
+        pool_size *= 4
+
+def _pick_distinct(pools: Dict[str, List], top_k: int, threshold: float) -> Tuple[Dict[str, List], set]:
+    """Round-robin selection over candidate pools; also returns the categories left with fewer than top_k."""
+    # Grouped in arrival order within each category, as the candidates came in
+    sentences = list(dict.fromkeys(
+        entry[3] for heap in pools.values() for entry in sorted(heap, key=lambda entry: -entry[2])))
+    group_of = dict(zip(sentences, near_duplicate_groups(sentences, threshold)))
+    ranked = {category: sorted(heap, reverse=True) for category, heap in pools.items()}
+    
+    selected = {category: [] for category in ranked}
+    positions = dict.fromkeys(ranked, 0)
+    used = set()
+    for _ in range(top_k):
+        for category, entries in ranked.items():
+            i = positions[category]
+            while i < len(entries) and group_of[entries[i][3]] in used:
+                i += 1
+            if i < len(entries):
+                selected[category].append(key_point(entries[i][3], entries[i][4]))
+                used.add(group_of[entries[i][3]])
+                i += 1
+            positions[category] = i
+    exhausted = {category for category, points in selected.items() if len(points) < top_k}
+    return selected, exhausted
+
+def summary_options(ranker: str = "keywords", dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                    chapter_minutes: float = 0) -> Dict:
+    """Bundle the options that change what key points are extracted.
+    
+    Args:
+        ranker: Sentence ranking backend, one of sentence_ranker.RANKERS
+        dedup_threshold: Near-duplicate similarity threshold, or None to keep duplicates
+        chapter_minutes: Summarize in windows of this many minutes, 0 for the whole video at once
+    """
+    return {"ranker": ranker, "dedup_threshold": dedup_threshold, "chapter_minutes": chapter_minutes}
+
+DEFAULT_OPTIONS = summary_options()
+
+def summary_config_hash(options: Dict = DEFAULT_OPTIONS, profile: Optional[TaxonomyProfile] = None) -> str:
+    """Version hash of the taxonomy profile, cleanup rules and options that shape key points.
+    
+    Videos summarized with different profiles get different hashes, so
+    editing one profile only makes its own videos stale.
+    """
+    profile = profile or get_taxonomy().default
+    config = {
+        "version": SUMMARY_VERSION,
+        "taxonomy": profile.digest,
+        "fillers": FILLER_PHRASES,
+        "conjunctions": CLAUSE_CONJUNCTIONS,
+        "dedup_threshold": options["dedup_threshold"]
+    }
+    if options["ranker"] != "keywords":
+        config["ranker"] = options["ranker"]
+    if options["chapter_minutes"]:
+        config["chapter_minutes"] = options["chapter_minutes"]
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def extract_key_points(transcript_text: str) -> Dict[str, List[str]]:
+    """Extract key points from transcript text using rule-based analysis."""
+    return extract_key_points_from_texts([transcript_text])
+
+def extract_key_points_from_texts(texts: Iterable[str], ranker: str = "keywords",
+                                  idf: Optional[CorpusIdf] = None,
+                                  dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                                  scorer: Optional[KeywordScorer] = None) -> Dict[str, List[str]]:
+    """Extract key points from transcript text pieces without joining them.
+    
+    Pieces are treated as if joined with spaces, so segment texts or the lines
+    of a transcript.txt file can be streamed in directly. With the tfidf or
+    textrank ranker, keyword scores are weighted by sentence centrality.
+    Near-duplicate key points are suppressed unless dedup_threshold is None.
+    """
+    fragments = DEFAULT_NORMALIZER.iter_fragments(texts)
+    return rank_key_points(iter_sentences(fragments), ranker, idf, dedup_threshold, scorer)
+
+def rank_key_points(sentences: Iterable, ranker: str = "keywords", idf: Optional[CorpusIdf] = None,
+                    dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                    scorer: Optional[KeywordScorer] = None) -> Dict[str, List]:
+    """Score candidate sentences and keep the best per category."""
+    candidates = iter_candidates(sentences, scorer)
+    if ranker != "keywords":
+        candidates = rerank_candidates(list(candidates), ranker, idf)
+    return choose_key_points(candidates, dedup_threshold, scorer=scorer)
+
+def choose_key_points(candidates: Iterable[Tuple], dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                      top_k: int = 3, scorer: Optional[KeywordScorer] = None) -> Dict[str, List]:
+    """Select the top_k key points per category, dropping near duplicates unless dedup_threshold is None."""
+    if dedup_threshold is None:
+        return select_key_points(candidates, top_k, scorer)
+    return select_distinct_key_points(candidates, top_k, dedup_threshold, scorer)
+
+def extract_key_points_from_segments(transcript: Iterable[Dict], ranker: str = "keywords",
+                                     idf: Optional[CorpusIdf] = None,
+                                     dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                                     scorer: Optional[KeywordScorer] = None) -> Dict[str, List[str]]:
+    """Extract key points from YouTubeTranscriptApi segment dicts."""
+    return extract_key_points_from_texts((entry['text'] for entry in transcript), ranker, idf, dedup_threshold, scorer)
+
+def extract_timed_key_points(transcript: Iterable[Dict], ranker: str = "keywords",
+                             idf: Optional[CorpusIdf] = None,
+                             dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                             scorer: Optional[KeywordScorer] = None) -> Dict[str, List[Dict]]:
+    """Extract key points from segment dicts, each with the start/end time it was said.
+    
+    The key point texts are the same as extract_key_points_from_segments.
+    Returns {category: [{'text', 'start', 'end'}]}; times are None for
+    segments without a start time.
+    """
+    fragments = DEFAULT_NORMALIZER.iter_timed_fragments(transcript)
+    return rank_key_points(iter_timed_sentences(fragments), ranker, idf, dedup_threshold, scorer)
+
+def iter_time_windows(transcript: Iterable[Dict], window_seconds: float) -> Iterator[Tuple[int, List[Dict]]]:
+    """Group consecutive segments into fixed-length time windows, yielding (window number, segments).
+    
+    Segments without a start time stay in the current window.
+    """
+    window, segments = 0, []
+    for segment in transcript:
+        start = segment.get('start')
+        index = int(start // window_seconds) if start is not None else window
+        if segments and index != window:
+            yield window, segments
+            segments = []
+        window = index
+        segments.append(segment)
+    if segments:
+        yield window, segments
+
+def _summarize_window(window: int, segments: List[Dict], ranker: str, idf: Optional[CorpusIdf],
+                      dedup_threshold: Optional[float], keep: int,
+                      scorer: Optional[KeywordScorer] = None) -> Tuple[int, Dict, List]:
+    """Map step: key points for one window, plus its best candidates for the global reduce.
+    
+    At most keep candidates per category are passed on. Without near-duplicate
+    filtering keep >= top_k makes the global reduce exact; with it, the extra
+    candidates leave room for ones skipped as duplicates.
+    """
+    fragments = DEFAULT_NORMALIZER.iter_timed_fragments(segments)
+    candidates = iter_candidates(iter_timed_sentences(fragments), scorer)
+    if ranker != "keywords":
+        candidates = rerank_candidates(list(candidates), ranker, idf)
+    candidates = list(candidates)
+    key_points = choose_key_points(candidates, dedup_threshold, scorer=scorer)
+    
+    best = {}
+    for order, (category, score, sentence, *_) in enumerate(candidates):
+        best.setdefault(category, []).append((score, -len(sentence), -order))
+    cutoffs = {category: sorted(ranks, reverse=True)[:keep][-1] for category, ranks in best.items()}
+    pool = [
+        candidate for order, candidate in enumerate(candidates)
+        if (candidate[1], -len(candidate[2]), -order) >= cutoffs[candidate[0]]
+    ]
+    
+    start = segments[0].get('start')
+    last = segments[-1]
+    end = last['start'] + last.get('duration', 0.0) if last.get('start') is not None else None
+    chapter = {"start": start, "end": end, "key_points": key_points}
+    return window, chapter, pool
+
+def _map_windows(executor: concurrent.futures.Executor, windows: Iterable[Tuple[int, List[Dict]]],
+                 in_flight: int, *args) -> Iterator[Tuple[int, Dict, List]]:
+    """Run _summarize_window over windows in the executor, yielding results in window order.
+    
+    Windows are read from the transcript only as earlier results are
+    collected, so at most in_flight are submitted at once.
+    """
+    pending = collections.deque()
+    for window, segments in windows:
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+        pending.append(executor.submit(_summarize_window, window, segments, *args))
+    while pending:
+        yield pending.popleft().result()
+
+def extract_chaptered_key_points(transcript: Iterable[Dict], window_seconds: float, ranker: str = "keywords",
+                                 idf: Optional[CorpusIdf] = None,
+                                 dedup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+                                 workers: int = 1, top_k: int = 3,
+                                 scorer: Optional[KeywordScorer] = None) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """Summarize a long transcript as fixed time windows (map), then pick whole-video key points (reduce).
+    
+    Each window is scored on its own, in worker processes if workers > 1
+    with at most WINDOWS_IN_FLIGHT_PER_WORKER windows per worker submitted
+    at a time. Only the windows in flight plus each window's candidate pool
+    are held in memory. Sentences are not joined across window boundaries.
+    
+    Without near-duplicate filtering the whole-video key points are exactly
+    those of selecting over every window's candidates. With it, near
+    duplicates are only grouped among the pooled candidates, so the picks
+    can differ from filtering over every sentence of the video.
+    
+    Returns (whole-video key points, chapters), where each chapter is
+    {'start', 'end', 'key_points'} with key points as from extract_timed_key_points.
+    """
+    scorer = scorer or default_scorer()
+    keep = top_k * len(scorer.categories)
+    windows = iter_time_windows(transcript, window_seconds)
+    if workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        results = _map_windows(executor, windows, workers * WINDOWS_IN_FLIGHT_PER_WORKER,
+                               ranker, idf, dedup_threshold, keep, scorer)
+    else:
+        executor = None
+        results = (
+            _summarize_window(window, segments, ranker, idf, dedup_threshold, keep, scorer)
+            for window, segments in windows
+        )
+    
+    chapters = []
+    candidates = []
+    try:
+        for _, chapter, pool in results:
+            chapters.append(chapter)
+            candidates.extend(pool)
+    finally:
+        if executor:
+            executor.shutdown()
+    
+    # Reduce: the same selection over every window's pooled candidates, in time order
+    return choose_key_points(candidates, dedup_threshold, top_k, scorer), chapters
+
+def summarize_segments(transcript: Iterable[Dict], options: Dict = DEFAULT_OPTIONS, output_dir: str = "output",
+                       workers: int = 1, scorer: Optional[KeywordScorer] = None) -> Tuple[Dict[str, List[Dict]], Optional[List[Dict]]]:
+    """Extract timed key points from segment dicts (see summarize_rows)."""
+    return summarize_rows(segment_rows(transcript), options, output_dir, workers, scorer)
+
+def summarize_rows(rows: Iterable[SegmentRow], options: Dict = DEFAULT_OPTIONS, output_dir: str = "output",
+                   workers: int = 1, scorer: Optional[KeywordScorer] = None) -> Tuple[Dict[str, List[Dict]], Optional[List[Dict]]]:
+    """Extract timed key points from (text, start, duration) rows, returning (key points, chapters or None).
+    
+    Caption segments are first merged into utterances with non-speech cues
+    and rolling repeats removed. The 'extract' stage timer includes the
+    nested 'clean', 'score' and 'rank' stages; windows summarized in worker
+    processes are only counted there.
+    """
+    metrics = current_metrics()
+    
+    def counted_rows():
+        for row in rows:
+            metrics.count('segments')
+            yield row
+    
+    def counted_utterances():
+        for utterance in merge_caption_rows(counted_rows()):
+            metrics.count('utterances')
+            yield utterance
+    
+    idf = get_corpus_idf(output_dir) if options["ranker"] != "keywords" else None
+    with metrics.stage('extract'):
+        if options["chapter_minutes"]:
+            return extract_chaptered_key_points(counted_utterances(), options["chapter_minutes"] * 60, options["ranker"],
+                                                idf, options["dedup_threshold"], workers, scorer=scorer)
+        return extract_timed_key_points(counted_utterances(), options["ranker"], idf, options["dedup_threshold"],
+                                        scorer), None
+
+def key_point_texts(timed_key_points: Dict[str, List[Dict]]) -> Dict[str, List[str]]:
+    """Drop the times from extract_timed_key_points output."""
+    return {category: [point['text'] for point in points] for category, points in timed_key_points.items()}
+
+def iter_transcript_rows(video_dir_path: str) -> Iterator[SegmentRow]:
+    """Iterate a video's transcript as (text, start, duration) rows, falling back to transcript.txt lines.
+    
+    The transcript file is opened right away, so rows come from the file
+    present at the call even if it is replaced while they are read. Lines
+    keep the time of a leading "[mm:ss]" marker if they have one.
+    """
+    rows = iter_segment_rows(video_dir_path)
+    if rows is not None:
+        return rows
+    return _iter_txt_rows(open(os.path.join(video_dir_path, "transcript.txt"), 'r', encoding='utf-8'))
+
+def _iter_txt_rows(f) -> Iterator[SegmentRow]:
+    with f:
+        for line in f:
+            match = TXT_TIMESTAMP_PATTERN.match(line)
+            if match:
+                yield line[match.end():], float(int(match.group(1)) * 60 + int(match.group(2))), 0.0
+            else:
+                yield line, None, 0.0
+
+def format_tags(tags: List[str]) -> str:
+    """YAML block list lines for frontmatter tags."""
+    return ''.join(f"  - {tag}\n" for tag in tags)
+
+def create_obsidian_frontmatter(title: str, video_id: str, profile: Optional[TaxonomyProfile] = None,
+                                tags: Optional[List[str]] = None) -> str:
+    """Create YAML frontmatter for Obsidian compatibility.
+    
+    Category and tags come from the video's taxonomy profile (default
+    profile if none is given) unless tags are passed explicitly.
+    """
+    profile = profile or get_taxonomy().default
     current_date = datetime.now().strftime("%Y/%m/%d")
     
     # Escape special characters in title for YAML
@@ -170,83 +543,90 @@ def create_obsidian_frontmatter(title: str, video_id: str) -> str:
     # Create YAML frontmatter
     frontmatter = f"""---
 title: "{yaml_title}"
-category: career
+category: {profile.category}
 type: video-notes
 source: youtube
 videoId: {video_id}
 createdDate: {current_date}
 tags:
-  - career-advice
-  - corporate-life
-  - professional-development
-status: completed
+{format_tags(profile.tags if tags is None else tags)}status: completed
 ---
 """
     return frontmatter
 
-def update_markdown_with_summary(video_info_path: str, key_points: Dict[str, List[str]]):
-    """Update the video_info.md file with extracted key points and Obsidian frontmatter."""
-    with open(video_info_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def apply_summary_to_note(note: MarkdownNote, key_points: Dict[str, List[str]],
+                          chapters: Optional[List[Dict]] = None, profile: Optional[TaxonomyProfile] = None):
+    """Add key points, chapters and Obsidian frontmatter to a parsed video_info.md.
     
-    # Extract title and video ID from existing content
-    title_match = re.search(r'## Title\n(.*?)\n', content)
-    video_id_match = re.search(r'## Video ID\n(.*?)\n', content)
+    Only the sections the pipeline owns are changed; the rest of the note
+    renders back unchanged. Frontmatter category and tags come from the
+    taxonomy profile (picked from the note if not given); tags the user
+    added by hand are kept.
+    """
+    taxonomy = get_taxonomy()
+    profile = profile or taxonomy.profile_for_note(note)
     
-    if title_match and video_id_match:
-        title = title_match.group(1).strip()
-        video_id = video_id_match.group(1).strip()
-        
-        # Create frontmatter
-        frontmatter = create_obsidian_frontmatter(title, video_id)
-        
-        # Remove any existing frontmatter
-        content = re.sub(r'^---\n.*?\n---\n', '', content, flags=re.DOTALL)
-        
-        # Add new frontmatter at the top
-        content = frontmatter + content
+    # Refresh frontmatter from the title and video ID sections
+    title = note.first_line("Title")
+    video_id = note.first_line("Video ID")
+    if title is not None and video_id is not None:
+        note.set_frontmatter(create_obsidian_frontmatter(title, video_id, profile, taxonomy.note_tags(note, profile)))
     
     # Update processing status
-    content = re.sub(r'- \[ \] Key points extracted', '- [x] Key points extracted', content)
-    content = re.sub(r'- \[ \] Summary generated', '- [x] Summary generated', content)
-    
-    # Remove existing Summary and Key Points sections if they exist
-    content = re.sub(r'\n## Summary\n.*?(?=\n## |$)', '', content, flags=re.DOTALL)
-    content = re.sub(r'\n## Key Points\n.*?(?=\n## |$)', '', content, flags=re.DOTALL)
+    status = note.body("Processing Status")
+    if status is not None:
+        status = status.replace('- [ ] Key points extracted', '- [x] Key points extracted')
+        status = status.replace('- [ ] Summary generated', '- [x] Summary generated')
+        # Generated section: also drop blank lines that piled up under it
+        note.set_section("Processing Status", status.rstrip('\n') + '\n\n')
     
-    # Create new Key Points section
-    key_points_section = "\n## Key Points\n"
+    # Key Points (followed by Chapters) keep their place, or go before Notes
+    key_points_section = ""
     for category, points in key_points.items():
         if points:  # Only add categories that have points
             key_points_section += f"\n### {category}\n"
             for point in points:
                 key_points_section += f"- {point}\n"
+    note.remove_section("Summary")
+    note.set_section("Key Points", key_points_section + "\n", before="Notes", after="Processing Status")
     
-    # Add the key points section before the Notes section
-    if "## Notes" in content:
-        content = content.replace("## Notes", f"{key_points_section}\n## Notes")
-    else:
-        content += f"\n{key_points_section}"
+    note.remove_section("Chapters")
+    if chapters:
+        chapters_section = ""
+        for chapter in chapters:
+            chapters_section += f"\n### {chapter_heading(chapter)}\n"
+            for point in chapter_points(chapter):
+                chapters_section += f"- {format_key_point(point)}\n"
+        note.set_section("Chapters", chapters_section + "\n", after="Key Points")
+
+def update_markdown_with_summary(video_info_path: str, key_points: Dict[str, List[str]],
+                                 chapters: Optional[List[Dict]] = None):
+    """Update the video_info.md file with extracted key points, chapters and Obsidian frontmatter.
     
-    with open(video_info_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    The file is replaced atomically.
+    """
+    note = MarkdownNote.load(video_info_path)
+    apply_summary_to_note(note, key_points, chapters)
+    current_metrics().count('bytes_written', note.save(video_info_path))
 
-def create_initial_video_info(video_id: str, video_url: str) -> str:
-    """Create initial video info markdown file."""
-    # Get video title from YouTube
-    video_title = get_video_title(video_id)
+def create_initial_video_info(video_id: str, video_url: str, video_title: Optional[str] = None,
+                              channel: Optional[str] = None) -> str:
+    """Create initial video info markdown file, tagged with the channel's taxonomy profile."""
+    # Get video title from YouTube unless the caller already has it
+    if video_title is None:
+        video_title = get_video_title(video_id)
+    profile = get_taxonomy().profile_for(channel, title=video_title)
+    channel_section = f"## Channel\n{channel}\n\n" if channel else ""
     
     content = f"""---
 title: "{video_title}"
-category: career
+category: {profile.category}
 type: video-notes
 source: youtube
 videoId: {video_id}
 createdDate: {datetime.now().strftime("%Y/%m/%d")}
 tags:
-  - career-advice
-  - professional-development
-status: in-progress
+{format_tags(profile.tags)}status: in-progress
 ---
 # Video Information
 
@@ -259,12 +639,13 @@ status: in-progress
 ## Video ID
 {video_id}
 
-## Directory Name
+{channel_section}## Directory Name
 {sanitize_filename(video_title)}
 
 ## Files
 - `transcript.txt`: Human-readable transcript with timestamps
 - `transcript.json`: Raw transcript data in JSON format
+- `transcript.bin`: Compact columnar copy of the transcript for fast reloads
 - `key_points.txt`: Extracted key points in human-readable format
 - `key_points.json`: Structured key points data
 
@@ -275,115 +656,400 @@ status: in-progress
 """
     return content
 
-def main():
+def format_key_point(point: Dict) -> str:
+    """Key point text, prefixed with [mm:ss] when its time is known."""
+    if point['start'] is None:
+        return point['text']
+    return f"[{format_timestamp(point['start'])}] {point['text']}"
+
+def chapter_points(chapter: Dict) -> List[Dict]:
+    """A chapter's key points across all categories, once each, in time order."""
+    points = {point['text']: point for points in chapter['key_points'].values() for point in points}
+    return sorted(points.values(), key=lambda point: point['start'] if point['start'] is not None else 0.0)
+
+def chapter_heading(chapter: Dict) -> str:
+    if chapter['start'] is None:
+        return "Chapter"
+    return f"{format_timestamp(chapter['start'])} - {format_timestamp(chapter['end'])}"
+
+def add_key_points(writer: ArtifactWriter, key_points: Dict[str, List[Dict]], chapters: Optional[List[Dict]] = None):
+    """Render timed key points (and per-chapter key points, if any) as key_points.json and key_points.txt."""
+    data = dict(key_points)
+    if chapters is not None:
+        data["chapters"] = chapters
+    writer.add_json("key_points.json", data, indent=2)
+    
+    lines = []
+    for category, points in key_points.items():
+        if points:
+            lines.append(f"\n{category}\n{'=' * len(category)}\n")
+            for point in points:
+                lines.append(f"- {format_key_point(point)}\n")
+    if chapters:
+        lines.append("\nChapters\n========\n")
+        for chapter in chapters:
+            lines.append(f"\n{chapter_heading(chapter)}\n")
+            for point in chapter_points(chapter):
+                lines.append(f"- {format_key_point(point)}\n")
+    writer.add_text("key_points.txt", ''.join(lines))
+
+def save_key_points(video_dir: str, key_points: Dict[str, List[Dict]], chapters: Optional[List[Dict]] = None):
+    """Save timed key points (and per-chapter key points, if any) as JSON and as human-readable text."""
+    writer = ArtifactWriter(video_dir)
+    add_key_points(writer, key_points, chapters)
+    writer.commit()
+
+def list_video_dirs(output_dir: str) -> List[str]:
+    """Return indexed video directories that have both a transcript and video_info.md."""
+    video_dirs = []
+    for video_dir_path in get_index(output_dir).video_dirs():
+        # Check for required files
+        transcript_path = os.path.join(video_dir_path, "transcript.txt")
+        video_info_path = os.path.join(video_dir_path, "video_info.md")
+        
+        if os.path.exists(transcript_path) and os.path.exists(video_info_path):
+            video_dirs.append(video_dir_path)
+    return video_dirs
+
+def summarize_video_dir(video_dir_path: str, options: Dict = DEFAULT_OPTIONS) -> Tuple[Dict, str]:
+    """Re-extract key points for an existing output directory and update its files.
+    
+    Changed taxonomy files are reloaded first, and the video is scored with
+    the profile its note selects. Returns the manifest fingerprint of what
+    was summarized (see summary_fingerprint) and the config hash it was
+    summarized with.
+    """
+    metrics = current_metrics()
+    # Writers replace files under the directory lock, so holding it while opening the
+    # transcript and note means the fingerprint, segments and note come from one commit
+    with metrics.stage('read'), DirectoryLock(video_dir_path):
+        # Key points and the note are rewritten below, but mismatched transcript files need a new extraction
+        interrupted = interrupted_transcript_files(video_dir_path)
+        if interrupted:
+            raise RuntimeError(f"Interrupted write left {', '.join(interrupted)} possibly mismatched; "
+                               f"extract the transcript again")
+        fingerprint = transcript_fingerprint(video_dir_path)
+        rows = iter_transcript_rows(video_dir_path)
+        note = MarkdownNote.load(os.path.join(video_dir_path, "video_info.md"))
+    
+    output_dir = os.path.dirname(video_dir_path)
+    with metrics.stage('taxonomy'):
+        taxonomy = get_taxonomy()
+        taxonomy.refresh()
+        profile = taxonomy.profile_for_note(note)
+    
+    # Extract key points, streaming the transcript segment by segment
+    key_points, chapters = summarize_rows(rows, options, output_dir, scorer=profile.scorer)
+    
+    # Render key points and the updated note, then commit all three files
+    writer = ArtifactWriter(video_dir_path)
+    with metrics.stage('render'):
+        add_key_points(writer, key_points, chapters)
+    with metrics.stage('markdown'):
+        apply_summary_to_note(note, key_point_texts(key_points), chapters, profile)
+        writer.add_text("video_info.md", note.render())
+    with metrics.stage('write'):
+        writer.commit()
+    with metrics.stage('index'):
+        get_index(output_dir).refresh_dir(video_dir_path)
+    return summary_fingerprint(video_dir_path, profile, fingerprint), summary_config_hash(options, profile)
+
+def profile_path_for(profile_dir: Optional[str], video_dir_path: str) -> Optional[str]:
+    """Where to dump a video's cProfile stats, or None when not profiling."""
+    if not profile_dir:
+        return None
+    return os.path.join(profile_dir, os.path.basename(os.path.normpath(video_dir_path)) + ".prof")
+
+def _summarize_video_dir_worker(video_dir_path: str, options: Dict = DEFAULT_OPTIONS,
+                                profile_dir: Optional[str] = None
+                                ) -> Tuple[str, Optional[Dict], Optional[str], Optional[str], Dict]:
+    """Process pool entry point: summarize one directory, returning any error instead of raising.
+    
+    Also returns the config hash it was summarized with and the directory's metrics record.
+    """
+    metrics = start_video_metrics()
+    name = os.path.basename(video_dir_path)
+    profile_path = profile_path_for(profile_dir, video_dir_path)
+    try:
+        with profiling(profile_path):
+            fingerprint, config_hash = summarize_video_dir(video_dir_path, options)
+        return video_dir_path, fingerprint, config_hash, None, metrics.record(name, profile=profile_path)
+    except Exception as e:
+        return video_dir_path, None, None, str(e), metrics.record(name, profile=profile_path, error=str(e))
+
+def report_metrics(output_dir: str, records: List[Dict], profile_dir: Optional[str] = None):
+    """Append per-video metrics to output/.summary_metrics.jsonl and print the aggregate report."""
+    if not records:
+        return
+    append_records(os.path.join(output_dir, METRICS_FILENAME), records)
+    print(format_report(records))
+    if profile_dir:
+        paths = [record["profile"] for record in records if record.get("profile")]
+        print(f"cProfile dumps saved to {profile_dir}; top functions by cumulative time:")
+        print(format_profiles(paths))
+
+def summary_fingerprint(video_dir_path: str, profile: TaxonomyProfile, fingerprint: Optional[Dict] = None) -> Dict:
+    """Manifest fingerprint of a summarized directory: its transcript's, plus its note and taxonomy profile.
+    
+    Call it after video_info.md was written, so the recorded size and mtime
+    are those of the updated note.
+    """
+    stat = os.stat(os.path.join(video_dir_path, "video_info.md"))
+    return dict(fingerprint or transcript_fingerprint(video_dir_path),
+                note_size=stat.st_size, note_mtime_ns=stat.st_mtime_ns,
+                profile=profile.name, profile_digest=profile.digest, rules=get_taxonomy().rules_digest)
+
+def video_profile(video_dir_path: str, manifest: Optional[SummaryManifest] = None) -> TaxonomyProfile:
+    """The taxonomy profile a directory's note selects.
+    
+    The note is only parsed if it or the taxonomy's matching rules changed
+    since the manifest recorded the directory; if it still selects the same
+    profile, the manifest entry is brought up to date.
+    """
+    taxonomy = get_taxonomy()
+    name = manifest.recorded_profile(video_dir_path, taxonomy.rules_digest) if manifest else None
+    if name in taxonomy.profiles:
+        return taxonomy.profiles[name]
+    note_path = os.path.join(video_dir_path, "video_info.md")
+    # Stat before reading, so a note edited in between is parsed again next time
+    note_stat = os.stat(note_path)
+    profile = taxonomy.profile_for_note(MarkdownNote.load(note_path))
+    if manifest:
+        manifest.confirm_profile(video_dir_path, profile.name, taxonomy.rules_digest, note_stat)
+    return profile
+
+def video_config_hash(video_dir_path: str, options: Dict = DEFAULT_OPTIONS,
+                      manifest: Optional[SummaryManifest] = None) -> str:
+    """Config hash a directory would be summarized with now, given the taxonomy profile its note selects."""
+    return summary_config_hash(options, video_profile(video_dir_path, manifest))
+
+def stale_video_dirs(video_dirs: List[str], manifest: SummaryManifest, options: Dict = DEFAULT_OPTIONS) -> List[str]:
+    """Return the directories whose transcript, scoring config or taxonomy profile changed."""
+    get_taxonomy().refresh()
+    return [d for d in video_dirs if not manifest.is_current(d, video_config_hash(d, options, manifest))]
+
+def pending_video_dirs(output_dir: str, manifest: SummaryManifest, force: bool = False,
+                       options: Dict = DEFAULT_OPTIONS) -> List[str]:
+    """Return video directories whose transcript, scoring config or taxonomy profile changed."""
+    video_dirs = list_video_dirs(output_dir)
+    if force:
+        return video_dirs
+    
+    pending = stale_video_dirs(video_dirs, manifest, options)
+    skipped = len(video_dirs) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} unchanged videos (use --force to reprocess)")
+    return pending
+
+def run_batch(output_dir: str, workers: Optional[int] = None, chunk_size: int = 16, force: bool = False,
+              options: Dict = DEFAULT_OPTIONS, profile_dir: Optional[str] = None):
+    """Re-summarize every changed video directory in parallel across processes.
+    
+    Workers reload taxonomy files that change mid-run. If a profile changed,
+    the videos it affects that were scored with the old version are
+    re-scored in another pass before the batch finishes.
+    """
+    manifest = SummaryManifest(output_dir)
+    taxonomy = get_taxonomy()
+    video_dirs = pending_video_dirs(output_dir, manifest, force, options)
+    taxonomy_version = taxonomy.version
+    if options["ranker"] != "keywords" and video_dirs:
+        # Refresh the IDF cache once here so workers only read it
+        get_corpus_idf(output_dir)
+    workers = workers or os.cpu_count() or 1
+    print(f"Re-summarizing {len(video_dirs)} videos with {workers} workers (chunk size {chunk_size})...")
+    
+    failures = []
+    records = []
+    updated = 0
+    start = time.perf_counter()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            while video_dirs:
+                total = len(video_dirs)
+                results = executor.map(_summarize_video_dir_worker, video_dirs, [options] * total,
+                                       [profile_dir] * total, chunksize=chunk_size)
+                for done, (video_dir_path, fingerprint, config_hash, error, record) in enumerate(results, 1):
+                    records.append(record)
+                    if error:
+                        failures.append((video_dir_path, error))
+                        print(f"[{done}/{total}] Failed {video_dir_path}: {error}", file=sys.stderr)
+                    else:
+                        updated += 1
+                        manifest.record(video_dir_path, config_hash, fingerprint)
+                        print(f"[{done}/{total}] Updated summary for {os.path.basename(video_dir_path)}")
+                
+                # Pick up taxonomy edits made while this pass ran
+                taxonomy.refresh()
+                if taxonomy.version == taxonomy_version:
+                    break
+                taxonomy_version = taxonomy.version
+                failed = {video_dir_path for video_dir_path, _ in failures}
+                video_dirs = [d for d in stale_video_dirs(list_video_dirs(output_dir), manifest, options)
+                              if d not in failed]
+                if video_dirs:
+                    print(f"Taxonomy changed during the batch; re-scoring {len(video_dirs)} affected videos...")
+    finally:
+        # Keep progress from an interrupted run
+        manifest.save()
+    elapsed = time.perf_counter() - start
+    
+    rate = len(records) / elapsed if elapsed > 0 else 0.0
+    print(f"Batch complete: {updated} updated, {len(failures)} failed "
+          f"in {elapsed:.1f}s ({rate:.1f} videos/sec)")
+    for video_dir_path, error in failures:
+        print(f"- {video_dir_path}: {error}")
+    report_metrics(output_dir, records, profile_dir)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Summarize YouTube transcripts into key points.")
+    parser.add_argument('video_url', nargs='?', help="YouTube URL or video ID to download and summarize")
+    parser.add_argument('--batch', action='store_true',
+                        help="re-summarize existing output directories in parallel")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for --batch, or for --chapter-minutes windows of a single "
+                             "video (default: CPU count for --batch, 1 otherwise)")
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help="directories handed to a worker at a time in --batch")
+    parser.add_argument('--force', action='store_true',
+                        help="reprocess videos even if the manifest says they are unchanged")
+    parser.add_argument('--ranker', choices=RANKERS, default="keywords",
+                        help="sentence ranking backend: keyword weights only (default), or weighted by "
+                             "TF-IDF centrality or TextRank (needs NumPy)")
+    parser.add_argument('--dedup-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="word-pair Jaccard similarity at which two key points count as near duplicates "
+                             f"and only the better one is kept, 0 to keep duplicates (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--chapter-minutes', type=float, default=0,
+                        help="also summarize each window of this many minutes as a chapter, scoring windows "
+                             "separately (in parallel with --workers) for long streams (default: off)")
+    parser.add_argument('--profile', nargs='?', const=os.path.join("output", ".profiles"), default=None,
+                        metavar='DIR', help="capture a cProfile dump per video into DIR (default: output/.profiles) "
+                                            "and print the hottest functions")
+    args = parser.parse_args(argv)
+    if args.chapter_minutes < 0:
+        parser.error("--chapter-minutes must not be negative")
+    if args.dedup_threshold <= 0:
+        args.dedup_threshold = None
+    elif args.dedup_threshold > 1:
+        parser.error("--dedup-threshold must be between 0 and 1")
+    return args
+
+def main(argv: Optional[List[str]] = None):
     """Process transcripts and update markdown files."""
+    args = parse_args(argv)
+    output_dir = "output"
+    require_numpy(args.ranker)
+    options = summary_options(args.ranker, args.dedup_threshold, args.chapter_minutes)
+    
     # Get video URL from command line if provided
-    if len(sys.argv) > 1:
-        video_url = sys.argv[1]
+    if args.video_url:
+        video_url = args.video_url
         video_id = get_video_id(video_url)
         
+        metrics = start_video_metrics()
+        profile_path = profile_path_for(args.profile, video_id)
         try:
-            # Get transcript
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            transcript_text = ' '.join([entry['text'] for entry in transcript])
-            
-            # Get video title and create sanitized directory name
-            video_title = get_video_title(video_id)
-            dir_name = sanitize_filename(video_title)
-            
-            # Create output directory using sanitized title
-            video_dir = f"output/{dir_name}"
-            os.makedirs(video_dir, exist_ok=True)
-            
-            # Save transcript
-            with open(f"{video_dir}/transcript.txt", 'w', encoding='utf-8') as f:
-                f.write(transcript_text)
-            
-            # Save raw transcript data
-            with open(f"{video_dir}/transcript.json", 'w', encoding='utf-8') as f:
-                json.dump(transcript, f, indent=2)
-            
-            # Create initial video info file if it doesn't exist
-            video_info_path = f"{video_dir}/video_info.md"
-            if not os.path.exists(video_info_path):
-                initial_content = create_initial_video_info(video_id, video_url)
-                with open(video_info_path, 'w', encoding='utf-8') as f:
-                    f.write(initial_content)
-            
-            # Extract and save key points
-            key_points = extract_key_points(transcript_text)
-            
-            # Save key points to separate files
-            with open(f"{video_dir}/key_points.json", 'w', encoding='utf-8') as f:
-                json.dump(key_points, f, indent=2)
-            
-            # Save human-readable key points
-            with open(f"{video_dir}/key_points.txt", 'w', encoding='utf-8') as f:
-                for category, points in key_points.items():
-                    if points:
-                        f.write(f"\n{category}\n{'=' * len(category)}\n")
-                        for point in points:
-                            f.write(f"- {point}\n")
-            
-            # Update markdown
-            update_markdown_with_summary(video_info_path, key_points)
-            
-            print(f"Processed video: {video_title}")
-            print(f"Output directory: {video_dir}")
-            print("Files created:")
-            print(f"- {video_dir}/transcript.txt")
-            print(f"- {video_dir}/transcript.json")
-            print(f"- {video_dir}/key_points.txt")
-            print(f"- {video_dir}/key_points.json")
-            print(f"- {video_dir}/video_info.md")
+            with profiling(profile_path):
+                # Get transcript
+                with metrics.stage('fetch_transcript'):
+                    transcript = fetch_transcript(video_id)
+                
+                # Get video title and create sanitized directory name
+                with metrics.stage('fetch_title'):
+                    video_title = get_video_title(video_id)
+                dir_name = sanitize_filename(video_title)
+                
+                # Reuse the video's indexed directory, or create one using sanitized title
+                index = get_index(output_dir)
+                video_dir = index.lookup(video_id) or f"{output_dir}/{dir_name}"
+                os.makedirs(video_dir, exist_ok=True)
+                
+                # Render every artifact in memory, then commit them to the directory in one locked step
+                writer = ArtifactWriter(video_dir)
+                with metrics.stage('render_transcript'):
+                    # Cleaned transcript as space-joined text, plus the raw transcript data
+                    writer.add_text("transcript.txt", ' '.join(entry['text'] for entry in merge_caption_segments(transcript)))
+                    writer.add_json("transcript.json", transcript, indent=2)
+                    writer.add_bytes(BIN_FILENAME, encode_transcript_bin(transcript))
+                
+                # Load the existing note, or start a fresh one, and pick its taxonomy profile
+                with metrics.stage('taxonomy'):
+                    channel = get_video_channel(video_id)
+                    video_info_path = f"{video_dir}/video_info.md"
+                    if os.path.exists(video_info_path):
+                        note = MarkdownNote.load(video_info_path)
+                        if channel and note.first_line("Channel") is None:
+                            note.set_section("Channel", f"{channel}\n\n", after="Video ID")
+                    else:
+                        note = MarkdownNote.parse(create_initial_video_info(video_id, video_url, video_title, channel))
+                    profile = get_taxonomy().profile_for_note(note)
+                
+                # Extract key points
+                key_points, chapters = summarize_segments(transcript, options, output_dir, args.workers or 1,
+                                                          profile.scorer)
+                with metrics.stage('render'):
+                    add_key_points(writer, key_points, chapters)
+                
+                # Update the note's summary sections and frontmatter
+                with metrics.stage('markdown'):
+                    apply_summary_to_note(note, key_point_texts(key_points), chapters, profile)
+                    writer.add_text("video_info.md", note.render())
+                with metrics.stage('write'):
+                    writer.commit()
+                with metrics.stage('index'):
+                    index.update(video_id, video_dir, video_title)
+                    get_search_index(output_dir).add_video(video_id, transcript, video_title)
+                
+                manifest = SummaryManifest(output_dir)
+                manifest.record(video_dir, summary_config_hash(options, profile), summary_fingerprint(video_dir, profile))
+                manifest.save()
+                
+                print(f"Processed video: {video_title}")
+                print(f"Output directory: {video_dir}")
+                print("Files created:")
+                print(f"- {video_dir}/transcript.txt")
+                print(f"- {video_dir}/transcript.json")
+                print(f"- {video_dir}/{BIN_FILENAME}")
+                print(f"- {video_dir}/key_points.txt")
+                print(f"- {video_dir}/key_points.json")
+                print(f"- {video_dir}/video_info.md")
+            report_metrics(output_dir, [metrics.record(os.path.basename(video_dir), video_id=video_id,
+                                                       profile=profile_path)], args.profile)
             
         except Exception as e:
             print(f"Error processing video {video_id}: {str(e)}")
             return
+        finally:
+            print(get_cache().format_stats())
     
     # Process existing directories
-    output_dir = "output"
-    for video_dir in os.listdir(output_dir):
-        video_dir_path = os.path.join(output_dir, video_dir)
-        if not os.path.isdir(video_dir_path):
-            continue
-        
-        # Check for required files
-        transcript_path = os.path.join(video_dir_path, "transcript.txt")
-        video_info_path = os.path.join(video_dir_path, "video_info.md")
-        
-        if not (os.path.exists(transcript_path) and os.path.exists(video_info_path)):
-            continue
-        
-        print(f"Processing {video_dir}...")
-        
-        # Read transcript
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
-        
-        # Extract key points
-        key_points = extract_key_points(transcript_text)
-        
-        # Save key points to separate files
-        with open(os.path.join(video_dir_path, "key_points.json"), 'w', encoding='utf-8') as f:
-            json.dump(key_points, f, indent=2)
-        
-        # Save human-readable key points
-        with open(os.path.join(video_dir_path, "key_points.txt"), 'w', encoding='utf-8') as f:
-            for category, points in key_points.items():
-                if points:
-                    f.write(f"\n{category}\n{'=' * len(category)}\n")
-                    for point in points:
-                        f.write(f"- {point}\n")
-        
-        # Update markdown
-        update_markdown_with_summary(video_info_path, key_points)
-        
-        print(f"Updated summary for {video_dir}")
-        print("Files updated:")
-        print(f"- {video_dir_path}/key_points.txt")
-        print(f"- {video_dir_path}/key_points.json")
-        print(f"- {video_dir_path}/video_info.md")
+    if args.batch:
+        run_batch(output_dir, args.workers, args.chunk_size, args.force, options, args.profile)
+        return
+    
+    manifest = SummaryManifest(output_dir)
+    records = []
+    try:
+        for video_dir_path in pending_video_dirs(output_dir, manifest, args.force, options):
+            video_dir = os.path.basename(video_dir_path)
+            print(f"Processing {video_dir}...")
+            
+            metrics = start_video_metrics()
+            profile_path = profile_path_for(args.profile, video_dir_path)
+            with profiling(profile_path):
+                fingerprint, config_hash = summarize_video_dir(video_dir_path, options)
+            records.append(metrics.record(video_dir, profile=profile_path))
+            manifest.record(video_dir_path, config_hash, fingerprint)
+            
+            print(f"Updated summary for {video_dir}")
+            print("Files updated:")
+            print(f"- {video_dir_path}/key_points.txt")
+            print(f"- {video_dir_path}/key_points.json")
+            print(f"- {video_dir_path}/video_info.md")
+    finally:
+        manifest.save()
+        report_metrics(output_dir, records, args.profile)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from artifact_writer import pending_artifacts
+from transcript_store import TXT_FILENAME, transcript_source
+
+MANIFEST_FILENAME = ".summary_manifest.json"
+
+def file_fingerprint(path: str) -> Dict:
+    """Return size, mtime and SHA-256 of a file."""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(block)
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256.hexdigest()
+    }
+
+def transcript_fingerprint(video_dir_path: str) -> Dict:
+    """Fingerprint of the transcript file extraction reads, with its file name."""
+    path = transcript_source(video_dir_path)
+    return dict(file_fingerprint(path), source=os.path.basename(path))
+
+class SummaryManifest:
+    """Tracks which transcript and scoring config each video was summarized with.
+
+    Entries are keyed by video directory name and stored as JSON under output/.
+    They also keep the size and mtime of video_info.md and the taxonomy
+    profile it selected, so checking for stale videos doesn't parse every note.
+    """
+
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.entries: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get("videos", {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable manifest {self.path}: {str(e)}")
+
+    def is_current(self, video_dir_path: str, config_hash: str) -> bool:
+        """Check whether a directory's key points are up to date.
+
+        A matching size and mtime skip the transcript without reading it; the
+        content hash is only compared when the stat information changed. The
+        transcript is the file extraction reads (see transcript_source), so a
+        new or changed transcript.bin/.json makes the key points stale too.
+        So does an interrupted artifact commit (see pending_artifacts).
+        """
+        entry = self.entries.get(os.path.basename(video_dir_path))
+        if not entry or entry.get("config") != config_hash:
+            return False
+        if not os.path.exists(os.path.join(video_dir_path, "key_points.json")):
+            return False
+        if pending_artifacts(video_dir_path):
+            return False
+
+        transcript_path = transcript_source(video_dir_path)
+        if os.path.basename(transcript_path) != entry.get("source", TXT_FILENAME):
+            return False
+        try:
+            stat = os.stat(transcript_path)
+        except OSError:
+            return False
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        # Touched but possibly unchanged: fall back to the content hash
+        fingerprint = file_fingerprint(transcript_path)
+        if fingerprint["sha256"] != entry["sha256"]:
+            return False
+        entry.update(fingerprint)
+        return True
+
+    def recorded_profile(self, video_dir_path: str, rules_digest: str) -> Optional[str]:
+        """Name of the taxonomy profile a directory was summarized with, if its note would still select it.
+
+        That is the case when video_info.md has the recorded size and mtime
+        and the taxonomy's matching rules (Taxonomy.rules_digest) are unchanged.
+        """
+        entry = self.entries.get(os.path.basename(video_dir_path))
+        if not entry or entry.get("rules") != rules_digest:
+            return None
+        try:
+            stat = os.stat(os.path.join(video_dir_path, "video_info.md"))
+        except OSError:
+            return None
+        if stat.st_size != entry.get("note_size") or stat.st_mtime_ns != entry.get("note_mtime_ns"):
+            return None
+        return entry.get("profile")
+
+    def confirm_profile(self, video_dir_path: str, profile_name: str, rules_digest: str, note_stat: os.stat_result):
+        """Record that the note, as of note_stat, still selects the recorded profile, so it isn't parsed again."""
+        entry = self.entries.get(os.path.basename(video_dir_path))
+        if entry and entry.get("profile") == profile_name:
+            entry.update(note_size=note_stat.st_size, note_mtime_ns=note_stat.st_mtime_ns, rules=rules_digest)
+
+    def record(self, video_dir_path: str, config_hash: str, fingerprint: Optional[Dict] = None):
+        """Record a successfully summarized directory."""
+        if fingerprint is None:
+            fingerprint = transcript_fingerprint(video_dir_path)
+        self.entries[os.path.basename(video_dir_path)] = dict(fingerprint, config=config_hash)
+
+    def save(self):
+        """Write the manifest atomically."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"videos": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -1,6 +1,18 @@
+import argparse
+import json
 import os
 import shutil
 import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from summary_manifest import file_fingerprint
+from video_index import get_index
+
+SYNC_MANIFEST_FILENAME = ".sync_manifest.json"
+DEFAULT_DRIVE_PATH = r"G:\My Drive\AI"
+# Copies are I/O-bound on the mounted volume, so threads overlap them well
+DEFAULT_WORKERS = 8
 
 def get_video_title_from_md(md_path: str) -> str:
     """Extract video title from markdown file."""
@@ -22,53 +34,253 @@ def sanitize_filename(title: str) -> str:
     # Ensure filename doesn't exceed max length (255 chars)
     return title[:255] + '.md'
 
-def sync_to_drive(source_dir: str, drive_path: str):
-    """Sync markdown files to Google Drive."""
-    # Ensure drive directory exists
-    if not os.path.exists(drive_path):
-        print(f"Error: Drive path {drive_path} does not exist")
-        return
+def disambiguate(dest: str, video_id: str) -> str:
+    """Destination filename with the video ID appended, for a title several videos share."""
+    stem = dest[:-len('.md')]
+    return f"{stem[:255 - len(video_id) - 1]}_{video_id}.md"
+
+class SyncManifest:
+    """What was last copied to a destination: per video ID the destination
+    filename, title and the size, mtime and SHA-256 of the copied markdown.
+
+    Stored as JSON under output/, keyed by destination path, so the mounted
+    volume is only listed once per run and never read.
+    """
+
+    def __init__(self, source_dir: str, drive_path: str):
+        self.path = os.path.join(source_dir, SYNC_MANIFEST_FILENAME)
+        self.drive_key = os.path.abspath(drive_path)
+        self.destinations: Dict[str, Dict[str, Dict]] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.destinations = json.load(f).get("destinations", {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable sync manifest {self.path}: {str(e)}")
+        self.entries = self.destinations.setdefault(self.drive_key, {})
+
+    def save(self):
+        """Write the manifest atomically."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"destinations": self.destinations}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+def list_destination(drive_path: str) -> Dict[str, int]:
+    """Sizes of the files in the destination, from a single directory listing."""
+    with os.scandir(drive_path) as entries:
+        return {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+
+def plan_sync(source_dir: str, drive_path: str, manifest: SyncManifest,
+              delete_removed: bool = False) -> List[Dict]:
+    """Work out which files need copying, renaming or deleting.
     
-    # Process each video directory
-    for video_dir in os.listdir(source_dir):
-        video_dir_path = os.path.join(source_dir, video_dir)
-        if not os.path.isdir(video_dir_path):
-            continue
-        
-        # Check for video_info.md
+    Returns one action per video that needs work: 'copy', 'rename', 'delete',
+    or 'record' (content unchanged, only the manifest's stat info is stale).
+    A source whose size and mtime match the manifest is skipped without
+    reading it; a changed one has its title read again from the note, and
+    its content hash is only computed then. Videos whose titles give the
+    same filename keep apart: the one already copied under it keeps it (else
+    the first by video ID) and the others get their video ID appended.
+    """
+    existing = list_destination(drive_path)
+    actions = []
+    seen = set()
+    for video_id, video_dir_path, title in get_index(source_dir).entries():
         md_path = os.path.join(video_dir_path, "video_info.md")
-        if not os.path.exists(md_path):
+        try:
+            stat = os.stat(md_path)
+        except OSError:
             continue
+        seen.add(video_id)
+        entry = manifest.entries.get(video_id)
+        unchanged = bool(entry) and stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
         
-        # Get video title
-        title = get_video_title_from_md(md_path)
+        # An edited note may have a new title; otherwise use the index's, then the manifest's
+        if not unchanged:
+            title = get_video_title_from_md(md_path) or title
+        elif not title:
+            title = entry.get("title")
         if not title:
             print(f"Warning: Could not extract title from {md_path}")
             continue
+        actions.append({
+            "video_id": video_id, "source": md_path, "title": title,
+            "dest": sanitize_filename(title), "old_dest": entry["dest"] if entry else None,
+            "fingerprint": None, "unchanged": unchanged,
+        })
+    
+    claims: Dict[str, List[Dict]] = {}
+    for action in actions:
+        claims.setdefault(action["dest"], []).append(action)
+    for dest, claimants in claims.items():
+        if len(claimants) > 1:
+            claimants.sort(key=lambda action: (action["old_dest"] != dest, action["video_id"]))
+            for action in claimants[1:]:
+                action["dest"] = disambiguate(dest, action["video_id"])
+    
+    # Copies that keep their names; a video whose old copy has one of them can't move it
+    kept = {action["dest"] for action in actions if action["old_dest"] == action["dest"]}
+    plan = []
+    for action in actions:
+        video_id, md_path, unchanged = action["video_id"], action["source"], action.pop("unchanged")
+        entry = manifest.entries.get(video_id)
+        taken = action["old_dest"] != action["dest"] and action["old_dest"] in kept
+        if taken:
+            action["old_dest"] = None
+        if unchanged:
+            action["fingerprint"] = {key: entry[key] for key in ("size", "mtime_ns", "sha256")}
+        elif entry:
+            # Touched but possibly unchanged: fall back to the content hash
+            action["fingerprint"] = file_fingerprint(md_path)
         
-        # Create destination filename
-        dest_filename = sanitize_filename(title)
-        dest_path = os.path.join(drive_path, dest_filename)
-        
-        # Copy file
+        if not entry or taken or action["fingerprint"]["sha256"] != entry["sha256"] \
+                or existing.get(entry["dest"]) != entry["size"]:
+            # New, edited, or the copy went missing or was changed at the destination
+            action["action"] = 'copy'
+        elif action["dest"] != entry["dest"]:
+            action["action"] = 'rename'
+        elif not unchanged:
+            action["action"] = 'record'
+        else:
+            continue
+        plan.append(action)
+    
+    if delete_removed:
+        for video_id, entry in manifest.entries.items():
+            if video_id not in seen:
+                plan.append({"action": 'delete', "video_id": video_id, "source": None, "title": entry.get("title"),
+                             "dest": None, "old_dest": entry["dest"], "fingerprint": None})
+    return plan
+
+def _apply_moves(plan: List[Dict], drive_path: str) -> Dict[int, str]:
+    """Carry out the renames and deletes one at a time, returning error messages by plan index.
+    
+    Renamed files are first moved aside under temporary names, so titles
+    that swap or chain never overwrite each other. Deleted videos' copies
+    and the copies made under a retitled video's previous title are removed
+    before anything is renamed onto their names.
+    """
+    errors = {}
+    moved = []
+    for i, action in enumerate(plan):
+        if action["action"] == 'rename':
+            tmp_path = os.path.join(drive_path, f"{action['old_dest']}.{os.getpid()}.tmp")
+            try:
+                os.replace(os.path.join(drive_path, action["old_dest"]), tmp_path)
+                moved.append((i, tmp_path))
+            except Exception as e:
+                errors[i] = str(e)
+    for i, action in enumerate(plan):
+        if action["action"] in ('copy', 'delete') and action["old_dest"] and action["old_dest"] != action["dest"]:
+            old_path = os.path.join(drive_path, action["old_dest"])
+            try:
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+            except Exception as e:
+                errors[i] = str(e)
+    for i, tmp_path in moved:
         try:
-            shutil.copy2(md_path, dest_path)
-            print(f"Copied {md_path} to {dest_path}")
+            os.replace(tmp_path, os.path.join(drive_path, plan[i]["dest"]))
         except Exception as e:
-            print(f"Error copying {md_path}: {str(e)}")
+            errors[i] = str(e)
+    return errors
 
-def main():
-    """Main function to sync files to Google Drive."""
-    output_dir = "output"
-    drive_path = r"G:\My Drive\AI"
+def _copy(action: Dict, drive_path: str) -> Optional[str]:
+    """Copy one changed file, returning an error message if it failed."""
+    try:
+        if action["fingerprint"] is None:
+            action["fingerprint"] = file_fingerprint(action["source"])
+        shutil.copy2(action["source"], os.path.join(drive_path, action["dest"]))
+    except Exception as e:
+        return str(e)
+    return None
+
+def describe(action: Dict, drive_path: str) -> str:
+    if action["action"] == 'copy':
+        return f"{action['source']} -> {os.path.join(drive_path, action['dest'])}"
+    if action["action"] == 'rename':
+        return f"{action['old_dest']} -> {action['dest']}"
+    return action["old_dest"] or action["dest"]
+
+def sync_to_drive(source_dir: str, drive_path: str, dry_run: bool = False,
+                  workers: int = DEFAULT_WORKERS, delete_removed: bool = False) -> Optional[Dict[str, int]]:
+    """Sync changed markdown files to Google Drive and return counts per action.
     
+    Only files whose content changed since the last sync are copied, in a
+    thread pool. A changed title renames the earlier copy, and with
+    delete_removed the copies of videos no longer indexed are deleted;
+    renames and deletes all finish before the first copy starts, so no two
+    actions touch the same destination file at once. A dry run prints the
+    plan without touching anything.
+    """
+    # Ensure drive directory exists
     if not os.path.exists(drive_path):
         print(f"Error: Drive path {drive_path} does not exist")
+        return None
+    
+    manifest = SyncManifest(source_dir, drive_path)
+    plan = plan_sync(source_dir, drive_path, manifest, delete_removed)
+    counts = {'copy': 0, 'rename': 0, 'delete': 0, 'error': 0}
+    labels = {'copy': "Copied", 'rename': "Renamed", 'delete': "Deleted"}
+    
+    if dry_run:
+        for action in plan:
+            if action["action"] in labels:
+                print(f"Would {action['action']} {describe(action, drive_path)}")
+                counts[action["action"]] += 1
+        return counts
+    
+    errors = _apply_moves(plan, drive_path)
+    copies = [i for i, action in enumerate(plan) if action["action"] == 'copy' and i not in errors]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for i, error in zip(copies, executor.map(lambda i: _copy(plan[i], drive_path), copies)):
+            if error:
+                errors[i] = error
+    
+    for i, action in enumerate(plan):
+        error = errors.get(i)
+        if error:
+            print(f"Error syncing {describe(action, drive_path)}: {error}")
+            counts['error'] += 1
+            continue
+        if action["action"] == 'delete':
+            manifest.entries.pop(action["video_id"], None)
+        else:
+            manifest.entries[action["video_id"]] = dict(action["fingerprint"], dest=action["dest"], title=action["title"])
+        if action["action"] in labels:
+            print(f"{labels[action['action']]} {describe(action, drive_path)}")
+            counts[action["action"]] += 1
+    manifest.save()
+    return counts
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync video notes to Google Drive")
+    parser.add_argument('--output-dir', default="output", help="Directory containing video folders")
+    parser.add_argument('--drive-path', default=DEFAULT_DRIVE_PATH, help="Destination folder")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would change without copying")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Parallel copies")
+    parser.add_argument('--delete-removed', action='store_true',
+                        help="Delete copies of videos that are no longer in the output directory")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to sync files to Google Drive."""
+    args = parse_args(argv)
+    
+    if not os.path.exists(args.drive_path):
+        print(f"Error: Drive path {args.drive_path} does not exist")
         return
     
-    print(f"Syncing files to {drive_path}...")
-    sync_to_drive(output_dir, drive_path)
-    print("Sync complete!")
+    print(f"Syncing files to {args.drive_path}{' (dry run)' if args.dry_run else ''}...")
+    counts = sync_to_drive(args.output_dir, args.drive_path, args.dry_run, args.workers, args.delete_removed)
+    if counts is None:
+        return
+    if args.dry_run:
+        print(f"Dry run: {counts['copy']} to copy, {counts['rename']} to rename, {counts['delete']} to delete")
+    else:
+        print(f"Sync complete! {counts['copy']} copied, {counts['rename']} renamed, "
+              f"{counts['delete']} deleted, {counts['error']} errors")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from keyword_scorer import KeywordScorer
+from markdown_note import MarkdownNote
+
+# Profiles ship with the repository, next to scripts/
+DEFAULT_TAXONOMY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "taxonomy")
+DEFAULT_PROFILE = "default"
+PROFILE_SUFFIX = ".json"
+
+class TaxonomyProfile:
+    """One taxonomy file: keyword categories and weights, plus the frontmatter category and tags.
+
+    A profile applies to videos from one of its match channels, whose title
+    has one of its match title_words, or whose note carries one of its match
+    tags. Profiles without keywords use the
+    default profile's. The digest covers everything that shapes a summary,
+    so it changes only when re-scoring could give a different result.
+    """
+
+    def __init__(self, name: str, data: Dict, file_hash: str, default: Optional['TaxonomyProfile'] = None):
+        self.name = name
+        self.file_hash = file_hash
+        self.description = data.get("description", "")
+        match = data.get("match", {})
+        self.channels = [channel.casefold() for channel in match.get("channels", [])]
+        self.match_tags = list(match.get("tags", []))
+        self.title_words = [word.casefold() for word in match.get("title_words", [])]
+        self.category = data.get("category", default.category if default else "")
+        self.tags = list(data.get("tags", default.tags if default else []))
+        self.keywords: Dict[str, Dict[str, int]] = data.get("keywords") or (default.keywords if default else {})
+        if not self.keywords:
+            raise ValueError(f"Taxonomy profile {name!r} has no keywords")
+        self.scorer = default.scorer if default and self.keywords is default.keywords else KeywordScorer(self.keywords)
+        content = {"category": self.category, "tags": self.tags, "keywords": self.keywords}
+        self.digest = hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def matches(self, channel: Optional[str], tags: Iterable[str], title: Optional[str] = None) -> bool:
+        if channel and channel.casefold() in self.channels:
+            return True
+        if title and self.title_words:
+            words = title_words(title)
+            if any(word in words for word in self.title_words):
+                return True
+        return any(tag in self.match_tags for tag in tags)
+
+def title_words(title: str) -> set:
+    """Case-folded words of a video title."""
+    return set(re.findall(r"[\w']+", title.casefold()))
+
+# Compiled profiles keyed by (file hash, inherited default's file hash), shared by every Taxonomy
+_compiled: Dict[Tuple[str, str], TaxonomyProfile] = {}
+
+def load_profile(path: str, default: Optional[TaxonomyProfile] = None) -> TaxonomyProfile:
+    """Load a profile file, reusing the compiled matcher if the file's content was seen before."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    file_hash = hashlib.sha256(content).hexdigest()
+    data = json.loads(content)
+    inherited = default.file_hash if default and not data.get("keywords") else ''
+    key = (file_hash, inherited)
+    if key not in _compiled:
+        name = os.path.basename(path)[:-len(PROFILE_SUFFIX)]
+        _compiled[key] = TaxonomyProfile(name, data, file_hash, default)
+    return _compiled[key]
+
+class Taxonomy:
+    """Every profile in a taxonomy directory, reloaded when a file changes.
+
+    refresh() only stats the directory when nothing changed, so it is cheap
+    enough to call before every video; long-running batch and worker
+    processes pick up edited profiles without restarting. version is bumped
+    whenever a profile's digest changes; rules_digest covers which profiles
+    exist and what they match, so it changes whenever a note could select a
+    different profile.
+    """
+
+    def __init__(self, taxonomy_dir: str = DEFAULT_TAXONOMY_DIR):
+        self.taxonomy_dir = taxonomy_dir
+        self.pid = os.getpid()
+        self.version = 0
+        self.rules_digest = ''
+        self.profiles: Dict[str, TaxonomyProfile] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+        if DEFAULT_PROFILE not in self.profiles:
+            raise ValueError(f"No {DEFAULT_PROFILE}{PROFILE_SUFFIX} profile in {taxonomy_dir}")
+
+    def _file_stats(self) -> Dict[str, Tuple[int, int]]:
+        with os.scandir(self.taxonomy_dir) as entries:
+            return {
+                entry.name[:-len(PROFILE_SUFFIX)]: (entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in entries if entry.name.endswith(PROFILE_SUFFIX) and entry.is_file()
+            }
+
+    def refresh(self) -> bool:
+        """Reload changed profile files; returns True if any profile's digest changed.
+
+        A file that fails to load keeps its previous version (and is reported),
+        so a half-saved edit never takes a running worker down.
+        """
+        try:
+            stats = self._file_stats()
+        except OSError as e:
+            print(f"Warning: Could not read taxonomy directory {self.taxonomy_dir}: {str(e)}")
+            return False
+        with self._lock:
+            if stats == self._stats:
+                return False
+            profiles = {}
+            names = sorted(stats, key=lambda name: name != DEFAULT_PROFILE)
+            for name in names:
+                path = os.path.join(self.taxonomy_dir, name + PROFILE_SUFFIX)
+                try:
+                    profiles[name] = load_profile(path, profiles.get(DEFAULT_PROFILE))
+                except (OSError, ValueError, TypeError, AttributeError) as e:
+                    print(f"Warning: Could not load taxonomy profile {path}: {str(e)}")
+                    if name in self.profiles:
+                        profiles[name] = self.profiles[name]
+            changed = {name: profile.digest for name, profile in profiles.items()} != \
+                {name: profile.digest for name, profile in self.profiles.items()}
+            self.profiles = profiles
+            self._stats = stats
+            rules = [[name, profile.channels, profile.match_tags, profile.title_words]
+                     for name, profile in sorted(profiles.items())]
+            self.rules_digest = hashlib.sha256(json.dumps(rules).encode('utf-8')).hexdigest()[:16]
+            if changed:
+                self.version += 1
+            return changed
+
+    @property
+    def default(self) -> TaxonomyProfile:
+        return self.profiles[DEFAULT_PROFILE]
+
+    def owned_tags(self) -> set:
+        """Tags any profile writes; all other frontmatter tags were added by hand."""
+        return {tag for profile in self.profiles.values() for tag in profile.tags}
+
+    def profile_for(self, channel: Optional[str] = None, tags: Iterable[str] = (),
+                    title: Optional[str] = None) -> TaxonomyProfile:
+        """The first profile (by file name) matching the channel, the title or a tag, else the default."""
+        tags = list(tags)
+        for name in sorted(self.profiles):
+            if name != DEFAULT_PROFILE and self.profiles[name].matches(channel, tags, title):
+                return self.profiles[name]
+        return self.default
+
+    def profile_for_note(self, note: MarkdownNote) -> TaxonomyProfile:
+        """The profile for a video, from its note's Channel and Title sections and frontmatter tags."""
+        return self.profile_for(note.first_line("Channel"), note.frontmatter_list("tags"), note.first_line("Title"))
+
+    def note_tags(self, note: MarkdownNote, profile: TaxonomyProfile) -> List[str]:
+        """Frontmatter tags for a note: the profile's, then any the user added."""
+        owned = self.owned_tags()
+        extra = [tag for tag in note.frontmatter_list("tags") if tag not in owned]
+        return profile.tags + [tag for tag in dict.fromkeys(extra) if tag not in profile.tags]
+
+_taxonomies: Dict[str, Taxonomy] = {}
+_taxonomies_lock = threading.Lock()
+
+def get_taxonomy(taxonomy_dir: str = DEFAULT_TAXONOMY_DIR) -> Taxonomy:
+    """Return the process-wide taxonomy for a directory, loading it on first use."""
+    with _taxonomies_lock:
+        if taxonomy_dir not in _taxonomies or _taxonomies[taxonomy_dir].pid != os.getpid():
+            _taxonomies[taxonomy_dir] = Taxonomy(taxonomy_dir)
+        return _taxonomies[taxonomy_dir]
+
+def default_scorer() -> KeywordScorer:
+    """Keyword scorer of the default profile."""
+    return get_taxonomy().default.scorer
+
+def main():
+    """List the taxonomy profiles, or show which one a video directory uses."""
+    parser = argparse.ArgumentParser(description="Keyword taxonomy profiles.")
+    parser.add_argument('video_dir', nargs='?', help="show the profile this output directory is summarized with")
+    parser.add_argument('--taxonomy-dir', default=DEFAULT_TAXONOMY_DIR)
+    args = parser.parse_args()
+
+    try:
+        taxonomy = get_taxonomy(args.taxonomy_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    if args.video_dir:
+        note = MarkdownNote.load(os.path.join(args.video_dir, "video_info.md"))
+        profile = taxonomy.profile_for_note(note)
+        print(f"{args.video_dir}: {profile.name} ({profile.digest})")
+        return
+    for name, profile in sorted(taxonomy.profiles.items()):
+        rules = [f"channel {channel}" for channel in profile.channels] + [f"tag {tag}" for tag in profile.match_tags]
+        rules += [f"title word {word}" for word in profile.title_words]
+        if name == DEFAULT_PROFILE:
+            rules.append("fallback")
+        print(f"{name:12} {profile.digest}  {len(profile.keywords)} categories  {', '.join(rules) or 'never matched'}")
+        if profile.description:
+            print(f"{'':12} {profile.description}")
+
+if __name__ == "__main__":
+    main()
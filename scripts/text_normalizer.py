@@ -0,0 +1,159 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Spoken filler words and phrases removed from sentences
+FILLER_PHRASES = [
+    'um', 'uh', 'like', 'you know', 'sort of', 'kind of',
+    'right', 'okay', 'well', 'so',
+    'I mean', 'I think', 'I guess', "I don't know",
+]
+
+# Conjunctions that split long spoken sentences into separate points
+CLAUSE_CONJUNCTIONS = ['but', 'and', 'or', 'so', 'because', 'however', 'therefore']
+
+TIMESTAMP_PATTERN = re.compile(r'\[\d+:\d+\]')
+# A capital letter after a lowercase word starts a new sentence (this also covers "I")
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[a-z])\s+(?=[A-Z])')
+PERIODS_PATTERN = re.compile(r'\.+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+WORD_SPLIT_PATTERN = re.compile(r'(\w+)')
+
+EDGE_PUNCTUATION = ',.!?:;'
+
+# (character offset, segment start, segment end) marking where a segment's text begins
+TimeMark = Tuple[int, Optional[float], Optional[float]]
+
+def collapse_repeated_words(text: str) -> str:
+    """Collapse stuttered words ("the the the") to a single occurrence.
+
+    Linear replacement for ``re.sub(r'\\b(\\w+)(\\s+\\1)+\\b', r'\\1', text, flags=re.I)``:
+    a word is dropped, with the whitespace before it, when it repeats the
+    previous word case-insensitively.
+    """
+    # Alternating [separator, word, separator, word, ..., separator]
+    pieces = WORD_SPLIT_PATTERN.split(text)
+    if len(pieces) < 5:
+        return text
+
+    result = [pieces[0], pieces[1]]
+    previous = pieces[1].lower()
+    for i in range(3, len(pieces), 2):
+        separator, word = pieces[i - 1], pieces[i]
+        current = word.lower()
+        if current == previous and separator.isspace():
+            continue
+        result.append(separator)
+        result.append(word)
+        previous = current
+    result.append(pieces[-1])
+    return ''.join(result)
+
+class TextNormalizer:
+    """Precompiled cleanup pipeline for transcript text and sentence fragments."""
+
+    def __init__(self, filler_phrases: List[str] = FILLER_PHRASES,
+                 clause_conjunctions: List[str] = CLAUSE_CONJUNCTIONS):
+        # Longest phrases first so "sort of" wins over "so" at the same position
+        fillers = sorted(filler_phrases, key=len, reverse=True)
+        self._filler_pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(f) for f in fillers) + r')\b', re.IGNORECASE)
+        self._clause_pattern = re.compile(
+            r'(?<=[a-z])\s+(?:' + '|'.join(clause_conjunctions) + r')\s+')
+
+    def normalize_document(self, text: str) -> str:
+        """Strip timestamps and mark sentence boundaries across a whole transcript."""
+        text = TIMESTAMP_PATTERN.sub('', text)
+        text = SENTENCE_BOUNDARY_PATTERN.sub('. ', text)
+        text = PERIODS_PATTERN.sub('.', text)
+        return WHITESPACE_PATTERN.sub(' ', text)
+
+    def iter_fragments(self, texts: Iterable[str]) -> Iterator[str]:
+        """Yield the '.'-separated fragments of the space-joined texts.
+
+        Produces exactly ``normalize_document(' '.join(texts)).split('.')`` but
+        only holds the current unfinished fragment in memory.
+        """
+        carry = ''
+        separator = ''
+        for text in texts:
+            # Re-normalize the end of the carry (last character plus at most one
+            # collapsed space) with the new text so that sentence boundaries
+            # and whitespace runs across the join come out the same
+            context = carry[-2:] if carry.endswith(' ') else carry[-1:]
+            piece = self.normalize_document(context + separator + text)
+            fragments = (carry[:len(carry) - len(context)] + piece).split('.')
+            carry = fragments.pop()
+            separator = ' '
+            yield from fragments
+        yield carry
+
+    def iter_timed_fragments(self, segments: Iterable[Dict]) -> Iterator[Tuple[str, List[TimeMark]]]:
+        """Like iter_fragments over segment texts, but keep track of segment times.
+
+        Each fragment comes with marks giving the offset in the fragment at
+        which each segment's text begins, the first at offset 0 for the
+        segment already running when the fragment starts. Offsets are exact up
+        to the whitespace and periods normalization adds or removes at a join.
+        Segments without a 'start' time get None times.
+        """
+        carry = ''
+        marks: List[TimeMark] = []
+        separator = ''
+        for segment in segments:
+            start = segment.get('start')
+            end = start + segment.get('duration', 0.0) if start is not None else None
+            text = segment['text']
+            context = carry[-2:] if carry.endswith(' ') else carry[-1:]
+            head = carry[:len(carry) - len(context)]
+            combined = head + self.normalize_document(context + separator + text)
+            offset = len(head) + len(self.normalize_document(context + separator))
+            marks.append((min(offset, len(combined)), start, end))
+            fragments = combined.split('.')
+            carry = fragments.pop()
+            separator = ' '
+            if not fragments:
+                continue
+
+            # Hand each fragment the marks inside it; every mark is visited once
+            pos = i = 0
+            for fragment in fragments:
+                stop = pos + len(fragment)
+                while i + 1 < len(marks) and marks[i + 1][0] <= pos:
+                    i += 1
+                fragment_marks = [(0, marks[i][1], marks[i][2])]
+                j = i + 1
+                while j < len(marks) and marks[j][0] < stop:
+                    fragment_marks.append((marks[j][0] - pos, marks[j][1], marks[j][2]))
+                    j += 1
+                yield fragment, fragment_marks
+                pos = stop + 1
+            while i + 1 < len(marks) and marks[i + 1][0] <= pos:
+                i += 1
+            marks = [(max(offset - pos, 0), start, end) for offset, start, end in marks[i:]]
+        yield carry, marks
+
+    def clean(self, text: str) -> str:
+        """Remove filler words and repetitions from a sentence.
+
+        Removing a filler can bring together words that form another filler
+        or repeat ("I um think" -> "I think"), so the text gets a second pass.
+        """
+        return self.clean_pass(self.clean_pass(text))
+
+    def clean_pass(self, text: str) -> str:
+        """Remove filler words and repetitions once, without looking at what the removal joins."""
+        text = self._filler_pattern.sub('', text)
+        text = collapse_repeated_words(text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
+        return self.trim(text)
+
+    def trim(self, text: str) -> str:
+        """Remove leading/trailing punctuation (including periods) and whitespace."""
+        return text.strip(EDGE_PUNCTUATION).strip()
+
+    def split_clauses(self, sentence: str) -> List[str]:
+        """Split a cleaned sentence on common spoken conjunctions."""
+        return [self.trim(part) for part in self._clause_pattern.split(sentence)]
+
+# Default normalizer compiled once per process
+DEFAULT_NORMALIZER = TextNormalizer()
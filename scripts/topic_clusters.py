@@ -0,0 +1,490 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Topic clustering is optional; the command reports how to install it
+    np = None
+
+from artifact_writer import ArtifactWriter
+from search_index import deep_link, format_timestamp
+from sentence_ranker import tokenize
+from video_index import TOPICS_DIRNAME, get_index
+
+VECTORS_FILENAME = ".topic_vectors.f32"
+POINTS_FILENAME = ".topic_points.tsv"
+CACHE_FILENAME = ".topic_vectors.json"
+
+# Hashed bag-of-words width; 100k key points take 200 MB as float32
+DIMENSIONS = 512
+# Rows vectorized, weighted or assigned per NumPy pass
+CHUNK_ROWS = 8192
+
+DEFAULT_TOPICS = 20
+# Mini-batch k-means settings
+BATCH_SIZE = 1024
+MAX_STEPS = 300
+INIT_SAMPLE_SIZE = 4096
+TOLERANCE = 1e-4
+
+# What each topic note lists
+TOPIC_TERMS = 5
+TERM_SAMPLE_SIZE = 200
+REPRESENTATIVE_POINTS = 10
+TOPIC_NOTE_PATTERN = re.compile(r'^topic_\d+.*\.md$')
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Topic clustering needs NumPy: pip install numpy")
+
+def iter_key_points(data: Dict) -> Iterator[Tuple[Optional[float], str]]:
+    """(start, text) of every distinct key point in a key_points.json, chapters included.
+
+    Handles both timed points ({"text", "start", ...}) and the older plain strings.
+    """
+    seen = set()
+    groups = [points for category, points in data.items() if category != "chapters"]
+    for chapter in data.get("chapters") or []:
+        groups.extend(chapter["key_points"].values())
+    for points in groups:
+        for point in points:
+            if isinstance(point, str):
+                point = {"text": point, "start": None}
+            if point["text"] not in seen:
+                seen.add(point["text"])
+                yield point.get("start"), point["text"]
+
+class HashedVectorizer:
+    """Signed hashed bag-of-words term counts, the same for every run and machine."""
+
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+        self._columns: Dict[str, Tuple[int, float]] = {}
+
+    def column(self, term: str) -> Tuple[int, float]:
+        """Matrix column and sign of a term."""
+        column = self._columns.get(term)
+        if column is None:
+            h = zlib.crc32(term.encode('utf-8'))
+            column = self._columns[term] = (h % self.dimensions, 1.0 if h & 0x80000000 else -1.0)
+        return column
+
+    def transform(self, texts: List[str]) -> "np.ndarray":
+        """Term-count matrix (len(texts) x dimensions, float32) for a list of texts."""
+        flat, signs = [], []
+        for row, text in enumerate(texts):
+            offset = row * self.dimensions
+            for term in tokenize(text):
+                column, sign = self.column(term)
+                flat.append(offset + column)
+                signs.append(sign)
+        counts = np.bincount(np.asarray(flat, dtype=np.int64), weights=signs,
+                             minlength=len(texts) * self.dimensions)
+        return counts.reshape(len(texts), self.dimensions).astype(np.float32)
+
+class TopicVectors:
+    """Hashed bag-of-words vectors of every key point in output/, cached on disk.
+
+    Vectors live in a float32 matrix memory-mapped from output/.topic_vectors.f32,
+    one row per key point; the point's start time and text are on the same
+    line of output/.topic_points.tsv. output/.topic_vectors.json maps each
+    video directory to its contiguous row range and the size and mtime of
+    the key_points.json it came from, so an update only vectorizes new or
+    re-summarized videos. Rows of removed or replaced videos stay in the
+    files until they outnumber the live ones, then the files are compacted.
+    Per-column document frequencies are kept up to date alongside, so
+    TF-IDF weights never need a pass over the matrix.
+    """
+
+    def __init__(self, output_dir: str = "output", dimensions: int = DIMENSIONS):
+        require_numpy()
+        self.output_dir = output_dir
+        self.dimensions = dimensions
+        self.vectors_path = os.path.join(output_dir, VECTORS_FILENAME)
+        self.points_path = os.path.join(output_dir, POINTS_FILENAME)
+        self.cache_path = os.path.join(output_dir, CACHE_FILENAME)
+        self.vectorizer = HashedVectorizer(dimensions)
+        self._matrix = None
+        self._lines: Optional[List[str]] = None
+        self.reset()
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached["dimensions"] == dimensions \
+                    and os.path.getsize(self.vectors_path) >= cached["rows"] * dimensions * 4 \
+                    and os.path.getsize(self.points_path) >= cached["points_bytes"]:
+                self.rows = cached["rows"]
+                self.points_bytes = cached["points_bytes"]
+                self.videos = cached["videos"]
+                self.df = np.asarray(cached["df"], dtype=np.int64)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def reset(self):
+        """Forget every cached vector (the files are overwritten as rows are added)."""
+        self.rows = 0
+        self.points_bytes = 0
+        self.videos: Dict[str, Dict] = {}
+        self.df = np.zeros(self.dimensions, dtype=np.int64)
+        self._close()
+
+    def _close(self):
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = None
+        self._lines = None
+
+    def matrix(self) -> "np.ndarray":
+        """The memory-mapped vector matrix (its capacity may exceed self.rows)."""
+        if self._matrix is None:
+            capacity = os.path.getsize(self.vectors_path) // (self.dimensions * 4)
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r+',
+                                     shape=(capacity, self.dimensions))
+        return self._matrix
+
+    def _reserve(self, count: int):
+        needed = (self.rows + count) * self.dimensions * 4
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        if size >= needed:
+            return
+        # Grow by doubling so appends stay amortized constant-time
+        self._close()
+        with open(self.vectors_path, 'ab') as f:
+            f.truncate(max(needed, 2 * size))
+
+    def _append(self, points: List[Tuple[Optional[float], str]]) -> int:
+        """Vectorize points onto the end of the cache and return their first row."""
+        first_row = self.rows
+        self._reserve(len(points))
+        matrix = self.matrix()
+        for i in range(0, len(points), CHUNK_ROWS):
+            block = self.vectorizer.transform([text for _, text in points[i:i + CHUNK_ROWS]])
+            matrix[self.rows:self.rows + len(block)] = block
+            self.df += np.count_nonzero(block, axis=0)
+            self.rows += len(block)
+
+        lines = ''.join(f"{'' if start is None else start}\t{' '.join(text.split())}\n" for start, text in points)
+        data = lines.encode('utf-8')
+        with open(self.points_path, 'ab') as f:
+            f.truncate(self.points_bytes)
+            f.write(data)
+        self.points_bytes += len(data)
+        self._lines = None
+        return first_row
+
+    def _drop(self, name: str):
+        entry = self.videos.pop(name, None)
+        if entry and entry["count"]:
+            block = self.matrix()[entry["first_row"]:entry["first_row"] + entry["count"]]
+            self.df -= np.count_nonzero(block, axis=0)
+
+    def set_video(self, name: str, points: List[Tuple[Optional[float], str]], **info):
+        """Replace a video's key points; info (video_id, title, source) is kept with its rows."""
+        self._drop(name)
+        first_row = self._append(points) if points else self.rows
+        self.videos[name] = dict(info, first_row=first_row, count=len(points))
+
+    def update(self) -> Tuple[int, int]:
+        """Sync the cache with every indexed video's key_points.json.
+
+        Returns (videos vectorized, key points vectorized).
+        """
+        current = {}
+        for video_id, video_dir, title in get_index(self.output_dir).entries():
+            path = os.path.join(video_dir, "key_points.json")
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            current[os.path.basename(video_dir)] = (video_id, title, path, [stat.st_size, stat.st_mtime_ns])
+
+        for name in [name for name in self.videos if name not in current]:
+            self._drop(name)
+        videos = points = 0
+        for name, (video_id, title, path, source) in current.items():
+            entry = self.videos.get(name)
+            if entry and entry["source"] == source:
+                if entry["title"] != title:
+                    entry["title"] = title
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    video_points = list(iter_key_points(json.load(f)))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Warning: Skipping unreadable {path}: {str(e)}")
+                self._drop(name)
+                continue
+            self.set_video(name, video_points, video_id=video_id, title=title, source=source)
+            videos += 1
+            points += len(video_points)
+
+        if self.rows > 2 * self.live_count() + CHUNK_ROWS:
+            self.compact()
+        return videos, points
+
+    def live_count(self) -> int:
+        return sum(entry["count"] for entry in self.videos.values())
+
+    def live_rows(self) -> "np.ndarray":
+        """Row numbers of every current key point, in file order."""
+        ranges = sorted((entry["first_row"], entry["count"]) for entry in self.videos.values() if entry["count"])
+        if not ranges:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([np.arange(first, first + count, dtype=np.int64) for first, count in ranges])
+
+    def row_videos(self, rows: "np.ndarray") -> List[str]:
+        """The video directory name each row belongs to."""
+        names = sorted((name for name, entry in self.videos.items() if entry["count"]),
+                       key=lambda name: self.videos[name]["first_row"])
+        starts = np.asarray([self.videos[name]["first_row"] for name in names], dtype=np.int64)
+        return [names[i] for i in np.searchsorted(starts, rows, side='right') - 1]
+
+    def point(self, row: int) -> Tuple[Optional[float], str]:
+        """(start, text) of a row's key point."""
+        if self._lines is None:
+            with open(self.points_path, 'rb') as f:
+                self._lines = f.read(self.points_bytes).decode('utf-8').split('\n')
+        start, text = self._lines[row].split('\t', 1)
+        return (float(start) if start else None), text
+
+    def idf(self) -> "np.ndarray":
+        """Smoothed inverse document frequency per column, as in CorpusIdf."""
+        count = self.live_count()
+        return (np.log((1 + count) / (1 + self.df)) + 1.0).astype(np.float32)
+
+    def weighted(self, rows: "np.ndarray", idf: "np.ndarray") -> "np.ndarray":
+        """L2-normalized TF-IDF vectors of the given rows (all-zero rows stay zero)."""
+        block = self.matrix()[rows] * idf
+        norms = np.linalg.norm(block, axis=1)
+        norms[norms == 0] = 1.0
+        return block / norms[:, None]
+
+    def compact(self):
+        """Rewrite the files with only the live rows, in video order."""
+        ordered = sorted(self.videos.items(), key=lambda item: item[1]["first_row"])
+        points = []
+        for _, entry in ordered:
+            points.extend(self.point(row) for row in range(entry["first_row"], entry["first_row"] + entry["count"]))
+        # The cache is only valid again once save() has written the new row ranges
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+        self.reset()
+        os.remove(self.vectors_path)
+        offset = 0
+        for name, entry in ordered:
+            count = entry["count"]
+            self.set_video(name, points[offset:offset + count],
+                           **{key: entry[key] for key in ("video_id", "title", "source")})
+            offset += count
+
+    def save(self):
+        """Flush the vectors and write the row map atomically."""
+        self._close()
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"dimensions": self.dimensions, "rows": self.rows, "points_bytes": self.points_bytes,
+                       "df": self.df.tolist(), "videos": self.videos}, f)
+        os.replace(tmp_path, self.cache_path)
+
+def kmeans_plus_plus(points: "np.ndarray", k: int, rng) -> "np.ndarray":
+    """Pick k spread-out starting centers among unit vectors (cosine distance)."""
+    centers = [points[rng.integers(len(points))]]
+    distances = 1.0 - points @ centers[0]
+    for _ in range(1, k):
+        weights = np.clip(distances, 0, None).astype(np.float64)
+        total = weights.sum()
+        index = rng.choice(len(points), p=weights / total) if total > 0 else rng.integers(len(points))
+        centers.append(points[index])
+        distances = np.minimum(distances, 1.0 - points @ points[index])
+    return np.array(centers)
+
+def minibatch_kmeans(vectors: TopicVectors, rows: "np.ndarray", k: int, seed: int = 0,
+                     batch_size: int = BATCH_SIZE, max_steps: int = MAX_STEPS) -> "np.ndarray":
+    """Spherical mini-batch k-means over the given rows; returns unit-length centers.
+
+    Each step assigns a random batch to its nearest centers and moves every
+    center towards its batch members with a per-center learning rate of
+    1 / (points it has seen), stopping once no center moves by more than
+    TOLERANCE. The cost depends on batch_size and max_steps, not on the
+    number of rows.
+    """
+    rng = np.random.default_rng(seed)
+    idf = vectors.idf()
+    sample = rows if len(rows) <= INIT_SAMPLE_SIZE else np.sort(rng.choice(rows, INIT_SAMPLE_SIZE, replace=False))
+    centers = kmeans_plus_plus(vectors.weighted(sample, idf), k, rng)
+    seen = np.zeros(len(centers))
+    for _ in range(max_steps):
+        # Sampling with replacement keeps a step's cost independent of the corpus size
+        batch_rows = rows if len(rows) <= batch_size else np.sort(rows[rng.integers(len(rows), size=batch_size)])
+        batch = vectors.weighted(batch_rows, idf)
+        labels = np.argmax(batch @ centers.T, axis=1)
+        members = labels[None, :] == np.arange(len(centers))[:, None]
+        counts = members.sum(axis=1)
+        seen += counts
+        moved = counts > 0
+        rate = (counts[moved] / seen[moved])[:, None]
+        means = (members[moved].astype(np.float32) @ batch) / counts[moved][:, None]
+        updated = centers[moved] + rate * (means - centers[moved])
+        updated /= np.maximum(np.linalg.norm(updated, axis=1), 1e-12)[:, None]
+        shift = np.abs(updated - centers[moved]).max() if moved.any() else 0.0
+        centers[moved] = updated
+        if shift < TOLERANCE:
+            break
+    return centers
+
+def assign_topics(vectors: TopicVectors, rows: "np.ndarray", centers: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Nearest center and cosine similarity to it for every row, a chunk at a time."""
+    idf = vectors.idf()
+    labels = np.empty(len(rows), dtype=np.int64)
+    similarity = np.empty(len(rows), dtype=np.float32)
+    for i in range(0, len(rows), CHUNK_ROWS):
+        scores = vectors.weighted(rows[i:i + CHUNK_ROWS], idf) @ centers.T
+        labels[i:i + CHUNK_ROWS] = np.argmax(scores, axis=1)
+        similarity[i:i + CHUNK_ROWS] = scores.max(axis=1)
+    return labels, similarity
+
+def cluster_topics(vectors: TopicVectors, k: int = DEFAULT_TOPICS, seed: int = 0) -> List[Dict]:
+    """Cluster every cached key point and return the topics, largest first.
+
+    Each topic holds its member rows and their similarity to the topic
+    center, most central first. Key points with no content words are left out.
+    """
+    rows = vectors.live_rows()
+    if len(rows):
+        matrix = vectors.matrix()
+        rows = rows[np.concatenate([np.count_nonzero(matrix[rows[i:i + CHUNK_ROWS]], axis=1) > 0
+                                    for i in range(0, len(rows), CHUNK_ROWS)])]
+    if not len(rows):
+        return []
+    centers = minibatch_kmeans(vectors, rows, min(k, len(rows)), seed)
+    labels, similarity = assign_topics(vectors, rows, centers)
+
+    topics = []
+    for label in range(len(centers)):
+        members = np.flatnonzero(labels == label)
+        if not len(members):
+            continue
+        members = members[np.argsort(-similarity[members], kind='stable')]
+        topics.append({"rows": rows[members], "similarity": similarity[members]})
+    topics.sort(key=lambda topic: len(topic["rows"]), reverse=True)
+    return topics
+
+def topic_terms(vectors: TopicVectors, topic: Dict, idf: "np.ndarray", count: int = TOPIC_TERMS) -> List[str]:
+    """The most characteristic words of a topic's most central key points."""
+    counts = Counter()
+    for row in topic["rows"][:TERM_SAMPLE_SIZE]:
+        counts.update(set(tokenize(vectors.point(row)[1])))
+    scored = {term: n * idf[vectors.vectorizer.column(term)[0]] for term, n in counts.items()}
+    return sorted(scored, key=lambda term: (-scored[term], term))[:count]
+
+def note_link(entry: Dict, name: str) -> str:
+    """Markdown link from a topic note to a video's video_info.md."""
+    return f"[{entry['title'] or name}](<../{name}/video_info.md>)"
+
+def render_topic_note(vectors: TopicVectors, number: int, topic: Dict, terms: List[str]) -> str:
+    """Topic index note: key terms, the most central key points and every video in the topic."""
+    names = vectors.row_videos(topic["rows"])
+    video_counts = Counter(names)
+    heading = f"Topic {number}: {', '.join(terms)}"
+    lines = [
+        "---",
+        f'title: "{heading.replace(":", " -")}"',
+        "type: topic-index",
+        f"topic: {number}",
+        f"keyPoints: {len(topic['rows'])}",
+        f"videos: {len(video_counts)}",
+        f"createdDate: {datetime.now().strftime('%Y/%m/%d')}",
+        "tags:",
+        "  - topic-index",
+        "---",
+        f"# {heading}",
+        "",
+        "## Representative Key Points",
+    ]
+    shown = set()
+    for row, name in zip(topic["rows"], names):
+        if len(shown) == REPRESENTATIVE_POINTS:
+            break
+        start, text = vectors.point(row)
+        if text in shown:
+            continue
+        shown.add(text)
+        entry = vectors.videos[name]
+        if start is not None and entry["video_id"]:
+            text = f"[[{format_timestamp(start)}]({deep_link(entry['video_id'], start)})] {text}"
+        lines.append(f"- {text} ({note_link(entry, name)})")
+
+    lines += ["", "## Videos"]
+    for name, count in sorted(video_counts.items(), key=lambda item: (-item[1], item[0])):
+        lines.append(f"- {note_link(vectors.videos[name], name)} ({count} key points)")
+    return "\n".join(lines) + "\n"
+
+def write_topic_notes(vectors: TopicVectors, topics: List[Dict]) -> List[str]:
+    """Write one note per topic to output/topics/, replacing the previous run's notes."""
+    topics_dir = os.path.join(vectors.output_dir, TOPICS_DIRNAME)
+    idf = vectors.idf()
+    writer = ArtifactWriter(topics_dir)
+    for number, topic in enumerate(topics, 1):
+        terms = topic_terms(vectors, topic, idf)
+        slug = '_'.join(term.replace("'", "") for term in terms[:3])
+        name = f"topic_{number:02d}_{slug}.md"
+        writer.add_text(name, render_topic_note(vectors, number, topic, terms))
+    names = list(writer.artifacts)
+    writer.commit()
+
+    if os.path.isdir(topics_dir):
+        for name in os.listdir(topics_dir):
+            if TOPIC_NOTE_PATTERN.match(name) and name not in names:
+                os.remove(os.path.join(topics_dir, name))
+    return names
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Cluster key points across all videos into topic notes.")
+    parser.add_argument('--output-dir', default="output")
+    parser.add_argument('--topics', type=int, default=DEFAULT_TOPICS,
+                        help=f"number of topics (default: {DEFAULT_TOPICS})")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for reproducible topics")
+    parser.add_argument('--rebuild', action='store_true', help="discard the vector cache and vectorize everything")
+    args = parser.parse_args(argv)
+    if args.topics < 1:
+        parser.error("--topics must be at least 1")
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    """Update the key point vectors, cluster them and write the topic notes."""
+    args = parse_args(argv)
+    try:
+        require_numpy()
+    except RuntimeError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    vectors = TopicVectors(args.output_dir)
+    if args.rebuild:
+        vectors.reset()
+    videos, points = vectors.update()
+    vectors.save()
+    print(f"Vectorized {points} key points from {videos} new or changed videos "
+          f"({vectors.live_count()} cached) in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    topics = cluster_topics(vectors, args.topics, args.seed)
+    elapsed = time.perf_counter() - start
+    names = write_topic_notes(vectors, topics)
+    print(f"Clustered {sum(len(topic['rows']) for topic in topics)} key points into {len(topics)} topics "
+          f"in {elapsed:.2f}s")
+    for number, topic in enumerate(topics, 1):
+        print(f"  {number:2d}. {len(topic['rows']):6d} key points  {names[number - 1]}")
+
+if __name__ == "__main__":
+    main()
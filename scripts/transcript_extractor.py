@@ -1,11 +1,19 @@
-from youtube_transcript_api import YouTubeTranscriptApi
 import sys
-import json
 import os
 import re
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-import requests
+
+from artifact_writer import ArtifactWriter
+from caption_filter import merge_caption_segments
+from http_client import get_client
+from metadata_cache import get_cache
+from search_index import get_search_index
+from transcript_store import BIN_FILENAME, encode_transcript_bin
+from video_index import get_index
+
+# YouTube's oEmbed endpoint (no API key required)
+OEMBED_ENDPOINT = "https://www.youtube.com/oembed"
 
 def get_video_id(url: str) -> str:
     """Extract video ID from YouTube URL."""
@@ -21,19 +29,30 @@ def get_video_id(url: str) -> str:
             return match.group(1)
     return None
 
-def get_video_info(video_id: str) -> Tuple[str, str]:
-    """Get video title using YouTube's oEmbed endpoint."""
+def get_video_info(video_id: str, oembed_endpoint: str = OEMBED_ENDPOINT) -> Tuple[str, str]:
+    """Get video title using YouTube's oEmbed endpoint (cached on disk, with the channel name)."""
+    cache = get_cache()
+    title = cache.get('title', video_id)
+    if title is not None:
+        return title, 'en'
+    
     try:
-        # Use YouTube's oEmbed endpoint (no API key required)
-        oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url)
+        oembed_url = f"{oembed_endpoint}?url=https://www.youtube.com/watch?v={video_id}&format=json"
+        response = get_client().get(oembed_url)
         response.raise_for_status()
         data = response.json()
+        cache.put('title', video_id, data['title'])
+        if data.get('author_name'):
+            cache.put('channel', video_id, data['author_name'])
         return data['title'], 'en'  # Assuming English for now
     except Exception as e:
         print(f"Warning: Could not fetch video title: {str(e)}")
         return f"YouTube Video {video_id}", 'en'
 
+def get_video_channel(video_id: str) -> Optional[str]:
+    """Channel name cached when the video's title was fetched, if any."""
+    return get_cache().get('channel', video_id)
+
 def sanitize_filename(title: str) -> str:
     """Convert title to a valid filename."""
     # Remove invalid characters
@@ -54,19 +73,28 @@ def ensure_output_dir(video_id: str, title: str) -> str:
     new_dir_name = f"{sanitized_title}_{video_id}"
     new_dir_path = os.path.join(output_dir, new_dir_name)
     
-    # Check for existing directories with this video ID
-    for dir_name in os.listdir(output_dir):
-        dir_path = os.path.join(output_dir, dir_name)
-        if os.path.isdir(dir_path) and video_id in dir_name:
-            if dir_name != new_dir_name:  # Only remove if it's a different name
-                print(f"Removing old directory: {dir_path}")
-                import shutil
-                shutil.rmtree(dir_path)
+    # Look up any existing directory for this video ID in the index
+    index = get_index(output_dir)
+    old_dir_path = index.lookup(video_id)
+    if old_dir_path and os.path.basename(old_dir_path) != new_dir_name:  # Only remove if it's a different name
+        print(f"Removing old directory: {old_dir_path}")
+        import shutil
+        shutil.rmtree(old_dir_path)
     
     # Create the new directory
     os.makedirs(new_dir_path, exist_ok=True)
+    index.update(video_id, new_dir_path, title)
     return new_dir_path
 
+def fetch_transcript(video_id: str, language: str = 'en') -> List[Dict]:
+    """Fetch transcript segments for a video ID, reading from and filling the metadata cache."""
+    # Imported here so offline users of this module don't pay for it
+    from youtube_transcript_api import YouTubeTranscriptApi
+    return get_cache().get_or_fetch(
+        'transcript', video_id,
+        lambda: YouTubeTranscriptApi.get_transcript(video_id, languages=[language]),
+        language)
+
 def get_transcript(video_url: str, language: str = 'en') -> Optional[List[Dict]]:
     """
     Get the transcript for a YouTube video.
@@ -81,8 +109,7 @@ def get_transcript(video_url: str, language: str = 'en') -> Optional[List[Dict]]
     """
     try:
         video_id = get_video_id(video_url)
-        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
-        return transcript
+        return fetch_transcript(video_id, language)
     except Exception as e:
         print(f"Error getting transcript: {str(e)}", file=sys.stderr)
         return None
@@ -95,13 +122,13 @@ def format_transcript(transcript: List[Dict]) -> str:
         transcript: List of transcript segments
     
     Returns:
-        Formatted transcript text with timestamps
+        Formatted transcript text with timestamps, one line per merged utterance
     """
     if not transcript:
         return "No transcript available."
     
     formatted_text = []
-    for segment in transcript:
+    for segment in merge_caption_segments(transcript):
         timestamp = int(segment['start'])
         minutes = timestamp // 60
         seconds = timestamp % 60
@@ -109,35 +136,48 @@ def format_transcript(transcript: List[Dict]) -> str:
     
     return "\n".join(formatted_text)
 
-def save_transcript(transcript_list: list, output_dir: str):
-    """Save transcript in both JSON and formatted text."""
-    # Save raw JSON
-    json_path = os.path.join(output_dir, "transcript.json")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(transcript_list, f, indent=2, ensure_ascii=False)
-    print(f"Raw transcript saved to {json_path}")
-    
-    # Save formatted text
-    txt_path = os.path.join(output_dir, "transcript.txt")
-    with open(txt_path, 'w', encoding='utf-8') as f:
-        for entry in transcript_list:
-            timestamp = int(entry['start'])
-            minutes = timestamp // 60
-            seconds = timestamp % 60
-            f.write(f"[{minutes:02d}:{seconds:02d}] {entry['text']}\n")
-    
-    print(f"Formatted transcript saved to {txt_path}")
+def add_transcript(writer: ArtifactWriter, transcript_list: list) -> List[str]:
+    """Add the transcript as JSON, transcript.bin and formatted text to a writer. Returns the text's lines."""
+    # Raw JSON, plus a compact columnar copy for fast reloads
+    writer.add_json("transcript.json", transcript_list, indent=2, ensure_ascii=False)
+    writer.add_bytes(BIN_FILENAME, encode_transcript_bin(transcript_list))
+    
+    # Formatted text, one line per merged utterance without caption noise
+    lines = []
+    for entry in merge_caption_segments(transcript_list):
+        timestamp = int(entry['start'])
+        minutes = timestamp // 60
+        seconds = timestamp % 60
+        lines.append(f"[{minutes:02d}:{seconds:02d}] {entry['text']}\n")
+    writer.add_text("transcript.txt", ''.join(lines))
+    return lines
+
+def report_saved_transcript(output_dir: str, lines: List[str], preview: bool = True):
+    """Print where the transcript was saved and, with preview, its first few lines."""
+    print(f"Raw transcript saved to {os.path.join(output_dir, 'transcript.json')}")
+    print(f"Formatted transcript saved to {os.path.join(output_dir, 'transcript.txt')}")
+    
+    if not preview:
+        return
     
     # Print first few lines
     print("\nFirst few lines of formatted transcript:")
     print("-" * 50)
-    with open(txt_path, 'r', encoding='utf-8') as f:
-        print("".join(f.readlines()[:5]))
+    print("".join(lines[:5]))
     print("-" * 50)
 
-def update_video_info(output_dir: str, video_id: str, url: str, title: str):
-    """Create or update video_info.md file."""
-    md_path = os.path.join(output_dir, "video_info.md")
+def save_transcript(transcript_list: list, output_dir: str, preview: bool = True):
+    """Save transcript as JSON, transcript.bin and formatted text, committed in one locked step."""
+    writer = ArtifactWriter(output_dir)
+    lines = add_transcript(writer, transcript_list)
+    writer.commit()
+    report_saved_transcript(output_dir, lines, preview)
+
+def add_video_info(writer: ArtifactWriter, output_dir: str, video_id: str, url: str, title: str,
+                   channel: Optional[str] = None):
+    """Add a fresh video_info.md to a writer."""
+    # The channel picks the video's taxonomy profile when it is summarized
+    channel_section = f"## Channel\n{channel}\n\n" if channel else ""
     content = f"""# Video Information
 
 ## Title
@@ -149,12 +189,13 @@ def update_video_info(output_dir: str, video_id: str, url: str, title: str):
 ## Video ID
 {video_id}
 
-## Directory Name
+{channel_section}## Directory Name
 {os.path.basename(output_dir)}
 
 ## Files
 - `transcript.txt`: Human-readable transcript with timestamps
 - `transcript.json`: Raw transcript data in JSON format
+- `transcript.bin`: Compact columnar copy of the transcript for fast reloads
 - `key_points.txt`: Extracted key points in human-readable format (to be generated)
 - `key_points.json`: Structured key points data (to be generated)
 
@@ -166,9 +207,23 @@ def update_video_info(output_dir: str, video_id: str, url: str, title: str):
 ## Notes
 - Transcript downloaded on: {os.path.basename(output_dir)}
 """
-    
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    writer.add_text("video_info.md", content)
+
+def update_video_info(output_dir: str, video_id: str, url: str, title: str, channel: Optional[str] = None):
+    """Create or update video_info.md file."""
+    writer = ArtifactWriter(output_dir)
+    add_video_info(writer, output_dir, video_id, url, title, channel)
+    writer.commit()
+
+def save_video(output_dir: str, video_id: str, url: str, title: str, transcript_list: list,
+               preview: bool = True):
+    """Save the transcript files and video_info.md together, committed in one locked step."""
+    writer = ArtifactWriter(output_dir)
+    lines = add_transcript(writer, transcript_list)
+    # Added last, so an interrupted commit doesn't leave a note for missing transcript files
+    add_video_info(writer, output_dir, video_id, url, title, get_video_channel(video_id))
+    writer.commit()
+    report_saved_transcript(output_dir, lines, preview)
 
 def main():
     """Main function to extract transcript."""
@@ -190,20 +245,21 @@ def main():
         print(f"Video title: {title}")
         
         # Get transcript
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+        transcript_list = fetch_transcript(video_id)
         
         # Create output directory
         output_dir = ensure_output_dir(video_id, title)
         
-        # Save transcript
-        save_transcript(transcript_list, output_dir)
-        
-        # Update video info
-        update_video_info(output_dir, video_id, url, title)
+        # Save transcript and video info
+        save_video(output_dir, video_id, url, title, transcript_list)
+        get_index().update(video_id, output_dir, title)
+        get_search_index().add_video(video_id, transcript_list, title)
         
     except Exception as e:
         print(f"Error extracting transcript: {str(e)}")
         sys.exit(1)
+    finally:
+        print(get_cache().format_stats())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
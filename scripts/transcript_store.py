@@ -0,0 +1,251 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Union
+
+from artifact_writer import pending_artifacts
+from caption_filter import SegmentRow, segment_rows
+from video_index import get_index
+
+BIN_FILENAME = "transcript.bin"
+JSON_FILENAME = "transcript.json"
+TXT_FILENAME = "transcript.txt"
+TRANSCRIPT_FILENAMES = (BIN_FILENAME, JSON_FILENAME, TXT_FILENAME)
+
+# transcript.bin layout (little-endian, every section 8-byte aligned so the
+# columns can be cast in place from a memory map):
+#   header    magic b'YTTS', version u32, segment count u64, text size u64
+#   starts    count x float64
+#   durations count x float64
+#   offsets   (count + 1) x uint64 byte offsets into the text blob
+#   text      UTF-8 segment texts, concatenated
+MAGIC = b'YTTS'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQ')
+
+def encode_transcript_bin(transcript: List[Dict]) -> bytes:
+    """Encode transcript segments in the columnar transcript.bin format."""
+    starts = array('d', (float(segment['start']) for segment in transcript))
+    durations = array('d', (float(segment.get('duration', 0.0)) for segment in transcript))
+    offsets = array('Q', [0])
+    texts = []
+    for segment in transcript:
+        encoded = segment['text'].encode('utf-8')
+        texts.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+
+    header = HEADER.pack(MAGIC, VERSION, len(starts), offsets[-1])
+    if sys.byteorder == 'big':
+        for column in (starts, durations, offsets):
+            column.byteswap()
+    return b''.join([header, starts.tobytes(), durations.tobytes(), offsets.tobytes()] + texts)
+
+def write_transcript_bin(path: str, transcript: List[Dict]):
+    """Write transcript segments to a columnar file atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_transcript_bin(transcript))
+    os.replace(tmp_path, path)
+
+class TranscriptFile:
+    """Read-only, memory-mapped view of a transcript.bin file.
+
+    Behaves like a list of {'text', 'start', 'duration'} dicts, but segments
+    are only decoded when accessed; start/duration columns can be read
+    without touching the text at all.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._views: List[memoryview] = []
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files can't be mapped
+            self._file.close()
+            raise ValueError(f"Not a transcript file: {path}")
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"Truncated transcript file: {path}")
+        magic, version, count, text_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a transcript file (or unsupported version): {path}")
+        pos = HEADER.size
+        column = 8 * count
+        if len(self._mmap) != pos + 3 * column + 8 + text_size:
+            self.close()
+            raise ValueError(f"Truncated or corrupt transcript file: {path}")
+        self._count = count
+
+        view = memoryview(self._mmap)
+        self._views.append(view)
+        if sys.byteorder == 'little':
+            self.starts = self._cast(view[pos:pos + column], 'd')
+            self.durations = self._cast(view[pos + column:pos + 2 * column], 'd')
+            self._offsets = self._cast(view[pos + 2 * column:pos + 3 * column + 8], 'Q')
+        else:
+            self.starts = self._swapped(view[pos:pos + column], 'd')
+            self.durations = self._swapped(view[pos + column:pos + 2 * column], 'd')
+            self._offsets = self._swapped(view[pos + 2 * column:pos + 3 * column + 8], 'Q')
+        self._text = view[pos + 3 * column + 8:]
+        self._views.append(self._text)
+        if self._offsets[0] != 0 or self._offsets[count] != text_size:
+            self.close()
+            raise ValueError(f"Corrupt transcript file: {path}")
+
+    def _cast(self, view: memoryview, fmt: str) -> memoryview:
+        cast = view.cast(fmt)
+        self._views.extend([view, cast])
+        return cast
+
+    def _swapped(self, view: memoryview, fmt: str) -> array:
+        column = array(fmt, view.tobytes())
+        column.byteswap()
+        view.release()
+        return column
+
+    def __len__(self) -> int:
+        return self._count
+
+    def text(self, index: int) -> str:
+        """Decode one segment's text."""
+        return str(self._text[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("segment index out of range")
+        return {"text": self.text(index), "start": self.starts[index], "duration": self.durations[index]}
+
+    def __iter__(self) -> Iterator[Dict]:
+        for text, start, duration in zip(self.texts(), self.starts.tolist(), self.durations.tolist()):
+            yield {"text": text, "start": start, "duration": duration}
+
+    def rows(self) -> Iterator[SegmentRow]:
+        """Iterate (text, start, duration) rows, read from the columns without building dicts."""
+        return zip(self.texts(), self.starts.tolist(), self.durations.tolist())
+
+    def texts(self) -> Iterator[str]:
+        """Iterate segment texts only."""
+        offsets = self._offsets.tolist()
+        blob = str(self._text, 'utf-8')
+        if len(blob) == offsets[-1]:
+            # ASCII-only: byte offsets are character offsets, so decode once and slice
+            for start, end in zip(offsets, offsets[1:]):
+                yield blob[start:end]
+        else:
+            text = self._text
+            for start, end in zip(offsets, offsets[1:]):
+                yield str(text[start:end], 'utf-8')
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def transcript_source(video_dir: str) -> str:
+    """Path of the file a video's segments are read from: transcript.bin, else .json, else .txt."""
+    for filename in (BIN_FILENAME, JSON_FILENAME):
+        path = os.path.join(video_dir, filename)
+        if os.path.exists(path):
+            return path
+    return os.path.join(video_dir, TXT_FILENAME)
+
+def interrupted_transcript_files(video_dir: str) -> List[str]:
+    """Transcript files an interrupted artifact commit may have left out of step with the rest."""
+    return [name for name in pending_artifacts(video_dir) if name in TRANSCRIPT_FILENAMES]
+
+def _iter_and_close(transcript: TranscriptFile) -> Iterator[Dict]:
+    with transcript:
+        yield from transcript
+
+def _iter_rows_and_close(transcript: TranscriptFile) -> Iterator[SegmentRow]:
+    with transcript:
+        yield from transcript.rows()
+
+def iter_segments(video_dir: str) -> Optional[Iterator[Dict]]:
+    """Iterate a video directory's transcript segments, or None if it has neither transcript file.
+
+    transcript.bin is preferred and decoded lazily from its memory map, one
+    segment at a time; a truncated or corrupt one falls back to transcript.json.
+    """
+    transcript = _open_transcript(video_dir)
+    if isinstance(transcript, TranscriptFile):
+        return _iter_and_close(transcript)
+    return iter(transcript) if transcript is not None else None
+
+def iter_segment_rows(video_dir: str) -> Optional[Iterator[SegmentRow]]:
+    """Like iter_segments, but yield (text, start, duration) rows.
+
+    Rows of a transcript.bin come straight from its columns, which reads
+    several times faster than building a dict per segment.
+    """
+    transcript = _open_transcript(video_dir)
+    if isinstance(transcript, TranscriptFile):
+        return _iter_rows_and_close(transcript)
+    return segment_rows(transcript) if transcript is not None else None
+
+def _open_transcript(video_dir: str) -> Optional[Union[TranscriptFile, List[Dict]]]:
+    """Open transcript.bin, else load transcript.json; None if the directory has neither."""
+    bin_path = os.path.join(video_dir, BIN_FILENAME)
+    json_path = os.path.join(video_dir, JSON_FILENAME)
+    if os.path.exists(bin_path):
+        try:
+            return TranscriptFile(bin_path)
+        except (OSError, ValueError) as e:
+            if not os.path.exists(json_path):
+                raise
+            print(f"Warning: Reading {json_path} instead of unreadable {BIN_FILENAME}: {str(e)}")
+    if os.path.exists(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return None
+
+def convert_video_dir(video_dir: str, force: bool = False) -> bool:
+    """Write transcript.bin from transcript.json if missing or out of date."""
+    json_path = os.path.join(video_dir, JSON_FILENAME)
+    bin_path = os.path.join(video_dir, BIN_FILENAME)
+    if not os.path.exists(json_path):
+        return False
+    if not force and os.path.exists(bin_path) and os.path.getmtime(bin_path) >= os.path.getmtime(json_path):
+        return False
+    with open(json_path, 'r', encoding='utf-8') as f:
+        write_transcript_bin(bin_path, json.load(f))
+    return True
+
+def main():
+    """Convert every transcript.json under an output directory to transcript.bin."""
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "output"
+    converted = 0
+    json_bytes = bin_bytes = 0
+    for video_dir in get_index(output_dir).video_dirs():
+        try:
+            if convert_video_dir(video_dir):
+                converted += 1
+                print(f"Converted {video_dir}")
+        except Exception as e:
+            print(f"Error converting {video_dir}: {str(e)}")
+            continue
+        if os.path.exists(os.path.join(video_dir, BIN_FILENAME)) and os.path.exists(os.path.join(video_dir, JSON_FILENAME)):
+            json_bytes += os.path.getsize(os.path.join(video_dir, JSON_FILENAME))
+            bin_bytes += os.path.getsize(os.path.join(video_dir, BIN_FILENAME))
+    print(f"Converted {converted} transcripts ({json_bytes:,} bytes JSON -> {bin_bytes:,} bytes binary)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+INDEX_FILENAME = ".video_index.sqlite"
+# Cross-video topic notes (topic_clusters.py) live next to the video directories
+TOPICS_DIRNAME = "topics"
+
+# Video ID at the end of transcript_extractor's "<title>_<id>" directory names
+DIR_VIDEO_ID_PATTERN = re.compile(r'(?:^|_)([a-zA-Z0-9_-]{11})$')
+MD_VIDEO_ID_PATTERN = re.compile(r'## Video ID\s*\n+([^\n]+)')
+MD_TITLE_PATTERN = re.compile(r'## Title\s*\n+([^\n]+)')
+
+def file_mtimes(dir_path: str) -> Dict[str, int]:
+    """Return {filename: mtime_ns} for the files in a video directory."""
+    with os.scandir(dir_path) as entries:
+        return {e.name: e.stat().st_mtime_ns for e in entries if e.is_file()}
+
+def video_dir_names(output_dir: str) -> List[str]:
+    """Names of the candidate video directories in output/ (no topic notes or hidden state)."""
+    with os.scandir(output_dir) as entries:
+        return [e.name for e in entries if e.is_dir() and e.name != TOPICS_DIRNAME and not e.name.startswith('.')]
+
+def info_mtime(dir_path: str) -> float:
+    """Modification time of a directory's video_info.md, 0 if it has none."""
+    md_path = os.path.join(dir_path, "video_info.md")
+    return os.path.getmtime(md_path) if os.path.exists(md_path) else 0.0
+
+def read_video_info(dir_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (video_id, title) from a directory's video_info.md or its name."""
+    video_id = title = None
+    md_path = os.path.join(dir_path, "video_info.md")
+    if os.path.exists(md_path):
+        with open(md_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        id_match = MD_VIDEO_ID_PATTERN.search(content)
+        title_match = MD_TITLE_PATTERN.search(content)
+        video_id = id_match.group(1).strip() if id_match else None
+        title = title_match.group(1).strip() if title_match else None
+    if not video_id:
+        name_match = DIR_VIDEO_ID_PATTERN.search(os.path.basename(dir_path))
+        video_id = name_match.group(1) if name_match else None
+    return video_id, title
+
+class VideoIndex:
+    """Persistent video ID -> output directory index stored in SQLite under output/.
+
+    Each entry records the directory name, title and file mtimes. Every
+    update is its own transaction, so lookups and writes stay constant-time
+    and atomic however many videos are in output/. entries() and lookup
+    misses first sync with directories added or removed outside the
+    pipeline (see sync()). Directories left out of the index (duplicates or
+    no video ID) are recorded too, so they are reported once rather than by
+    every process.
+    """
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = output_dir
+        self.pid = os.getpid()
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, INDEX_FILENAME)
+        is_new = not os.path.exists(path)
+
+        self._lock = threading.Lock()
+        # output/ mtime at the last sync
+        self._synced_mtime: Optional[int] = None
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                dir TEXT NOT NULL UNIQUE,
+                title TEXT,
+                files TEXT NOT NULL,
+                updated REAL NOT NULL
+            )""")
+        # Directories not indexed, with the video_info.md mtime they were reported at
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS skipped (
+                dir TEXT PRIMARY KEY,
+                info_mtime REAL NOT NULL
+            )""")
+        self._conn.commit()
+        if is_new:
+            self.rebuild()
+
+    def lookup(self, video_id: str) -> Optional[str]:
+        """Return the output directory path for a video ID, if it still exists.
+
+        A miss syncs first (one stat of output/ when nothing changed), so a
+        directory created by another process or by hand is found rather than
+        duplicated.
+        """
+        dir_path = self._lookup(video_id)
+        if dir_path is None:
+            self.sync()
+            dir_path = self._lookup(video_id)
+        return dir_path
+
+    def _lookup(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT dir FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+        if not row:
+            return None
+        dir_path = os.path.join(self.output_dir, row[0])
+        return dir_path if os.path.isdir(dir_path) else None
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """Return the full index entry for a video ID."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dir, title, files, updated FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+        if not row:
+            return None
+        return {"dir": row[0], "title": row[1], "files": json.loads(row[2]), "updated": row[3]}
+
+    def update(self, video_id: str, dir_path: str, title: Optional[str] = None):
+        """Record (or move) a video's directory and refresh its file mtimes."""
+        name = os.path.basename(os.path.normpath(dir_path))
+        files = json.dumps(file_mtimes(dir_path))
+        with self._lock, self._conn:
+            # A directory belongs to exactly one video
+            self._conn.execute("DELETE FROM videos WHERE dir = ? AND video_id != ?", (name, video_id))
+            self._conn.execute("""
+                INSERT INTO videos (video_id, dir, title, files, updated) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    dir = excluded.dir,
+                    title = COALESCE(excluded.title, videos.title),
+                    files = excluded.files,
+                    updated = excluded.updated""",
+                (video_id, name, title, files, time.time()))
+
+    def refresh_dir(self, dir_path: str):
+        """Refresh the recorded file mtimes for an indexed directory."""
+        name = os.path.basename(os.path.normpath(dir_path))
+        files = json.dumps(file_mtimes(dir_path))
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE videos SET files = ?, updated = ? WHERE dir = ?",
+                               (files, time.time(), name))
+
+    def remove(self, video_id: str):
+        """Drop a video from the index."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,))
+
+    def entries(self) -> List[Tuple[str, str, Optional[str]]]:
+        """Return (video_id, directory path, title) for every indexed video."""
+        self.sync()
+        with self._lock:
+            rows = self._conn.execute("SELECT video_id, dir, title FROM videos ORDER BY dir").fetchall()
+        return [(video_id, os.path.join(self.output_dir, name), title) for video_id, name, title in rows]
+
+    def video_dirs(self) -> List[str]:
+        """Return the directory path of every indexed video."""
+        return [dir_path for _, dir_path, _ in self.entries()]
+
+    def sync(self):
+        """Index video directories added to output/ outside the pipeline and drop deleted ones.
+
+        Nothing is read unless output/'s mtime changed since the last sync;
+        then output/ is listed once and only directories the index doesn't
+        know yet have their video_info.md read. Directories already reported
+        as skipped are read again only if their video_info.md changed.
+        """
+        try:
+            mtime = os.stat(self.output_dir).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._synced_mtime:
+            return
+        # Recorded before listing, so a directory created during the scan triggers another sync
+        self._synced_mtime = mtime
+        on_disk = set(video_dir_names(self.output_dir))
+        with self._lock:
+            indexed = dict(self._conn.execute("SELECT dir, video_id FROM videos").fetchall())
+            skipped = dict(self._conn.execute("SELECT dir, info_mtime FROM skipped").fetchall())
+
+        removed = [(name,) for name in indexed if name not in on_disk]
+        gone = [(name,) for name in skipped if name not in on_disk]
+        if removed or gone:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM videos WHERE dir = ?", removed)
+                self._conn.executemany("DELETE FROM skipped WHERE dir = ?", gone)
+        for name in sorted(on_disk - set(indexed)):
+            dir_path = os.path.join(self.output_dir, name)
+            mtime = info_mtime(dir_path)
+            if skipped.get(name) == mtime:
+                continue
+            video_id, title = read_video_info(dir_path)
+            if not video_id:
+                print(f"Warning: No video ID found for {dir_path}, not indexed")
+                self._skip([(name, mtime)])
+                continue
+            current = self._lookup(video_id)
+            if current and info_mtime(current) >= mtime:
+                print(f"Warning: Duplicate directories for {video_id}, using {current} over {dir_path}")
+                self._skip([(name, mtime)])
+                continue
+            if current:
+                print(f"Warning: Duplicate directories for {video_id}, using {dir_path} over {current}")
+                self._skip([(os.path.basename(current), info_mtime(current))])
+            self.update(video_id, dir_path, title)
+            if name in skipped:
+                with self._lock, self._conn:
+                    self._conn.execute("DELETE FROM skipped WHERE dir = ?", (name,))
+
+    def _skip(self, rows: List[Tuple[str, float]]):
+        """Record (directory name, video_info.md mtime) of directories left out of the index."""
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO skipped (dir, info_mtime) VALUES (?, ?)", rows)
+
+    def rebuild(self):
+        """Rebuild the index by scanning output/ once, replacing it in a single transaction.
+
+        When several directories claim the same video ID, the one with the most
+        recently modified video_info.md wins and the others are reported. An
+        interrupted rebuild leaves the previous index untouched.
+        """
+        found: Dict[str, Tuple[float, str, Optional[str]]] = {}
+        skipped: List[Tuple[str, float]] = []
+        for name in video_dir_names(self.output_dir):
+            dir_path = os.path.join(self.output_dir, name)
+            video_id, title = read_video_info(dir_path)
+            mtime = info_mtime(dir_path)
+            if not video_id:
+                print(f"Warning: No video ID found for {dir_path}, not indexed")
+                skipped.append((name, mtime))
+                continue
+            if video_id in found:
+                kept, dropped = sorted([found[video_id], (mtime, dir_path, title)], reverse=True)
+                print(f"Warning: Duplicate directories for {video_id}, using {kept[1]} over {dropped[1]}")
+                found[video_id] = kept
+                skipped.append((os.path.basename(dropped[1]), dropped[0]))
+            else:
+                found[video_id] = (mtime, dir_path, title)
+
+        now = time.time()
+        rows = [(video_id, os.path.basename(dir_path), title, json.dumps(file_mtimes(dir_path)), now)
+                for video_id, (_, dir_path, title) in found.items()]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM videos")
+            self._conn.executemany(
+                "INSERT INTO videos (video_id, dir, title, files, updated) VALUES (?, ?, ?, ?, ?)", rows)
+            # Already reported; sync() leaves them alone
+            self._conn.execute("DELETE FROM skipped")
+            self._conn.executemany("INSERT INTO skipped (dir, info_mtime) VALUES (?, ?)", skipped)
+        self._synced_mtime = None
+
+_indexes: Dict[str, VideoIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_index(output_dir: str = "output") -> VideoIndex:
+    """Return the process-wide index for an output directory, opening it on first use.
+
+    Forked worker processes open their own connection instead of reusing the parent's.
+    """
+    with _indexes_lock:
+        if output_dir not in _indexes or _indexes[output_dir].pid != os.getpid():
+            _indexes[output_dir] = VideoIndex(output_dir)
+        return _indexes[output_dir]
+
+def main():
+    """Inspect or rebuild the video index."""
+    parser = argparse.ArgumentParser(description="Video ID -> output directory index.")
+    parser.add_argument('--output-dir', default="output")
+    parser.add_argument('--rebuild', action='store_true', help="rescan output/ and rebuild the index")
+    parser.add_argument('video_id', nargs='?', help="print the directory for this video ID")
+    args = parser.parse_args()
+
+    index = get_index(args.output_dir)
+    if args.rebuild:
+        index.rebuild()
+    if args.video_id:
+        entry = index.get(args.video_id)
+        if not entry:
+            print(f"Video {args.video_id} is not indexed")
+            return
+        print(json.dumps(entry, indent=2, ensure_ascii=False))
+    else:
+        print(f"{len(index.entries())} videos indexed in {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
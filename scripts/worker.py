@@ -0,0 +1,265 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from bulk_ingest import HostRateLimiter, ingest_video, read_urls
+from http_client import get_client
+from job_queue import FAILED, RUNNING, STATES, get_job_queue
+from metadata_cache import get_cache
+from pipeline_metrics import METRICS_FILENAME, append_records, start_video_metrics
+from sentence_ranker import RANKERS, require_numpy
+from summarize_transcript import (
+    DEFAULT_THRESHOLD, list_video_dirs, stale_video_dirs, summarize_video_dir, summary_options
+)
+from summary_manifest import SummaryManifest
+from taxonomy import get_taxonomy
+from transcript_extractor import OEMBED_ENDPOINT, fetch_transcript, get_video_id
+
+DEFAULT_CONCURRENCY = 4
+# How often idle workers check the queue for new jobs
+DEFAULT_POLL_SECONDS = 0.25
+
+class PipelineWorker:
+    """Resident worker that downloads and summarizes queued videos.
+
+    Imports, compiled patterns, keyword tables, the HTTP session and the
+    metadata cache are set up once and stay warm for every job, so a job's
+    latency is essentially its fetch and summarize time. Edited taxonomy
+    profiles are picked up without a restart: when the queue is idle, the
+    videos a changed profile affects are re-scored.
+    """
+
+    def __init__(self, output_dir: str = "output", concurrency: int = DEFAULT_CONCURRENCY,
+                 options: Optional[Dict] = None, requests_per_second: float = 5.0,
+                 poll_seconds: float = DEFAULT_POLL_SECONDS,
+                 transcript_provider: Callable[[str], List[Dict]] = fetch_transcript,
+                 oembed_endpoint: str = OEMBED_ENDPOINT):
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        self.options = options or summary_options()
+        self.poll_seconds = poll_seconds
+        self.queue = get_job_queue(output_dir)
+        self.limiter = HostRateLimiter(requests_per_second)
+        self.transcript_provider = transcript_provider
+        self.oembed_endpoint = oembed_endpoint
+        self.stop_event = threading.Event()
+        # Manifest and metrics file are shared by all worker threads
+        self._files_lock = threading.Lock()
+        # Taxonomy version whose stale videos have been re-scored
+        self.taxonomy_version = get_taxonomy().version
+        self._taxonomy_lock = threading.Lock()
+
+    def process(self, job_id: int, url: str):
+        """Run one job through the pipeline and record the outcome in the queue."""
+        metrics = start_video_metrics()
+        output_dir = None
+        try:
+            with metrics.stage('ingest'):
+                output_dir = ingest_video(url, self.limiter, self.transcript_provider, self.oembed_endpoint)
+            fingerprint, config_hash = summarize_video_dir(output_dir, self.options)
+            with self._files_lock:
+                manifest = SummaryManifest(self.output_dir)
+                manifest.record(output_dir, config_hash, fingerprint)
+                manifest.save()
+            error = None
+        except Exception as e:
+            error = str(e)
+        record = metrics.record(os.path.basename(output_dir or url), job=job_id, url=url, error=error)
+        self.queue.finish(job_id, output_dir, error, record)
+        with self._files_lock:
+            append_records(os.path.join(self.output_dir, METRICS_FILENAME), [record])
+        if error:
+            print(f"[job {job_id}] Failed {url}: {error}", file=sys.stderr)
+        else:
+            print(f"[job {job_id}] Done {url} -> {output_dir} in {record['total_seconds']:.2f}s")
+
+    def rescore(self, video_dir_path: str):
+        """Re-summarize an already ingested video and record it in the manifest."""
+        metrics = start_video_metrics()
+        try:
+            fingerprint, config_hash = summarize_video_dir(video_dir_path, self.options)
+            error = None
+        except Exception as e:
+            error = str(e)
+        record = metrics.record(os.path.basename(video_dir_path), rescore=True, error=error)
+        with self._files_lock:
+            if not error:
+                manifest = SummaryManifest(self.output_dir)
+                manifest.record(video_dir_path, config_hash, fingerprint)
+                manifest.save()
+            append_records(os.path.join(self.output_dir, METRICS_FILENAME), [record])
+        if error:
+            print(f"[taxonomy] Failed to re-score {video_dir_path}: {error}", file=sys.stderr)
+
+    def rescore_taxonomy_changes(self):
+        """Re-score the videos made stale by taxonomy edits since the last check.
+
+        Only one thread does the re-scoring; the others go back to the queue.
+        """
+        taxonomy = get_taxonomy()
+        taxonomy.refresh()
+        if taxonomy.version == self.taxonomy_version or not self._taxonomy_lock.acquire(blocking=False):
+            return
+        try:
+            while taxonomy.version != self.taxonomy_version and not self.stop_event.is_set():
+                self.taxonomy_version = taxonomy.version
+                with self._files_lock:
+                    manifest = SummaryManifest(self.output_dir)
+                stale = stale_video_dirs(list_video_dirs(self.output_dir), manifest, self.options)
+                if stale:
+                    print(f"[taxonomy] Profiles changed; re-scoring {len(stale)} affected videos")
+                for video_dir_path in stale:
+                    if self.stop_event.is_set():
+                        break
+                    self.rescore(video_dir_path)
+                taxonomy.refresh()
+        finally:
+            self._taxonomy_lock.release()
+
+    def _run_thread(self, exit_when_idle: bool):
+        while not self.stop_event.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self.rescore_taxonomy_changes()
+                if exit_when_idle:
+                    return
+                self.stop_event.wait(self.poll_seconds)
+                continue
+            job_id, url, _ = job
+            self.process(job_id, url)
+
+    def run(self, exit_when_idle: bool = False):
+        """Process jobs until stopped (Ctrl+C), or until the queue is empty with exit_when_idle.
+
+        Jobs left 'running' by a previous worker that was killed are requeued
+        first, so only one worker should serve an output directory at a time.
+        """
+        stale = self.queue.requeue(RUNNING)
+        if stale:
+            print(f"Requeued {stale} interrupted jobs")
+        # Warm the shared HTTP session and cache before the first job arrives
+        get_client()
+        get_cache()
+
+        threads = [threading.Thread(target=self._run_thread, args=(exit_when_idle,), daemon=True)
+                   for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            print("Stopping after the jobs in progress...")
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def format_status(output_dir: str = "output", limit: int = 20, status: Optional[str] = None) -> str:
+    """Queue counts, latency percentiles of finished jobs and the most recent jobs."""
+    queue = get_job_queue(output_dir)
+    counts = queue.counts()
+    lines = ["Jobs: " + ", ".join(f"{counts[state]} {state}" for state in STATES)]
+
+    latencies = queue.latencies()
+    if latencies:
+        waits = [wait for wait, _ in latencies]
+        runs = [run for _, run in latencies]
+        totals = [wait + run for wait, run in latencies]
+        lines.append(f"Latency over the last {len(latencies)} finished jobs (p50 / p95):")
+        for name, values in (("queue wait", waits), ("processing", runs), ("enqueue->done", totals)):
+            lines.append(f"  {name:14} {_percentile(values, 0.5):8.2f}s {_percentile(values, 0.95):8.2f}s")
+
+    now = time.time()
+    for job in queue.jobs(limit, status):
+        if job["finished"]:
+            timing = f"{job['finished'] - job['enqueued']:.2f}s"
+        elif job["started"]:
+            timing = f"running {now - job['started']:.0f}s"
+        else:
+            timing = f"waiting {now - job['enqueued']:.0f}s"
+        line = f"  #{job['id']:<5} {job['status']:8} {timing:>14}  {job['url']}"
+        if job["error"]:
+            line += f"  ({job['error']})"
+        lines.append(line)
+    return "\n".join(lines)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Resident download + summarize worker with a durable job queue.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="queue videos for the worker")
+    enqueue.add_argument('urls', nargs='*', help="YouTube URLs or video IDs")
+    enqueue.add_argument('--file', help="file with one URL or video ID per line ('-' for stdin)")
+
+    run = commands.add_parser('run', help="process queued jobs until stopped")
+    run.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                     help=f"jobs processed at once (default: {DEFAULT_CONCURRENCY})")
+    run.add_argument('--rate', type=float, default=5.0,
+                     help="maximum requests per second to each host, 0 for unlimited (default: 5)")
+    run.add_argument('--poll', type=float, default=DEFAULT_POLL_SECONDS,
+                     help=f"seconds between queue checks when idle (default: {DEFAULT_POLL_SECONDS})")
+    run.add_argument('--exit-when-idle', action='store_true', help="stop once the queue is empty")
+    run.add_argument('--ranker', choices=RANKERS, default="keywords", help="sentence ranking backend")
+    run.add_argument('--dedup-threshold', type=float, default=DEFAULT_THRESHOLD,
+                     help=f"near-duplicate key point threshold, 0 to keep duplicates (default: {DEFAULT_THRESHOLD})")
+    run.add_argument('--chapter-minutes', type=float, default=0, help="chapter window length (default: off)")
+
+    status = commands.add_parser('status', help="show queue counts, latency and recent jobs")
+    status.add_argument('--limit', type=int, default=20)
+    status.add_argument('--state', choices=STATES, help="only list jobs in this state")
+
+    commands.add_parser('retry', help="requeue failed jobs")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        if args.chapter_minutes < 0:
+            parser.error("--chapter-minutes must not be negative")
+        if args.dedup_threshold <= 0:
+            args.dedup_threshold = None
+        elif args.dedup_threshold > 1:
+            parser.error("--dedup-threshold must be between 0 and 1")
+    return args
+
+def main():
+    """Queue videos, run the worker, or inspect the queue."""
+    args = parse_args()
+    output_dir = "output"
+    queue = get_job_queue(output_dir)
+
+    if args.command == 'enqueue':
+        urls = list(args.urls)
+        if args.file == '-':
+            urls += read_urls(sys.stdin)
+        elif args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                urls += read_urls(f)
+        for url in urls:
+            video_id = get_video_id(url)
+            if not video_id:
+                print(f"Skipping {url}: could not extract video ID", file=sys.stderr)
+                continue
+            job_id = queue.enqueue(url, video_id)
+            print(f"Queued {url} as job {job_id}" if job_id else f"Already queued: {url}")
+    elif args.command == 'run':
+        require_numpy(args.ranker)
+        options = summary_options(args.ranker, args.dedup_threshold, args.chapter_minutes)
+        worker = PipelineWorker(output_dir, args.concurrency, options, args.rate, args.poll)
+        print(f"Worker serving {output_dir} with {worker.concurrency} threads; Ctrl+C to stop")
+        worker.run(args.exit_when_idle)
+        print(format_status(output_dir, limit=0))
+    elif args.command == 'status':
+        print(format_status(output_dir, args.limit, args.state))
+    elif args.command == 'retry':
+        print(f"Requeued {queue.requeue(FAILED)} failed jobs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""ArtifactWriter commits, their pending marker and the DirectoryLock that serializes them."""
+import os
+import threading
+
+import pytest
+
+import artifact_writer
+from artifact_writer import LOCK_FILENAME, ArtifactWriter, DirectoryLock, pending_artifacts
+from transcript_store import interrupted_transcript_files
+
+def read_file(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_commit_writes_every_artifact(tmp_path):
+    writer = ArtifactWriter(str(tmp_path / "video"))
+    writer.add_text("key_points.txt", "text")
+    writer.add_json("key_points.json", {"a": 1})
+    writer.add_bytes("transcript.bin", b"\x00\x01")
+    assert writer.commit() == len("text") + len('{"a": 1}') + 2
+    assert sorted(os.listdir(tmp_path / "video")) == ["key_points.json", "key_points.txt", "transcript.bin"]
+    assert writer.commit() == 0
+
+def test_taken_over_lock_is_not_released_by_its_old_holder(tmp_path, monkeypatch):
+    lock_path = tmp_path / LOCK_FILENAME
+    first = DirectoryLock(str(tmp_path))
+    first.__enter__()
+    # The first holder looks crashed: its lock is older than the stale limit
+    monkeypatch.setattr(artifact_writer, 'STALE_LOCK_SECONDS', -1.0)
+    second = DirectoryLock(str(tmp_path)).__enter__()
+    assert lock_path.read_text() == second.token != first.token
+
+    first.__exit__(None, None, None)
+    assert lock_path.read_text() == second.token
+    second.__exit__(None, None, None)
+    assert not lock_path.exists()
+
+def test_locked_readers_see_one_commit(tmp_path):
+    dir_path = str(tmp_path)
+    ArtifactWriter(dir_path).commit()
+    errors = []
+
+    def write(worker: int):
+        for i in range(50):
+            writer = ArtifactWriter(dir_path)
+            writer.add_text("transcript.txt", f"{worker}.{i}")
+            writer.add_text("video_info.md", f"{worker}.{i}")
+            writer.commit()
+
+    def read():
+        for _ in range(200):
+            with DirectoryLock(dir_path):
+                contents = [read_file(os.path.join(dir_path, name)) for name in ("transcript.txt", "video_info.md")]
+            if contents[0] != contents[1]:
+                errors.append(contents)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    threads.append(threading.Thread(target=read))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(os.listdir(dir_path)) == ["transcript.txt", "video_info.md"]
+
+def test_interrupted_commit_leaves_a_pending_marker(tmp_path, monkeypatch):
+    dir_path = str(tmp_path)
+    names = ["transcript.txt", "transcript.json", "video_info.md"]
+    writer = ArtifactWriter(dir_path)
+    for name in names:
+        writer.add_text(name, "old")
+    writer.commit()
+    assert pending_artifacts(dir_path) == []
+
+    # Crash between renames: the transcript files are new, the note is still old
+    replace = os.replace
+
+    def crashing_replace(src, dst):
+        if os.path.basename(dst) == "video_info.md":
+            raise KeyboardInterrupt
+        replace(src, dst)
+    monkeypatch.setattr(os, 'replace', crashing_replace)
+    for name in names:
+        writer.add_text(name, "new")
+    with pytest.raises(KeyboardInterrupt):
+        writer.commit()
+    monkeypatch.setattr(os, 'replace', replace)
+    assert pending_artifacts(dir_path) == sorted(names)
+    assert read_file(os.path.join(dir_path, "video_info.md")) == "old"
+    assert interrupted_transcript_files(dir_path) == ["transcript.json", "transcript.txt"]
+
+    # Rewriting the note alone keeps the transcript files pending; rewriting them clears the marker
+    writer = ArtifactWriter(dir_path)
+    writer.add_text("video_info.md", "note")
+    writer.commit()
+    assert pending_artifacts(dir_path) == ["transcript.json", "transcript.txt"]
+    writer.add_text("transcript.txt", "text")
+    writer.add_text("transcript.json", "json")
+    writer.commit()
+    assert pending_artifacts(dir_path) == []
+    assert sorted(os.listdir(dir_path)) == sorted(names)
@@ -0,0 +1,169 @@
+"""bulk_ingest against a local oEmbed stub server and a fake transcript provider."""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import pytest
+
+pytest.importorskip("requests")
+
+import bulk_ingest
+import metadata_cache
+import search_index
+import video_index
+
+# Video IDs the stub server answers with 404, and the fake provider fails for
+MISSING_TITLE_ID = "NOTITLE0000"
+NO_CAPTIONS_ID = "NOCAPTIONS0"
+
+def video_urls(count: int) -> List[str]:
+    return [f"https://youtu.be/VIDEO{i:06d}" for i in range(count)]
+
+class OEmbedStub(BaseHTTPRequestHandler):
+    """Answers oEmbed requests with a title derived from the video ID."""
+
+    def do_GET(self):
+        server = self.server
+        video_id = self.path.split('v=')[-1].split('&')[0]
+        with server.lock:
+            server.hits.append((time.monotonic(), video_id))
+        if video_id == MISSING_TITLE_ID:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = json.dumps({"title": f"Title {video_id}", "author_name": "Stub Channel"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FakeProvider:
+    """Transcript provider that records calls and how many run at once."""
+
+    def __init__(self, delay: float = 0.0, failing: tuple = (NO_CAPTIONS_ID,)):
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls: List[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, video_id: str) -> List[Dict]:
+        with self.lock:
+            self.calls.append(video_id)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if video_id in self.failing:
+                raise RuntimeError("no captions")
+            return [{"text": f"hello from {video_id}", "start": 1.0, "duration": 2.0}]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+@pytest.fixture
+def oembed_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OEmbedStub)
+    server.hits = []
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.endpoint = f"http://127.0.0.1:{server.server_port}/oembed"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    """Run in an empty directory with fresh per-process caches and indexes."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(metadata_cache, '_default_cache', None)
+    monkeypatch.setattr(video_index, '_indexes', {})
+    monkeypatch.setattr(search_index, '_indexes', {})
+    return tmp_path / "output"
+
+def test_concurrency_limit(oembed_server):
+    provider = FakeProvider(delay=0.05)
+    results = bulk_ingest.ingest_all(video_urls(12), concurrency=3, requests_per_second=0,
+                                     transcript_provider=provider, oembed_endpoint=oembed_server.endpoint)
+    assert [error for _, _, error in results] == [None] * 12
+    assert 1 < provider.max_active <= 3
+
+def test_rate_limit_per_host(oembed_server):
+    bulk_ingest.ingest_all(video_urls(6), concurrency=6, requests_per_second=20,
+                           transcript_provider=FakeProvider(), oembed_endpoint=oembed_server.endpoint)
+    times = sorted(hit for hit, _ in oembed_server.hits)
+    assert len(times) == 6
+    # 20 requests/sec per host: consecutive requests at least ~50ms apart
+    assert min(b - a for a, b in zip(times, times[1:])) >= 0.04
+
+def test_failure_isolation(oembed_server, output_dir):
+    urls = video_urls(4) + [f"https://youtu.be/{NO_CAPTIONS_ID}", MISSING_TITLE_ID, "not a video url"]
+    results = {url: (video_dir, error) for url, video_dir, error in bulk_ingest.ingest_all(
+        urls, concurrency=4, requests_per_second=0,
+        transcript_provider=FakeProvider(), oembed_endpoint=oembed_server.endpoint)}
+
+    assert results[f"https://youtu.be/{NO_CAPTIONS_ID}"] == (None, "no captions")
+    assert results["not a video url"][1].startswith("Could not extract video ID")
+    # A failed title lookup falls back to a placeholder title instead of failing the video
+    assert results[MISSING_TITLE_ID][1] is None
+    for url in video_urls(4):
+        video_dir, error = results[url]
+        assert error is None
+        for filename in ("transcript.txt", "transcript.json", "video_info.md"):
+            assert os.path.exists(os.path.join(video_dir, filename))
+    assert not any(NO_CAPTIONS_ID in name for name in os.listdir(output_dir))
+
+def test_resume_fetches_only_missing_videos(oembed_server):
+    urls = video_urls(5)
+    first = FakeProvider(failing=("VIDEO000003",))
+    results = bulk_ingest.ingest_all(urls, concurrency=2, requests_per_second=0,
+                                     transcript_provider=first, oembed_endpoint=oembed_server.endpoint)
+    assert sum(1 for _, _, error in results if error) == 1
+    hits_after_first = len(oembed_server.hits)
+
+    second = FakeProvider(failing=())
+    results = bulk_ingest.ingest_all(urls, concurrency=2, requests_per_second=0,
+                                     transcript_provider=second, oembed_endpoint=oembed_server.endpoint)
+    assert [error for _, _, error in results] == [None] * 5
+    assert second.calls == ["VIDEO000003"]
+    # Its title was cached by the first run, so nothing is fetched from oEmbed again
+    assert len(oembed_server.hits) == hits_after_first
+
+    third = FakeProvider()
+    bulk_ingest.ingest_all(urls, concurrency=2, requests_per_second=0, transcript_provider=third,
+                           oembed_endpoint=oembed_server.endpoint, force=True)
+    assert sorted(third.calls) == [f"VIDEO{i:06d}" for i in range(5)]
+
+def test_interrupted_save_is_fetched_again(oembed_server, monkeypatch):
+    urls = video_urls(2)
+    bulk_ingest.ingest_all(urls, concurrency=2, requests_per_second=0,
+                           transcript_provider=FakeProvider(), oembed_endpoint=oembed_server.endpoint)
+
+    # A crash after transcript.json and .bin were replaced leaves the rest from the last save
+    video_dir = video_index.get_index().lookup("VIDEO000001")
+    replace = os.replace
+
+    def crashing_replace(src, dst):
+        if os.path.basename(dst) == "transcript.txt":
+            raise KeyboardInterrupt
+        replace(src, dst)
+    monkeypatch.setattr(os, 'replace', crashing_replace)
+    with pytest.raises(KeyboardInterrupt):
+        bulk_ingest.ingest_video(urls[1], bulk_ingest.HostRateLimiter(0), FakeProvider(), oembed_server.endpoint)
+    monkeypatch.setattr(os, 'replace', replace)
+    assert bulk_ingest.ingested_dir("VIDEO000001") is None
+
+    provider = FakeProvider()
+    bulk_ingest.ingest_all(urls, concurrency=2, requests_per_second=0,
+                           transcript_provider=provider, oembed_endpoint=oembed_server.endpoint)
+    assert provider.calls == ["VIDEO000001"]
+    assert bulk_ingest.ingested_dir("VIDEO000001") == video_dir
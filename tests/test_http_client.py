@@ -0,0 +1,99 @@
+"""HttpClient retries, backoff and timeouts against a local HTTP server."""
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+import http_client
+from http_client import HttpClient
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers with the next status of the server's script; 'slow' sleeps past the client's read timeout."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            step = server.script.pop(0) if server.script else 200
+        if step == 'slow':
+            time.sleep(1.0)
+            step = 200
+        status, _, retry_after = str(step).partition(':')
+        body = b"ok" if status == '200' else b"error"
+        self.send_response(int(status))
+        if retry_after:
+            self.send_header("Retry-After", retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.script = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def delays(monkeypatch) -> List[float]:
+    """Backoff delays the client sleeps for, with jitter pinned to its upper bound."""
+    slept = []
+    monkeypatch.setattr(http_client, 'random', types.SimpleNamespace(uniform=lambda low, high: high))
+    monkeypatch.setattr(http_client, 'time', types.SimpleNamespace(perf_counter=time.perf_counter, sleep=slept.append))
+    return slept
+
+def test_transient_statuses_are_retried_with_backoff(server, delays):
+    server.script = [500, 503, 429]
+    client = HttpClient(max_retries=3, backoff_base=0.5, backoff_max=8.0)
+    response = client.get(server.url)
+    assert response.status_code == 200
+    assert server.requests == 4
+    assert delays == [0.5, 1.0, 2.0]
+    assert (client.stats["requests"], client.stats["retries"], client.stats["failures"]) == (4, 3, 3)
+
+def test_retry_after_is_honoured_up_to_backoff_max(server, delays):
+    server.script = ['429:3', '429:60']
+    client = HttpClient(max_retries=3, backoff_base=0.5, backoff_max=8.0)
+    assert client.get(server.url).status_code == 200
+    assert delays == [3.0, 8.0]
+
+def test_last_response_is_returned_when_retries_run_out(server, delays):
+    server.script = [500] * 10
+    client = HttpClient(max_retries=2, backoff_base=0.5)
+    assert client.get(server.url).status_code == 500
+    assert server.requests == 3
+    assert len(delays) == 2
+
+def test_other_errors_are_not_retried(server, delays):
+    server.script = [404]
+    client = HttpClient(max_retries=3)
+    assert client.get(server.url).status_code == 404
+    assert server.requests == 1
+    assert delays == []
+
+def test_read_timeout_is_retried_then_raised(server, delays):
+    server.script = ['slow', 'slow']
+    client = HttpClient(max_retries=1, timeout=(1.0, 0.2))
+    start = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        client.get(server.url)
+    # Two attempts that each give up after the 0.2s read timeout, not the 1s the server takes
+    assert time.perf_counter() - start < 0.9
+    assert server.requests == 2
+    assert client.stats["failures"] == 1 and client.stats["retries"] == 1
+    assert len(delays) == 1
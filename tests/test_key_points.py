@@ -0,0 +1,109 @@
+"""Bounded-heap key point selection must match the original full sort."""
+import glob
+import json
+import os
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import pytest
+
+import summarize_transcript
+from summarize_transcript import (DISTINCT_POOL_SLACK, extract_key_points_from_segments, extract_key_points_from_texts,
+                                  extract_timed_key_points, iter_candidates, select_distinct_key_points,
+                                  select_key_points, split_sentences)
+from synthetic_transcript import generate_transcript
+from taxonomy import default_scorer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TRANSCRIPTS = sorted(glob.glob(os.path.join(ROOT, 'output', '*', 'transcript.txt')))
+SAMPLE_SEGMENTS = sorted(glob.glob(os.path.join(ROOT, 'output', '*', 'transcript.json')))
+
+def reference_key_points(candidates: List[Tuple[str, int, str]], top_k: int = 3) -> Dict[str, List[str]]:
+    """The pre-heap selection: stable sort by score (highest first), then length (shorter first)."""
+    scored = {category: [] for category in default_scorer().categories}
+    for category, score, sentence in candidates:
+        scored[category].append((score, sentence))
+    return {
+        category: [sentence for _, sentence in sorted(entries, key=lambda x: (-x[0], len(x[1])))[:top_k]]
+        for category, entries in scored.items()
+    }
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_sample_transcripts_match_full_sort(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        candidates = list(iter_candidates(split_sentences(f.read())))
+    assert candidates
+    assert select_key_points(candidates) == reference_key_points(candidates)
+
+@pytest.mark.parametrize('top_k', [1, 3, 10])
+def test_long_synthetic_transcript_matches_full_sort(top_k):
+    transcript = generate_transcript(120)
+    candidates = list(iter_candidates(split_sentences(' '.join(segment['text'] for segment in transcript))))
+    # Plenty of ties on score and length, so the stable-order tie-break is exercised too
+    assert len(candidates) > 1000
+    assert select_key_points(candidates, top_k) == reference_key_points(candidates, top_k)
+
+def joined_key_points(texts: List[str]) -> Dict[str, List[str]]:
+    """The original batch path: join the whole transcript, split it and fully sort the candidates."""
+    return reference_key_points(list(iter_candidates(split_sentences(' '.join(texts)))))
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_streamed_transcript_lines_match_joined_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.rstrip('\n') for line in f]
+    assert extract_key_points_from_texts(lines, dedup_threshold=None) == joined_key_points(lines)
+
+@pytest.mark.parametrize('path', SAMPLE_SEGMENTS, ids=lambda path: os.path.basename(os.path.dirname(path)))
+def test_streamed_segments_match_joined_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        segments = json.load(f)
+    expected = joined_key_points([segment['text'] for segment in segments])
+    assert extract_key_points_from_segments(segments, dedup_threshold=None) == expected
+    timed = extract_timed_key_points(segments, dedup_threshold=None)
+    assert {category: [point['text'] for point in points] for category, points in timed.items()} == expected
+
+def test_streamed_synthetic_segments_match_joined_text():
+    segments = generate_transcript(120)
+    expected = joined_key_points([segment['text'] for segment in segments])
+    assert extract_key_points_from_segments(segments, dedup_threshold=None) == expected
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_distinct_pool_matches_grouping_every_candidate(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        candidates = list(iter_candidates(split_sentences(f.read())))
+    assert select_distinct_key_points(iter(candidates)) == select_distinct_key_points(candidates, pool_size=len(candidates))
+
+def test_distinct_pool_is_grown_when_duplicates_use_it_up():
+    category = default_scorer().categories[0]
+    repeated = "we keep saying the same thing about the training plan over and over again"
+    # More near-duplicate top candidates than the pool holds, then distinct weaker ones
+    candidates = [(category, 10, f"{repeated} {i % 2}") for i in range(200)]
+    candidates += [(category, 5, f"distinct point number {i} about something else entirely") for i in range(5)]
+    selected = select_distinct_key_points(candidates)
+    assert len(selected[category]) == 3
+    assert selected == select_distinct_key_points(candidates, pool_size=len(candidates))
+
+def test_distinct_selection_retains_a_bounded_pool(monkeypatch):
+    categories = default_scorer().categories
+    pool_size = 3 * (len(categories) + DISTINCT_POOL_SLACK)
+    grouped = []
+    groups = summarize_transcript.near_duplicate_groups
+
+    def counting_groups(sentences, threshold):
+        grouped.append(len(sentences))
+        return groups(sentences, threshold)
+    monkeypatch.setattr(summarize_transcript, 'near_duplicate_groups', counting_groups)
+
+    count = 50000
+    candidates = ((categories[i % len(categories)], i % 97, f"candidate sentence number {i} " + "x" * 100)
+                  for i in range(count))
+    tracemalloc.start()
+    try:
+        selected = select_distinct_key_points(candidates)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert all(len(points) == 3 for points in selected.values())
+    assert grouped == [pool_size * len(categories)]
+    # Holding and grouping every candidate peaks near 200 MB
+    assert peak < 2 * 1024 * 1024
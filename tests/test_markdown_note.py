@@ -0,0 +1,72 @@
+"""MarkdownNote must write unedited notes back byte for byte."""
+import glob
+import os
+import threading
+
+import pytest
+
+from markdown_note import MarkdownNote
+from summarize_transcript import apply_summary_to_note
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_NOTES = sorted(glob.glob(os.path.join(ROOT, 'output', '*', 'video_info.md')))
+KEY_POINTS = {"Main Ideas": ["The first point."]}
+CHAPTERS = [{"start": 0.0, "end": 60.0, "key_points": {"Main Ideas": [{"text": "A point.", "start": 5.0, "end": 9.0}]}}]
+
+def read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+@pytest.mark.parametrize('data', [
+    b"---\r\ntags:\r\n  - a\r\n---\r\n# Video\r\n\r\n## Title\r\nHello\r\n\r\n## Notes\r\nmine\r\n",
+    b"# Video\n\n## Title\nHello\n\n## Notes\nno final newline",
+    b"## Title\r\nHello\r\n\r\n## Notes\r\nno final newline",
+    b"## Title\rstray carriage return\n## Notes\nform\x0cfeed and\xe2\x80\xa8line separator\n\n\n",
+], ids=['crlf', 'lf-no-eol', 'crlf-no-eol', 'stray-breaks'])
+def test_load_save_round_trip(tmp_path, data):
+    path = str(tmp_path / "video_info.md")
+    with open(path, 'wb') as f:
+        f.write(data)
+    MarkdownNote.load(path).save(path)
+    assert read_bytes(path) == data
+
+@pytest.mark.parametrize('path', SAMPLE_NOTES, ids=lambda path: os.path.basename(os.path.dirname(path)))
+def test_sample_notes_round_trip(tmp_path, path):
+    copy = str(tmp_path / "video_info.md")
+    MarkdownNote.load(path).save(copy)
+    assert read_bytes(copy) == read_bytes(path)
+
+@pytest.mark.parametrize('path', SAMPLE_NOTES[:1], ids=lambda path: os.path.basename(os.path.dirname(path)))
+def test_crlf_note_edits_keep_crlf(tmp_path, path):
+    lf_note = MarkdownNote.load(path)
+    crlf_path = str(tmp_path / "video_info.md")
+    with open(crlf_path, 'wb') as f:
+        f.write(read_bytes(path).replace(b'\n', b'\r\n'))
+    crlf_note = MarkdownNote.load(crlf_path)
+    assert crlf_note.body("Title") == lf_note.body("Title")
+
+    for note in (lf_note, crlf_note):
+        apply_summary_to_note(note, KEY_POINTS, CHAPTERS)
+    crlf_note.save(crlf_path)
+    assert read_bytes(crlf_path) == lf_note.render().replace('\n', '\r\n').encode('utf-8')
+
+def test_concurrent_saves_each_write_a_whole_note(tmp_path):
+    path = str(tmp_path / "video_info.md")
+    notes = [MarkdownNote.parse(f"# Video\n\n## Title\nWriter {i}\n\n## Notes\n{'x' * 1000 * i}\n") for i in range(8)]
+    errors = []
+
+    def save(note: MarkdownNote):
+        try:
+            for _ in range(50):
+                note.save(path)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(note,)) for note in notes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert os.listdir(tmp_path) == ["video_info.md"]
+    assert read_bytes(path) in {note.render().encode('utf-8') for note in notes}
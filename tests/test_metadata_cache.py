@@ -0,0 +1,53 @@
+"""MetadataCache size accounting, access-time updates and per-process connections."""
+import os
+import types
+
+import metadata_cache
+from metadata_cache import ACCESS_RESOLUTION, MetadataCache
+
+def accessed(cache: MetadataCache, video_id: str) -> float:
+    return cache._conn.execute("SELECT accessed FROM entries WHERE video_id = ?", (video_id,)).fetchone()[0]
+
+def test_running_size_matches_stored_entries(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.sqlite"), max_bytes=60)
+    for i in range(10):
+        cache.put('title', f"VIDEO{i % 4}", "x" * (10 + i))
+        assert cache._total == cache._count_size() <= 60
+    assert cache.stats["evictions"] > 0
+
+    # A reopened cache starts from the stored total
+    assert MetadataCache(str(tmp_path / "cache.sqlite"), max_bytes=60)._total == cache._total
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metadata_cache, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    cache = MetadataCache(str(tmp_path / "cache.sqlite"), max_bytes=30)
+    cache.put('title', "OLD", "x" * 10)
+    now[0] += 1
+    cache.put('title', "NEW", "x" * 10)
+    now[0] += ACCESS_RESOLUTION + 1
+    assert cache.get('title', "OLD") == "x" * 10
+    cache.put('title', "NEWEST", "x" * 10)
+    assert cache.get('title', "NEW") is None
+    assert cache.get('title', "OLD") is not None
+
+def test_hits_only_update_stale_access_times(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metadata_cache, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    cache = MetadataCache(str(tmp_path / "cache.sqlite"))
+    cache.put('title', "VIDEO", "Title")
+    now[0] += ACCESS_RESOLUTION / 2
+    assert cache.get('title', "VIDEO") == "Title"
+    assert accessed(cache, "VIDEO") == 1000.0
+    now[0] += ACCESS_RESOLUTION
+    assert cache.get('title', "VIDEO") == "Title"
+    assert accessed(cache, "VIDEO") == now[0]
+
+def test_forked_processes_reopen_the_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(metadata_cache, '_default_cache', None)
+    parent = metadata_cache.get_cache()
+    assert metadata_cache.get_cache() is parent
+    monkeypatch.setattr(os, 'getpid', lambda: parent.pid + 1)
+    child = metadata_cache.get_cache()
+    assert child is not parent and child.pid == parent.pid + 1
@@ -0,0 +1,43 @@
+"""LSH near-duplicate grouping must match exhaustive pairwise comparison."""
+import glob
+import os
+from typing import List
+
+import pytest
+
+from near_duplicates import DEFAULT_THRESHOLD, MAX_BUCKET_GROUPS, jaccard, near_duplicate_groups, shingles
+from summarize_transcript import split_sentences
+from synthetic_transcript import generate_transcript
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TRANSCRIPTS = sorted(glob.glob(os.path.join(ROOT, 'output', '*', 'transcript.txt')))
+
+def reference_groups(sentences: List[str], threshold: float = DEFAULT_THRESHOLD) -> List[int]:
+    """Join every pair of sentences at or above threshold; a group's ID is its first sentence."""
+    shingle_sets = [shingles(sentence) for sentence in sentences]
+    groups = list(range(len(sentences)))
+    for i in range(len(sentences)):
+        for j in range(i):
+            if jaccard(shingle_sets[i], shingle_sets[j]) >= threshold:
+                merged, kept = max(groups[i], groups[j]), min(groups[i], groups[j])
+                groups = [kept if group == merged else group for group in groups]
+    return groups
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_sample_transcripts_match_pairwise(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        sentences = split_sentences(f.read())
+    assert near_duplicate_groups(sentences) == reference_groups(sentences)
+
+def test_synthetic_transcript_matches_pairwise():
+    sentences = split_sentences(' '.join(segment['text'] for segment in generate_transcript(20)))
+    assert near_duplicate_groups(sentences) == reference_groups(sentences)
+
+def test_crowded_bucket_groups_by_representative():
+    # Thousands of sentences share every bucket; each is compared with a group representative only
+    base = "we talked about how the new training plan changes everything for the whole team"
+    sentences = [base] * 2000 + [f"{base} after week {i}" for i in range(2000)]
+    distinct = [f"number {i} is a completely different sentence about week {i}" for i in range(MAX_BUCKET_GROUPS * 2)]
+    groups = near_duplicate_groups(sentences + distinct)
+    assert set(groups[:len(sentences)]) == {0}
+    assert groups[len(sentences):] == list(range(len(sentences), len(sentences) + len(distinct)))
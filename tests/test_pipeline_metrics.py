@@ -0,0 +1,25 @@
+"""The metrics log keeps its newest records once it outgrows its size limit."""
+import json
+
+from pipeline_metrics import append_records
+
+def read_ids(path) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line)["id"] for line in f]
+
+def test_log_is_trimmed_to_newest_records(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    max_bytes = 1000
+    for i in range(500):
+        append_records(path, [{"id": i, "stages": {}}], max_bytes=max_bytes)
+        assert (tmp_path / "metrics.jsonl").stat().st_size <= max_bytes
+
+    ids = read_ids(path)
+    assert ids == list(range(500 - len(ids), 500))
+    assert len(ids) > 10
+
+def test_small_log_is_left_alone(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    append_records(path, [{"id": i} for i in range(3)])
+    append_records(path, [{"id": 3}])
+    assert read_ids(path) == [0, 1, 2, 3]
@@ -0,0 +1,70 @@
+"""TextRank must match the dense similarity-matrix PageRank without ever building that matrix."""
+import glob
+import os
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sparse = pytest.importorskip("scipy.sparse")
+
+import sentence_ranker
+from sentence_ranker import DAMPING, MAX_ITERATIONS, TOLERANCE, textrank, tfidf_matrix
+from summarize_transcript import split_sentences
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TRANSCRIPTS = sorted(glob.glob(os.path.join(ROOT, 'output', '*', 'transcript.txt')))
+
+def reference_textrank(matrix) -> "np.ndarray":
+    """The original dense implementation: explicit row-normalized transition matrix."""
+    similarity = np.asarray((matrix @ matrix.T).toarray())
+    np.fill_diagonal(similarity, 0.0)
+    count = similarity.shape[0]
+    out_weight = similarity.sum(axis=1)
+    dangling = out_weight == 0
+    out_weight[dangling] = 1.0
+    transition = similarity / out_weight[:, None]
+    transition[dangling] = 1.0 / count
+    scores = np.full(count, 1.0 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores * count
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_sample_transcripts_match_dense_pagerank(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        # Plus sentences that share no terms with the rest, or have none at all
+        sentences = split_sentences(f.read()) + ["zebra quartz xylophone", "the and of"]
+    matrix = tfidf_matrix(sentences)
+    expected = reference_textrank(matrix)
+    for scores in (textrank(matrix), textrank(matrix.toarray())):
+        assert np.allclose(scores, expected, rtol=0, atol=1e-12)
+
+def test_large_transcript_is_never_densified(monkeypatch):
+    count = 6000
+    vocabulary = [f"term{i}" for i in range(300)]
+    # Every sentence shares "career" with every other, so the similarity graph is complete
+    sentences = [f"career {vocabulary[i % 300]} {vocabulary[(i * 7) % 300]} {vocabulary[(i * 13) % 300]}"
+                 for i in range(count)]
+    matrix = tfidf_matrix(sentences)
+    assert sparse.issparse(matrix)
+
+    def densify(*args, **kwargs):
+        raise AssertionError("textrank converted a sparse matrix to dense")
+    for cls in (sparse.csr_matrix, sparse.csc_matrix):
+        monkeypatch.setattr(cls, 'toarray', densify)
+        monkeypatch.setattr(cls, 'todense', densify)
+
+    tracemalloc.start()
+    try:
+        scores = textrank(matrix)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert scores.shape == (count,) and np.isclose(scores.mean(), 1.0)
+    # The dense similarity matrix alone would take count * count * 8 bytes (288 MB)
+    assert peak < count * count * 8 / 100
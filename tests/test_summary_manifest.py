@@ -0,0 +1,80 @@
+"""Stale-video checks reuse the recorded taxonomy profile instead of parsing every note."""
+import os
+import shutil
+
+import pytest
+
+import markdown_note
+from artifact_writer import PENDING_FILENAME
+import summarize_transcript
+import video_index
+from summary_manifest import SummaryManifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FITNESS_DIR = "how_to_fix_upper_back___rhomboid_pain_for_good__4_effective_exercises"
+CAREER_DIR = "positivity_beats_honesty_in_the_corporate_world"
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_index, '_indexes', {})
+    output_dir = tmp_path / "output"
+    for name in (FITNESS_DIR, CAREER_DIR):
+        shutil.copytree(os.path.join(ROOT, 'output', name), output_dir / name)
+    return str(output_dir)
+
+@pytest.fixture
+def parsed_notes(monkeypatch):
+    """Paths of the notes MarkdownNote.load reads."""
+    paths = []
+    load = markdown_note.MarkdownNote.load.__func__
+
+    def counting_load(cls, path):
+        paths.append(path)
+        return load(cls, path)
+    monkeypatch.setattr(markdown_note.MarkdownNote, 'load', classmethod(counting_load))
+    return paths
+
+def summarize_all(output_dir: str) -> SummaryManifest:
+    manifest = SummaryManifest(output_dir)
+    for name in (FITNESS_DIR, CAREER_DIR):
+        video_dir_path = os.path.join(output_dir, name)
+        fingerprint, config_hash = summarize_transcript.summarize_video_dir(video_dir_path)
+        manifest.record(video_dir_path, config_hash, fingerprint)
+    return manifest
+
+def test_sample_fitness_video_uses_fitness_profile(output_dir):
+    manifest = summarize_all(output_dir)
+    assert manifest.entries[FITNESS_DIR]["profile"] == "fitness"
+    assert manifest.entries[CAREER_DIR]["profile"] == "default"
+    note = markdown_note.MarkdownNote.load(os.path.join(output_dir, FITNESS_DIR, "video_info.md"))
+    assert note.frontmatter_list("tags")[:3] == ["fitness", "exercise", "health"]
+
+def test_unchanged_notes_are_not_parsed(output_dir, parsed_notes):
+    manifest = summarize_all(output_dir)
+    video_dirs = [os.path.join(output_dir, name) for name in (FITNESS_DIR, CAREER_DIR)]
+    del parsed_notes[:]
+    assert summarize_transcript.stale_video_dirs(video_dirs, manifest) == []
+    assert parsed_notes == []
+
+    # A touched note is parsed once; still selecting the same profile, it is skipped afterwards
+    career_note = os.path.join(output_dir, CAREER_DIR, "video_info.md")
+    os.utime(career_note, ns=(0, 0))
+    assert summarize_transcript.stale_video_dirs(video_dirs, manifest) == []
+    assert parsed_notes == [career_note]
+    assert summarize_transcript.stale_video_dirs(video_dirs, manifest) == []
+    assert parsed_notes == [career_note]
+
+    # A note that now selects another profile makes its video stale
+    note = markdown_note.MarkdownNote.load(career_note)
+    note.set_section("Channel", "Precision Movement\n\n", after="Video ID")
+    note.save(career_note)
+    assert summarize_transcript.stale_video_dirs(video_dirs, manifest) == [video_dirs[1]]
+
+def test_interrupted_transcript_commit_is_stale_and_refused(output_dir):
+    manifest = summarize_all(output_dir)
+    video_dir = os.path.join(output_dir, FITNESS_DIR)
+    with open(os.path.join(video_dir, PENDING_FILENAME), 'w', encoding='utf-8') as f:
+        f.write("transcript.bin\ntranscript.txt\n")
+    assert summarize_transcript.stale_video_dirs([video_dir], manifest) == [video_dir]
+    with pytest.raises(RuntimeError, match="transcript.bin, transcript.txt"):
+        summarize_transcript.summarize_video_dir(video_dir)
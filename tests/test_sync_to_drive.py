@@ -0,0 +1,97 @@
+"""sync_to_drive renames, deletes and copies against a temporary destination."""
+import json
+import os
+
+import pytest
+
+import sync_to_drive
+import video_index
+
+def write_note(output_dir, video_id: str, title: str, extra: str = ''):
+    video_dir = output_dir / f"{title.replace(' ', '_')}_{video_id}"
+    video_dir.mkdir(parents=True, exist_ok=True)
+    (video_dir / "video_info.md").write_text(
+        f"# Video Information\n\n## Title\n{title}\n\n## Video ID\n{video_id}\n\n## Notes\n{video_id}{extra}\n",
+        encoding='utf-8')
+    return video_dir
+
+def read_destination(drive):
+    return {path.name: path.read_text(encoding='utf-8') for path in drive.iterdir()}
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_index, '_indexes', {})
+    output_dir, drive = tmp_path / "output", tmp_path / "drive"
+    output_dir.mkdir()
+    drive.mkdir()
+    return output_dir, drive
+
+def sync(output_dir, drive, **kwargs):
+    counts = sync_to_drive.sync_to_drive(str(output_dir), str(drive), workers=4, **kwargs)
+    assert counts['error'] == 0
+    return counts
+
+def test_unchanged_notes_are_skipped(dirs):
+    output_dir, drive = dirs
+    for i in range(3):
+        write_note(output_dir, f"VIDEO00000{i}", f"Video {i}")
+    assert sync(output_dir, drive)['copy'] == 3
+    assert sync(output_dir, drive) == {'copy': 0, 'rename': 0, 'delete': 0, 'error': 0}
+
+def test_swapped_titles_keep_both_copies(dirs):
+    output_dir, drive = dirs
+    write_note(output_dir, "VIDEOAAAAAA", "First")
+    write_note(output_dir, "VIDEOBBBBBB", "Second")
+    sync(output_dir, drive)
+
+    # Same notes, but the index now has each video under the other's title
+    index = video_index.get_index(str(output_dir))
+    for video_id, dir_path, title in index.entries():
+        index.update(video_id, dir_path, "Second" if title == "First" else "First")
+    assert sync(output_dir, drive)['rename'] == 2
+
+    copies = read_destination(drive)
+    assert sorted(copies) == ["First.md", "Second.md"]
+    assert "VIDEOBBBBBB" in copies["First.md"] and "VIDEOAAAAAA" in copies["Second.md"]
+
+def test_copy_onto_a_deleted_videos_name(dirs):
+    output_dir, drive = dirs
+    removed = write_note(output_dir, "VIDEOAAAAAA", "Shared Title")
+    sync(output_dir, drive)
+
+    for path in removed.iterdir():
+        path.unlink()
+    removed.rmdir()
+    write_note(output_dir, "VIDEOBBBBBB", "Shared Title", extra=" replaces the removed video")
+    counts = sync(output_dir, drive, delete_removed=True)
+    assert (counts['copy'], counts['delete']) == (1, 1)
+    assert "VIDEOBBBBBB" in read_destination(drive)["Shared_Title.md"]
+
+    with open(output_dir / sync_to_drive.SYNC_MANIFEST_FILENAME, encoding='utf-8') as f:
+        entries = json.load(f)["destinations"][os.path.abspath(str(drive))]
+    assert sorted(entries) == ["VIDEOBBBBBB"]
+
+def test_edited_title_renames_the_copy(dirs):
+    output_dir, drive = dirs
+    video_dir = write_note(output_dir, "VIDEOAAAAAA", "Old Title")
+    sync(output_dir, drive)
+
+    # The index still has the old title; the edited note's title wins
+    note = video_dir / "video_info.md"
+    note.write_text(note.read_text(encoding='utf-8').replace("Old Title", "New Title"), encoding='utf-8')
+    counts = sync(output_dir, drive)
+    assert counts['copy'] + counts['rename'] == 1
+    assert sorted(read_destination(drive)) == ["New_Title.md"]
+
+def test_colliding_titles_keep_both_copies(dirs):
+    output_dir, drive = dirs
+    write_note(output_dir, "VIDEOBBBBBB", "Same Title")
+    sync(output_dir, drive)
+    write_note(output_dir, "VIDEOAAAAAA", "Same Title")
+    assert sync(output_dir, drive)['copy'] == 1
+
+    # The video copied first keeps the plain name
+    copies = read_destination(drive)
+    assert sorted(copies) == ["Same_Title.md", "Same_Title_VIDEOAAAAAA.md"]
+    assert "VIDEOBBBBBB" in copies["Same_Title.md"] and "VIDEOAAAAAA" in copies["Same_Title_VIDEOAAAAAA.md"]
+    assert sync(output_dir, drive) == {'copy': 0, 'rename': 0, 'delete': 0, 'error': 0}
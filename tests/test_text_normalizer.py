@@ -0,0 +1,72 @@
+"""TextNormalizer cleanup must match the original regex clean_sentence, applied twice."""
+import glob
+import os
+import re
+from typing import List
+
+import pytest
+
+from summarize_transcript import iter_sentences, iter_timed_sentences, split_sentences
+from synthetic_transcript import generate_transcript
+from text_normalizer import DEFAULT_NORMALIZER
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TRANSCRIPTS = sorted(glob.glob(os.path.join(ROOT, 'output', '*', 'transcript.txt')))
+
+def reference_clean(text: str) -> str:
+    """The original clean_sentence: three filler groups, then stutters and whitespace."""
+    text = re.sub(r'\b(um|uh|like|you know|sort of|kind of)\b', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\b(right|okay|well|so)\b', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\b(I mean|I think|I guess|I don\'t know)\b', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\b(\w+)(\s+\1)+\b', r'\1', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip(',.!?:;').strip()
+
+def reference_sentences(text: str) -> List[str]:
+    """The original split_sentences: every clause is cleaned once with its sentence and once on its own."""
+    text = re.sub(r'\[\d+:\d+\]', '', text)
+    text = re.sub(r'(?<=[a-z])\s+(?=[A-Z])', '. ', text)
+    text = re.sub(r'(?<=[a-z])\s+(?=I\s)', '. ', text)
+    text = re.sub(r'\.+', '.', text)
+    text = re.sub(r'\s+', ' ', text)
+    sentences = []
+    for s in text.split('.'):
+        s = reference_clean(s)
+        if len(s) > 30:
+            for part in re.split(r'(?<=[a-z])\s+(?:but|and|or|so|because|however|therefore)\s+', s):
+                part = reference_clean(part)
+                if len(part) > 30:
+                    sentences.append(part + '.')
+    return sentences
+
+def read_transcript(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.parametrize('text', [
+    "I um think this is great",
+    "so I uh mean the the plan is, you know, well okay",
+    "we we we like kind of um, sort of I guess I guess know",
+])
+def test_fillers_exposed_by_a_removal_are_removed(text):
+    assert DEFAULT_NORMALIZER.clean(text) == reference_clean(reference_clean(text))
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_sample_fragments_match_double_clean(path):
+    fragments = list(DEFAULT_NORMALIZER.iter_fragments([read_transcript(path)]))
+    assert fragments
+    for fragment in fragments:
+        assert DEFAULT_NORMALIZER.clean(fragment) == reference_clean(reference_clean(fragment))
+
+@pytest.mark.parametrize('path', SAMPLE_TRANSCRIPTS, ids=os.path.basename)
+def test_sample_sentences_match_original_split(path):
+    text = read_transcript(path)
+    assert split_sentences(text) == reference_sentences(text)
+
+def test_synthetic_sentences_match_original_split():
+    segments = generate_transcript(20)
+    text = ' '.join(segment['text'] for segment in segments)
+    sentences = reference_sentences(text)
+    assert list(iter_sentences(DEFAULT_NORMALIZER.iter_fragments([text]))) == sentences
+    timed = iter_timed_sentences(DEFAULT_NORMALIZER.iter_timed_fragments(segments))
+    assert [sentence for sentence, _, _ in timed] == sentences
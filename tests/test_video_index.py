@@ -0,0 +1,55 @@
+"""VideoIndex lookups find directories made outside the pipeline and report duplicates once."""
+import os
+import shutil
+
+import pytest
+
+import video_index
+from transcript_extractor import ensure_output_dir
+from video_index import VideoIndex, get_index
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Two sample directories hold notes for this video
+DUPLICATE_ID = "KSjlFBt3mho"
+DUPLICATE_DIRS = ["KSjlFBt3mho", "how_to_become_wildly_successful__you_must_break_the_rules_badly"]
+
+def write_note(dir_path: str, video_id: str, title: str):
+    os.makedirs(dir_path)
+    with open(os.path.join(dir_path, "video_info.md"), 'w', encoding='utf-8') as f:
+        f.write(f"# Video Information\n\n## Title\n{title}\n\n## Video ID\n{video_id}\n")
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(video_index, '_indexes', {})
+    return "output"
+
+def test_lookup_miss_finds_a_directory_made_by_hand(output_dir):
+    get_index(output_dir)
+    write_note(os.path.join(output_dir, "old_title_VIDEO000001"), "VIDEO000001", "Old Title")
+
+    new_dir = ensure_output_dir("VIDEO000001", "New Title")
+    assert sorted(os.listdir(output_dir)) == sorted([os.path.basename(new_dir), video_index.INDEX_FILENAME])
+    assert get_index(output_dir).lookup("VIDEO000001") == new_dir
+
+def test_duplicate_directories_are_reported_once(output_dir, capsys):
+    for name in DUPLICATE_DIRS:
+        shutil.copytree(os.path.join(ROOT, 'output', name), os.path.join(output_dir, name))
+
+    # The first process builds the index and reports the duplicate; later processes stay quiet
+    kept = VideoIndex(output_dir).lookup(DUPLICATE_ID)
+    assert capsys.readouterr().out.count(f"Duplicate directories for {DUPLICATE_ID}") == 1
+    for _ in range(2):
+        index = VideoIndex(output_dir)
+        assert [video_id for video_id, _, _ in index.entries()] == [DUPLICATE_ID]
+        assert index.lookup(DUPLICATE_ID) == kept
+    assert capsys.readouterr().out == ""
+
+    # Editing the skipped directory's note makes it newer, so it takes over
+    skipped = next(os.path.join(output_dir, name) for name in os.listdir(output_dir)
+                   if os.path.join(output_dir, name) != kept and not name.startswith('.'))
+    os.utime(os.path.join(skipped, "video_info.md"))
+    index = VideoIndex(output_dir)
+    assert index.entries()[0][1] == skipped
+    assert index.lookup(DUPLICATE_ID) == skipped
+    assert capsys.readouterr().out.count(f"using {skipped} over {kept}") == 1